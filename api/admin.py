@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
-from .models import PhotographerProfile
+from .models import PhotographerProfile, WorkingHours
 
 User = get_user_model()
 
@@ -30,4 +30,11 @@ class PhotographerProfileAdmin(admin.ModelAdmin):
     readonly_fields = ("createdAt",)
 
 
+@admin.register(WorkingHours)
+class WorkingHoursAdmin(admin.ModelAdmin):
+    list_display = ("photographer", "weekday", "start", "end")
+    list_filter = ("weekday",)
+    search_fields = ("photographer__email", "photographer__displayName")
+
+
 # Register your models here.
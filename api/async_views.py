@@ -0,0 +1,462 @@
+import asyncio
+import json
+import time
+import weakref
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.db import connection
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotFound,
+    ValidationError,
+)
+from rest_framework.request import Request
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import StatelessJWTAuthentication
+from .cache import AsyncCachedDirectoryMixin
+from .fastserializers import (
+    BookingFastSerializer,
+    NotificationFastSerializer,
+    PhotographerListFastSerializer,
+)
+from .hashing import aauthenticate, amake_password
+from .models import Booking, Notification, PhotographerProfile, User
+from .pagination import KeysetPagination
+from .pubsub import get_broker
+from .renderers import FastJSONRenderer
+from .serializers import (
+    BookingListQuerySerializer,
+    NotificationSerializer,
+    PhotographerProfileSerializer,
+    SignupSerializer,
+    UserSerializer,
+)
+from .views import (
+    BookingMeListView,
+    EmailTokenObtainPairSerializer,
+    NotificationMeListView,
+    PhotographerDetailView,
+    PhotographerListView,
+)
+
+
+async def authenticate(request):
+    """
+    Authenticate a plain Django request with the stateless JWT scheme.
+
+    Returns ``(user, None)`` or ``(None, error_response)``.
+    """
+    authenticator = StatelessJWTAuthentication()
+    try:
+        result = await authenticator.aauthenticate(request)
+    except AuthenticationFailed as exc:
+        # As DRF's exception handler words it
+        data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    else:
+        if result is not None:
+            return result[0], None
+        data = {"detail": "Authentication credentials were not provided."}
+    return None, json_response(
+        data,
+        status=401,
+        headers={"WWW-Authenticate": authenticator.authenticate_header(request)},
+    )
+
+
+def error_response(exc):
+    """An ``APIException`` as DRF's exception handler renders it."""
+    data = (
+        exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    )
+    return json_response(data, status=exc.status_code)
+
+
+def json_response(data, status=200, headers=None):
+    """Render ``data`` as the DRF views would."""
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        status=status,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+def parse_body(request):
+    """The request's JSON (or form) data, or ``None`` for malformed JSON."""
+    if request.content_type != "application/json":
+        return request.POST.dict()
+    try:
+        return json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+
+
+def parse_error():
+    return json_response({"detail": "JSON parse error"}, status=400)
+
+
+_slots = weakref.WeakKeyDictionary()
+
+
+def request_slots():
+    """The current event loop's semaphore of ``ASYNC_VIEW_CONCURRENCY``."""
+    loop = asyncio.get_running_loop()
+    if loop not in _slots:
+        _slots[loop] = asyncio.Semaphore(settings.ASYNC_VIEW_CONCURRENCY)
+    return _slots[loop]
+
+
+class BoundedView(View):
+    """
+    Base of the async views, serving at most ``ASYNC_VIEW_CONCURRENCY``
+    requests at a time per worker; the others wait on the event loop.
+
+    Django's async ORM methods (``aget``, ``afirst``, async iteration) are
+    ``sync_to_async`` wrappers, and under ASGI each request runs them on an
+    executor thread of its own. Without a cap, every request in flight
+    would take a thread and a database connection.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        async with request_slots():
+            return await self.handle(request, *args, **kwargs)
+
+    async def handle(self, request, *args, **kwargs):
+        return await super().dispatch(request, *args, **kwargs)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSignupView(BoundedView):
+    """
+    Async variant of ``SignupView``; the password is hashed in the
+    ``api.hashing`` pool instead of on the event loop.
+    """
+
+    async def post(self, request):
+        data = parse_body(request)
+        if data is None:
+            return parse_error()
+        serializer = SignupSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return json_response(serializer.errors, status=400)
+        encoded = await amake_password(serializer.validated_data["password"])
+        await sync_to_async(serializer.save)(encoded_password=encoded)
+        return json_response(serializer.data, status=201)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncLoginView(BoundedView):
+    """
+    Async variant of ``LoginView``. Credentials are checked with
+    ``api.hashing.aauthenticate``, which verifies (and, for an outdated
+    hash, upgrades) the password in the hashing pool.
+    """
+
+    serializer_class = EmailTokenObtainPairSerializer
+
+    async def post(self, request):
+        data = parse_body(request)
+        if data is None:
+            return parse_error()
+        serializer = self.serializer_class(data=data)
+        try:
+            # Field checks only; the credentials are verified below
+            attrs = serializer.to_internal_value(data)
+        except ValidationError as exc:
+            return error_response(exc)
+
+        user = await aauthenticate(attrs[serializer.username_field], attrs["password"])
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            return json_response(
+                {"detail": str(serializer.error_messages["no_active_account"])},
+                status=401,
+                headers={"WWW-Authenticate": 'Bearer realm="api"'},
+            )
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+        refresh = serializer.get_token(user)
+        return json_response(
+            {
+                "refresh": str(refresh),
+                "access": str(refresh.access_token),
+                "user": UserSerializer(user).data,
+            }
+        )
+
+
+class AsyncMeView(BoundedView):
+    """Async variant of ``MeView``; the user comes from the token claims."""
+
+    async def get(self, request):
+        user, error = await authenticate(request)
+        if error is not None:
+            return error
+        return json_response(UserSerializer(user).data)
+
+
+class AsyncReadView(BoundedView):
+    """
+    Base of the async variants of the read views. Requests with
+    ``?fields=`` or ``?expand=`` are handed to ``sync_view``, whose DRF
+    serializers implement sparse fieldsets.
+    """
+
+    sync_view = None
+
+    async def handle(self, request, *args, **kwargs):
+        if request.method == "GET" and (
+            "fields" in request.GET or "expand" in request.GET
+        ):
+            return await sync_to_async(self.call_sync_view)(request, *args, **kwargs)
+        return await super().handle(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        return await self.read(request, *args, **kwargs)
+
+    async def read(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def call_sync_view(self, request, *args, **kwargs):
+        response = self.sync_view.as_view()(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            # Rendering may read lazy querysets, so it happens here too
+            response = response.render()
+        return response
+
+
+class AsyncFastListView(AsyncReadView):
+    """
+    Keyset-paginated list of ``values_list()`` rows, fetched through the
+    async ORM and built by ``fast_serializer_class``.
+    """
+
+    fast_serializer_class = None
+    authenticated = True
+
+    async def read(self, request):
+        user = None
+        if self.authenticated:
+            user, error = await authenticate(request)
+            if error is not None:
+                return error
+
+        paginator = KeysetPagination()
+        try:
+            rows = self.fast_serializer_class.values_list(
+                self.get_queryset(user), paginator, self
+            )
+            page = await paginator.apaginate_queryset(rows, Request(request), self)
+        except APIException as exc:
+            return error_response(exc)
+        return paginator.add_link_header(
+            json_response(self.fast_serializer_class.serialize(page))
+        )
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+
+class AsyncPhotographerListView(AsyncCachedDirectoryMixin, AsyncFastListView):
+    """Async variant of ``PhotographerListView``."""
+
+    sync_view = PhotographerListView
+    fast_serializer_class = PhotographerListFastSerializer
+    authenticated = False
+
+    def get_queryset(self, user):
+        return PhotographerProfile.objects.filter(
+            availableForBooking=True
+        ).select_related("user")
+
+
+class AsyncPhotographerDetailView(AsyncCachedDirectoryMixin, AsyncReadView):
+    """Async variant of ``PhotographerDetailView``."""
+
+    sync_view = PhotographerDetailView
+
+    async def read(self, request, id):
+        try:
+            profile = await PhotographerProfile.objects.select_related("user").aget(
+                user__uid=id
+            )
+        except PhotographerProfile.DoesNotExist:
+            return json_response(
+                {"detail": "No PhotographerProfile matches the given query."},
+                status=404,
+            )
+        return json_response(PhotographerProfileSerializer(profile).data)
+
+
+class AsyncBookingMeListView(AsyncFastListView):
+    """Async variant of ``BookingMeListView``."""
+
+    sync_view = BookingMeListView
+    fast_serializer_class = BookingFastSerializer
+
+    def get_queryset(self, user):
+        if user.role == User.Roles.CUSTOMER:
+            queryset = Booking.objects.filter(customer=user)
+        elif user.role == User.Roles.PHOTOGRAPHER:
+            queryset = Booking.objects.filter(photographer=user)
+        else:
+            return Booking.objects.none()
+        query = BookingListQuerySerializer(data=self.request.GET)
+        query.is_valid(raise_exception=True)
+        return queryset.matching(**query.validated_data)
+
+
+class AsyncNotificationMeListView(AsyncFastListView):
+    """Async variant of ``NotificationMeListView``."""
+
+    sync_view = NotificationMeListView
+    fast_serializer_class = NotificationFastSerializer
+
+    def get_queryset(self, user):
+        return Notification.objects.filter(user=user)
+
+
+class NotificationStreamView(View):
+    """
+    Server-sent events stream of the user's new notifications.
+
+    Each event's id is a keyset cursor, so a reconnecting client resumes
+    from ``Last-Event-ID`` (or an explicit ``?since=`` cursor). Without
+    either, the stream starts after the newest existing notification.
+    Between deliveries the stream idles on the notification broker, sending
+    a comment line every heartbeat, and closes after
+    ``NOTIFICATION_STREAM_MAX_AGE`` seconds so clients reconnect
+    periodically.
+
+    Notifications are ordered by ``createdAt``, which is stamped before
+    commit, so a row can become visible after a newer one was delivered.
+    Each poll therefore re-reads the last ``NOTIFICATION_STREAM_LAG``
+    seconds and skips what the stream already sent; a row that commits
+    later than that, or while the client is reconnecting, is only picked
+    up by the notification list.
+
+    Polls run on the shared executor and close their connection, so an
+    idle stream holds neither a thread nor a database connection. Served
+    only with ``API_ASYNC_VIEWS``, since under WSGI the response would be
+    buffered until the stream ends, and on PostgreSQL only with
+    ``DB_POOL``, so a poll borrows a pooled connection rather than opening
+    one (``NOTIFICATION_STREAM_ENABLED``).
+    """
+
+    batch_size = 200
+
+    async def get(self, request):
+        user, error = await authenticate(request)
+        if error is not None:
+            return error
+
+        encoded = request.headers.get("Last-Event-ID") or request.GET.get("since")
+        if encoded:
+            try:
+                position = KeysetPagination.parse_cursor(encoded, Notification)
+            except ValueError:
+                # As KeysetPagination answers a bad ?cursor=
+                return error_response(NotFound(KeysetPagination.invalid_cursor_message))
+        else:
+            position = await sync_to_async(self.latest, thread_sensitive=False)(user)
+
+        response = StreamingHttpResponse(
+            self.stream(user, position), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, user, position):
+        heartbeat = settings.NOTIFICATION_STREAM_HEARTBEAT
+        deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_AGE
+        # Rows this stream sent within the lag window, by pk
+        sent = {}
+        start = position
+        # Subscribe before the first read so nothing published in between
+        # is missed
+        subscription = get_broker().subscribe(user.pk)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                async for chunk, position in self.pending(user, position, start, sent):
+                    yield chunk
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if not await subscription.wait(min(heartbeat, remaining)):
+                    yield b": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    async def pending(self, user, position, start, sent):
+        floor = timezone.now() - timedelta(seconds=settings.NOTIFICATION_STREAM_LAG)
+        for pk, created in list(sent.items()):
+            if created < floor:
+                del sent[pk]
+        # Re-read the lag window, but never before where the stream started
+        scan = position
+        if position is not None and position[0] > floor:
+            scan = start if start is not None and start[0] >= floor else (floor, None)
+        fetch = sync_to_async(self.fetch, thread_sensitive=False)
+        while True:
+            notifications = await fetch(user, scan)
+            for notification in notifications:
+                scan = (notification.createdAt, notification.pk)
+                if notification.pk in sent:
+                    continue
+                sent[notification.pk] = notification.createdAt
+                if position is None or scan > position:
+                    position = scan
+                yield self.format_event(notification), position
+            if len(notifications) < self.batch_size:
+                return
+
+    @staticmethod
+    def latest(user):
+        try:
+            return (
+                Notification.objects.filter(user=user)
+                .order_by("-createdAt", "-pk")
+                .values_list("createdAt", "pk")
+                .first()
+            )
+        finally:
+            connection.close()
+
+    def fetch(self, user, after):
+        """The next batch after ``after``; ``(time, None)`` includes ``time``."""
+        try:
+            queryset = (
+                Notification.objects.filter(user=user)
+                .select_related("booking")
+                .order_by("createdAt", "pk")
+            )
+            if after is not None:
+                created, pk = after
+                if pk is None:
+                    queryset = queryset.filter(createdAt__gte=created)
+                else:
+                    queryset = queryset.filter(
+                        Q(createdAt__gt=created) | Q(createdAt=created, pk__gt=pk)
+                    )
+            return list(queryset[: self.batch_size])
+        finally:
+            # Streams idle for minutes; do not keep a connection per stream
+            connection.close()
+
+    @staticmethod
+    def format_event(notification):
+        cursor = KeysetPagination.encode_cursor(notification.createdAt, notification.pk)
+        data = FastJSONRenderer().render(NotificationSerializer(notification).data)
+        return b"id: %s\nevent: notification\ndata: %s\n\n" % (cursor.encode(), data)
@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from .async_views import AsyncLoginView, AsyncMeView, AsyncSignupView
 from .views import AuthTestView, LoginView, MeView, SignupView
 
+if settings.API_ASYNC_VIEWS:
+    SignupView, LoginView, MeView = AsyncSignupView, AsyncLoginView, AsyncMeView
+
 urlpatterns = [
     path("signup/", SignupView.as_view(), name="api-signup"),
     path("login/", LoginView.as_view(), name="api-login"),
@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Claims written by EmailTokenObtainPairSerializer.get_token, mapped to the
+# User attributes they restore. Anything not listed stays deferred.
+USER_CLAIMS = {
+    "email": "email",
+    "displayName": "displayName",
+    "role": "role",
+    "createdAt": "createdAt",
+    "date_joined": "date_joined",
+}
+DATETIME_CLAIMS = {"createdAt", "date_joined"}
+
+
+class TTLCache:
+    """
+    Tiny thread-safe LRU cache whose entries expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# (is_active, password fingerprint) per user id, used for revocation checks
+user_state_cache = TTLCache(ttl=getattr(settings, "JWT_USER_STATE_TTL", 60))
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds ``request.user`` from the token claims.
+
+    The user is a real ``User`` instance whose claim-backed fields are
+    populated and whose remaining fields are deferred, so views only hit the
+    database if they read something the token does not carry. Whether the
+    account is still active (and, with ``CHECK_REVOKE_TOKEN``, whether the
+    password changed) is answered from ``user_state_cache``.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        self.check_user_state(validated_token, self.get_user_state(user_id))
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            # Token issued before the claims were added; load the full row
+            return super().get_user(validated_token)
+        return self.build_user(user_id, validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        ``authenticate`` for async views. Token validation is pure CPU work;
+        only a ``user_state_cache`` miss reaches the database, through the
+        async ORM.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        self.check_user_state(validated_token, await self.aget_user_state(user_id))
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return await self.aget_full_user(user_id)
+        return self.build_user(user_id, validated_token)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    @staticmethod
+    def check_user_state(validated_token, state):
+        is_active, password_hash = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+    def get_user_state(self, user_id):
+        key = str(user_id)
+        state = user_state_cache.get(key)
+        if state is None:
+            state = self.make_user_state(self.user_state_query(user_id).first())
+            user_state_cache.set(key, state)
+        return state
+
+    async def aget_user_state(self, user_id):
+        key = str(user_id)
+        state = user_state_cache.get(key)
+        if state is None:
+            state = self.make_user_state(await self.user_state_query(user_id).afirst())
+            user_state_cache.set(key, state)
+        return state
+
+    def user_state_query(self, user_id):
+        return self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list("is_active", "password")
+
+    @staticmethod
+    def make_user_state(row):
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return row[0], get_md5_hash_password(row[1])
+
+    async def aget_full_user(self, user_id):
+        # JWTAuthentication.get_user's lookup, through the async ORM
+        try:
+            return await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def build_user(self, user_id, validated_token):
+        values = {api_settings.USER_ID_FIELD: user_id}
+        for claim, attname in USER_CLAIMS.items():
+            value = validated_token[claim]
+            if claim in DATETIME_CLAIMS and value is not None:
+                value = datetime.fromisoformat(value)
+            values[attname] = value
+
+        fields = [
+            f for f in self.user_model._meta.concrete_fields if f.attname in values
+        ]
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            [f.attname for f in fields],
+            [f.to_python(values[f.attname]) for f in fields],
+        )
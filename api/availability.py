@@ -0,0 +1,110 @@
+"""
+Free-slot search over working hours and bookings.
+
+Times are handled as minutes since midnight. For a set of photographers and
+a date range this runs two queries: their working hours, and one ordered
+range scan of active bookings over (photographer, date, time), which is
+served by the ``booking_unique_active_slot`` index. Each day's free windows
+are then computed by merging the sorted intervals once.
+"""
+
+from collections import defaultdict
+from datetime import time, timedelta
+
+from django.conf import settings
+
+from .models import Booking, WorkingHours
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes):
+    if minutes >= 24 * 60:
+        return time(23, 59, 59)
+    return time(minutes // 60, minutes % 60)
+
+
+def merge(intervals):
+    """Merge sorted ``(start, end)`` intervals that overlap or touch."""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtract(windows, busy, min_length):
+    """
+    Remove merged, sorted ``busy`` intervals from merged, sorted ``windows``
+    and keep the gaps that are at least ``min_length`` long.
+    """
+    free = []
+    i = 0
+    for start, end in windows:
+        cursor = start
+        # Skip bookings that end before this window
+        while i < len(busy) and busy[i][1] <= cursor:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < end:
+            if busy[j][0] - cursor >= min_length:
+                free.append((cursor, busy[j][0]))
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if end - cursor >= min_length:
+            free.append((cursor, end))
+    return free
+
+
+def free_slots(photographer_ids, date_from, date_to, duration=None):
+    """
+    Return ``{photographer_id: [(date, start, end), ...]}`` with every free
+    window of at least ``duration`` minutes between the two dates
+    (inclusive). Bookings occupy ``BOOKING_SLOT_MINUTES`` from their start.
+    """
+    slot = settings.BOOKING_SLOT_MINUTES
+    duration = duration or slot
+
+    hours = defaultdict(lambda: defaultdict(list))
+    for photographer_id, weekday, start, end in (
+        WorkingHours.objects.filter(photographer_id__in=photographer_ids)
+        .order_by("photographer", "weekday", "start")
+        .values_list("photographer_id", "weekday", "start", "end")
+    ):
+        hours[photographer_id][weekday].append((to_minutes(start), to_minutes(end)))
+    hours = {
+        photographer_id: {day: merge(spans) for day, spans in days.items()}
+        for photographer_id, days in hours.items()
+    }
+
+    busy = defaultdict(list)
+    for photographer_id, day, start in (
+        Booking.objects.active()
+        .filter(photographer_id__in=photographer_ids, date__range=(date_from, date_to))
+        .order_by("photographer", "date", "time")
+        .values_list("photographer_id", "date", "time")
+    ):
+        begin = to_minutes(start)
+        busy[(photographer_id, day)].append((begin, begin + slot))
+
+    results = {}
+    for photographer_id in photographer_ids:
+        weekly = hours.get(photographer_id, {})
+        windows = []
+        day = date_from
+        while day <= date_to:
+            working = weekly.get(day.weekday())
+            if working:
+                booked = merge(busy.get((photographer_id, day), ()))
+                windows.extend(
+                    (day, to_time(start), to_time(end))
+                    for start, end in subtract(working, booked, duration)
+                )
+            day += timedelta(days=1)
+        results[photographer_id] = windows
+    return results
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import AsyncBookingMeListView
 from .views import (
+    BookingBulkTransitionView,
     BookingCompleteView,
     BookingCreateView,
     BookingMeListView,
@@ -8,9 +11,17 @@ from .views import (
     BookingsTestView,
 )
 
+if settings.API_ASYNC_VIEWS:
+    BookingMeListView = AsyncBookingMeListView
+
 urlpatterns = [
     path("", BookingCreateView.as_view(), name="booking-create"),
     path("me/", BookingMeListView.as_view(), name="booking-me"),
+    path(
+        "transitions/",
+        BookingBulkTransitionView.as_view(),
+        name="booking-bulk-transition",
+    ),
     path("<uuid:id>/", BookingStatusUpdateView.as_view(), name="booking-status-update"),
     path("<uuid:id>/complete/", BookingCompleteView.as_view(), name="booking-complete"),
     path("test/", BookingsTestView.as_view(), name="bookings-test"),
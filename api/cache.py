@@ -0,0 +1,134 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .renderers import EncodedJSON
+
+DIRECTORY_VERSION_KEY = "directory:version"
+
+
+def get_directory_cache():
+    return caches[getattr(settings, "DIRECTORY_CACHE_ALIAS", "directory")]
+
+
+def get_directory_version():
+    cache = get_directory_cache()
+    version = cache.get(DIRECTORY_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses old keys
+        cache.add(DIRECTORY_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(DIRECTORY_VERSION_KEY)
+    return version
+
+
+async def aget_directory_version():
+    cache = get_directory_cache()
+    version = await cache.aget(DIRECTORY_VERSION_KEY)
+    if version is None:
+        await cache.aadd(DIRECTORY_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(DIRECTORY_VERSION_KEY)
+    return version
+
+
+def bump_directory_version():
+    cache = get_directory_cache()
+    try:
+        cache.incr(DIRECTORY_VERSION_KEY)
+    except ValueError:
+        cache.set(DIRECTORY_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+class CachedDirectoryMixin:
+    """
+    Serve GET responses of public directory views from a versioned cache.
+
+    Rendered JSON bytes are stored under the current directory version, so a
+    bump of the version (on any PhotographerProfile/User write) invalidates
+    every cached page at once. Responses carry an ETag and conditional
+    requests with a matching If-None-Match get an empty 304.
+    """
+
+    cache_key_prefix = "directory"
+
+    def get(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return super().get(request, *args, **kwargs)
+
+        cache = get_directory_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            return self.get_cached_response(request, entry)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: self.store_response(cache, key, rendered)
+            )
+        return response
+
+    def get_cache_key(self, request):
+        return self.make_cache_key(request, get_directory_version())
+
+    @classmethod
+    def make_cache_key(cls, request, version):
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f"{cls.cache_key_prefix}:{version}:{path}"
+
+    @classmethod
+    def store_response(cls, cache, key, response):
+        cache.set(key, cls.make_entry(response))
+
+    @staticmethod
+    def make_entry(response):
+        """The cache entry for a rendered response, which gains an ETag."""
+        etag = f'"{hashlib.md5(response.content).hexdigest()}"'
+        response["ETag"] = etag
+        return {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "etag": etag,
+            "link": response.get("Link"),
+        }
+
+    @staticmethod
+    def get_cached_response(request, entry):
+        renderer = getattr(request, "accepted_renderer", None)
+        if request.headers.get("If-None-Match") == entry["etag"]:
+            response = HttpResponse(status=304)
+        elif getattr(renderer, "accepts_encoded", False):
+            # The stored bytes go through the renderer untouched
+            response = Response(EncodedJSON(entry["content"]))
+        else:
+            response = HttpResponse(
+                entry["content"], content_type=entry["content_type"]
+            )
+        if entry["link"] and response.status_code == 200:
+            response["Link"] = entry["link"]
+        response["ETag"] = entry["etag"]
+        return response
+
+
+class AsyncCachedDirectoryMixin(CachedDirectoryMixin):
+    """
+    ``CachedDirectoryMixin`` for the async views in ``api.async_views``,
+    through the cache's async API. Both share cache entries, since they
+    render the same bytes for the same URL.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        cache = get_directory_cache()
+        key = self.make_cache_key(request, await aget_directory_version())
+        entry = await cache.aget(key)
+        if entry is not None:
+            return self.get_cached_response(request, entry)
+
+        # Past CachedDirectoryMixin.get to the view's own async get
+        response = await super(CachedDirectoryMixin, self).get(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, self.make_entry(response))
+        return response
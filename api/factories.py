@@ -0,0 +1,333 @@
+"""
+Deterministic factories for large seeded datasets.
+
+Each factory yields unsaved model instances drawn from a ``random.Random``,
+so one seed and epoch always produce the same rows: UUIDs, names, slots,
+statuses and timestamps included. ``insert`` writes them in batches with
+raw multi-row INSERTs, or with ``COPY ... FROM STDIN`` on PostgreSQL. Both
+paths store the generated ``createdAt`` values as they are, where
+``bulk_create`` would stamp the current time, and neither sends model
+signals; ``seed`` refreshes the search index and the directory cache once
+at the end instead.
+
+Every seeded user shares one precomputed hash of ``SEED_PASSWORD`` and has
+an address at ``SEED_DOMAIN``, which is how ``clear`` finds them again.
+"""
+
+import csv
+import io
+import math
+import uuid
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .cache import bump_directory_version
+from .models import Booking, Notification, PhotographerProfile, User, WorkingHours
+from .search import index_profiles
+
+SEED_DOMAIN = "seed.example.com"
+SEED_PASSWORD = "Passw0rd!"
+DEFAULT_BATCH_SIZE = 5000
+SLOTS_PER_DAY = 10
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Chen", "Diego", "Elena", "Farah", "Gus", "Hana", "Ivan",
+    "Jade", "Kofi", "Lena", "Mateo", "Nia", "Omar", "Priya", "Quinn", "Rosa",
+    "Sven", "Tara", "Uma", "Viktor", "Wen", "Yusuf", "Zoe",
+]  # fmt: skip
+LAST_NAMES = [
+    "Adams", "Bianchi", "Costa", "Dubois", "Eriksen", "Fischer", "Garcia",
+    "Haddad", "Ito", "Jensen", "Kowalski", "Lopez", "Moreau", "Nakamura",
+    "Okafor", "Patel", "Rossi", "Schmidt", "Tanaka", "Weber",
+]  # fmt: skip
+SPECIALTIES = [
+    "wedding", "portrait", "family", "newborn", "maternity", "engagement",
+    "event", "corporate", "headshot", "fashion", "product", "food",
+    "real estate", "architecture", "landscape", "travel", "sports", "pet",
+    "concert", "documentary",
+]  # fmt: skip
+CITIES = [
+    "Amsterdam", "Berlin", "Chicago", "Dublin", "Lisbon", "London", "Madrid",
+    "Mumbai", "Nairobi", "Oslo", "Paris", "Seoul", "Sydney", "Toronto",
+]  # fmt: skip
+STYLES = [
+    "natural light", "candid", "documentary style", "film", "studio",
+    "black and white", "editorial", "fine art", "drone", "outdoor",
+]  # fmt: skip
+
+
+@lru_cache
+def password_hash():
+    """One hash of ``SEED_PASSWORD`` (fixed salt) shared by every seeded user."""
+    return make_password(SEED_PASSWORD, salt="seededaccounts")
+
+
+def default_epoch():
+    """Midnight UTC today: seeded bookings are spread around this instant."""
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _before(rng, moment, days):
+    return moment - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def users(rng, role, count, epoch):
+    """Users of ``role`` who signed up during the year before ``epoch``."""
+    for n in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        joined = _before(rng, epoch, 365)
+        yield User(
+            uid=_uuid(rng),
+            email=f"{role}{n}@{SEED_DOMAIN}",
+            displayName=f"{first} {last}",
+            role=role,
+            password=password_hash(),
+            date_joined=joined,
+            createdAt=joined,
+        )
+
+
+def profiles(rng, photographer_ids, epoch):
+    for user_id in photographer_ids:
+        specialties = rng.sample(SPECIALTIES, 2)
+        bio = (
+            f"{specialties[0].capitalize()} and {specialties[1]} photographer"
+            f" based in {rng.choice(CITIES)}. {rng.choice(STYLES).capitalize()},"
+            f" {rng.choice(STYLES)} and {rng.randrange(2, 25)} years behind the"
+            f" camera."
+        )
+        yield PhotographerProfile(
+            user_id=user_id,
+            bio=bio,
+            availableForBooking=rng.random() < 0.9,
+            createdAt=_before(rng, epoch, 365),
+        )
+
+
+def working_hours(rng, photographer_ids):
+    """Weekday hours, with Saturdays for about half of the photographers."""
+    for user_id in photographer_ids:
+        days = range(6) if rng.random() < 0.5 else range(5)
+        start = time(rng.choice([8, 9, 10]))
+        for weekday in days:
+            yield WorkingHours(
+                photographer_id=user_id,
+                weekday=weekday,
+                start=start,
+                end=time(start.hour + 8),
+            )
+
+
+def bookings(rng, count, customer_ids, photographer_ids, epoch):
+    """
+    ``count`` bookings dealt round-robin over the photographers, one per
+    hourly slot, half before and half after ``epoch``. Past bookings are
+    completed or rejected; upcoming ones pending, accepted or rejected.
+    """
+    per_photographer = math.ceil(count / len(photographer_ids)) if count else 0
+    first_day = epoch.date() - timedelta(days=per_photographer // SLOTS_PER_DAY // 2)
+    for n in range(count):
+        k, photographer = divmod(n, len(photographer_ids))
+        day = first_day + timedelta(days=k // SLOTS_PER_DAY)
+        roll = rng.random()
+        if day < epoch.date():
+            status = (
+                Booking.Status.COMPLETED if roll < 0.85 else Booking.Status.REJECTED
+            )
+        elif roll < 0.5:
+            status = Booking.Status.PENDING
+        else:
+            status = Booking.Status.ACCEPTED if roll < 0.9 else Booking.Status.REJECTED
+        slot = datetime.combine(day, time(8 + k % SLOTS_PER_DAY), timezone.utc)
+        yield Booking(
+            id=_uuid(rng),
+            customer_id=rng.choice(customer_ids),
+            photographer_id=photographer_ids[photographer],
+            date=day,
+            time=slot.time(),
+            status=status,
+            createdAt=_before(rng, min(slot, epoch), 60),
+        )
+
+
+def notifications(rng, count, bookings, customer_ids, epoch):
+    """
+    ``count`` notifications about ``bookings``, given as ``(id, customer_id,
+    status, createdAt)`` tuples and cycled through in order, or addressed to
+    random customers when there are no bookings. Most are read.
+    """
+    for n in range(count):
+        if bookings:
+            booking_id, user_id, status, created = bookings[n % len(bookings)]
+            message = f"Booking {status}"
+            created += timedelta(seconds=rng.randrange(86400))
+        else:
+            booking_id, user_id = None, rng.choice(customer_ids)
+            message = "Welcome!"
+            created = _before(rng, epoch, 365)
+        yield Notification(
+            id=_uuid(rng),
+            user_id=user_id,
+            booking_id=booking_id,
+            message=message,
+            is_read=rng.random() < 0.7,
+            createdAt=min(created, epoch),
+        )
+
+
+def _fields(model):
+    opts = model._meta
+    # An auto-increment primary key is left to its sequence
+    return [f for f in opts.concrete_fields if f is not opts.auto_field]
+
+
+def _insert(model, batch, connection):
+    # A raw insert skips pre_save, which would replace the generated
+    # createdAt (auto_now_add) with the current time
+    fields = _fields(model)
+    size = max(connection.ops.bulk_batch_size(fields, batch), 1)
+    manager = model._base_manager.using(connection.alias)
+    for start in range(0, len(batch), size):
+        manager._insert(
+            batch[start : start + size],
+            fields=fields,
+            using=connection.alias,
+            raw=True,
+        )
+
+
+def copy_data(model, batch, connection):
+    """The ``COPY`` statement for ``batch`` and its CSV payload."""
+    opts = model._meta
+    qn = connection.ops.quote_name
+    fields = _fields(model)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in batch:
+        row = []
+        for field in fields:
+            value = field.get_db_prep_save(getattr(obj, field.attname), connection)
+            row.append(r"\N" if value is None else value)
+        writer.writerow(row)
+    columns = ", ".join(qn(f.column) for f in fields)
+    sql = (
+        f"COPY {qn(opts.db_table)} ({columns}) FROM STDIN"
+        f" WITH (FORMAT csv, NULL '\\N')"
+    )
+    return sql, buffer.getvalue()
+
+
+def _copy(model, batch, connection):
+    sql, data = copy_data(model, batch, connection)
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(sql, io.StringIO(data))
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(data)
+
+
+def insert(model, objects, batch_size=DEFAULT_BATCH_SIZE, using=DEFAULT_DB_ALIAS):
+    """
+    Write ``objects`` (any iterable, consumed lazily) ``batch_size`` rows at a
+    time and return how many were written.
+    """
+    connection = connections[using]
+    objects = iter(objects)
+    written = 0
+    while batch := list(islice(objects, batch_size)):
+        if connection.vendor == "postgresql":
+            _copy(model, batch, connection)
+        else:
+            _insert(model, batch, connection)
+        written += len(batch)
+    return written
+
+
+def _collect(objects, into, key):
+    for obj in objects:
+        into.append(key(obj))
+        yield obj
+
+
+def seed(
+    rng,
+    customers=0,
+    photographers=0,
+    bookings_count=0,
+    notifications_count=0,
+    epoch=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    using=DEFAULT_DB_ALIAS,
+):
+    """
+    Generate and insert a whole dataset; return the row count per model.
+    Bookings need at least one customer and one photographer.
+    """
+    epoch = epoch or default_epoch()
+    customer_ids, photographer_ids, booking_rows = [], [], []
+    counts = {}
+
+    def write(model, objects):
+        counts[model.__name__] = counts.get(model.__name__, 0) + insert(
+            model, objects, batch_size=batch_size, using=using
+        )
+
+    uid = attrgetter("uid")
+    write(User, _collect(users(rng, "customer", customers, epoch), customer_ids, uid))
+    write(
+        User,
+        _collect(
+            users(rng, "photographer", photographers, epoch), photographer_ids, uid
+        ),
+    )
+    write(PhotographerProfile, profiles(rng, photographer_ids, epoch))
+    write(WorkingHours, working_hours(rng, photographer_ids))
+    if bookings_count and not (customer_ids and photographer_ids):
+        raise ValueError("Bookings need at least one customer and one photographer")
+    write(
+        Booking,
+        _collect(
+            bookings(rng, bookings_count, customer_ids, photographer_ids, epoch),
+            booking_rows,
+            lambda b: (b.id, b.customer_id, b.status, b.createdAt),
+        ),
+    )
+    if notifications_count and not (booking_rows or customer_ids):
+        raise ValueError("Notifications need at least one customer")
+    write(
+        Notification,
+        notifications(rng, notifications_count, booking_rows, customer_ids, epoch),
+    )
+
+    if photographers:
+        index_profiles(using=using)
+        transaction.on_commit(bump_directory_version, using=using)
+    return counts
+
+
+def clear(using=DEFAULT_DB_ALIAS):
+    """
+    Delete every seeded user together with their profiles, bookings and
+    notifications; return the number of rows deleted.
+    """
+    seeded = User.objects.using(using).filter(email__endswith=f"@{SEED_DOMAIN}")
+    querysets = [
+        Notification.objects.filter(user__in=seeded),
+        Booking.objects.filter(customer__in=seeded),
+        Booking.objects.filter(photographer__in=seeded),
+        WorkingHours.objects.filter(photographer__in=seeded),
+        PhotographerProfile.objects.filter(user__in=seeded),
+        seeded,
+    ]
+    return sum(queryset.using(using).delete()[0] for queryset in querysets)
@@ -0,0 +1,189 @@
+"""
+Read-only serializers that build response rows from ``values_list()``.
+
+DRF's ModelSerializer walks a field object per attribute per row, which
+dominates CPU on large list responses. A ``FastSerializer`` instead declares
+its output once as ``(key, model path, converter)`` triples, fetches exactly
+those paths as flat tuples and assembles each row with a function compiled
+once per serializer. The output matches the corresponding DRF serializer
+byte for byte once rendered; ``tests/test_fastserializers.py`` keeps them in
+step.
+"""
+
+from django.utils import timezone
+from rest_framework.response import Response
+
+from health.middleware import timed_serialization
+
+
+def to_iso(value):
+    return value.isoformat()
+
+
+def uses_timezone(converter):
+    """Mark a converter that takes the current timezone as a second argument."""
+    converter.uses_timezone = True
+    return converter
+
+
+@uses_timezone
+def to_datetime(value, tz):
+    # Same as rest_framework.fields.DateTimeField.to_representation
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class FastSerializer:
+    """
+    Declare ``fields`` as ``(key, path, converter)``. A dotted key nests the
+    value under an object (``"user.uid"``); ``converter`` may be ``None``
+    for values JSON encodes as they are, and is never called with ``None``.
+
+    The fields are compiled once per class into a single function that
+    builds a row's dict literal directly from tuple indexes.
+    """
+
+    fields = ()
+
+    @classmethod
+    def get_paths(cls):
+        return [path for _, path, _ in cls.fields]
+
+    @classmethod
+    def values_list(cls, queryset, paginator=None, view=None):
+        """
+        Named ``values_list()`` rows of ``queryset`` for ``serialize``, with
+        the columns ``paginator`` needs for its cursor appended.
+        """
+        paths = cls.get_paths()
+        # Cursor columns ride along after the serialized ones
+        paths.append(queryset.model._meta.pk.attname)
+        if paginator is not None and hasattr(paginator, "get_ordering"):
+            paths.append(paginator.get_ordering(queryset, view)[0].lstrip("-"))
+        return queryset.values_list(*dict.fromkeys(paths), named=True)
+
+    @classmethod
+    @timed_serialization
+    def serialize(cls, rows):
+        """Turn rows whose leading items follow ``fields`` into dicts."""
+        build = cls.__dict__.get("_build") or cls._compile()
+        # Looked up once per response rather than once per datetime
+        tz = timezone.get_current_timezone()
+        return [build(row, tz) for row in rows]
+
+    @classmethod
+    def _compile(cls):
+        namespace = {}
+        objects = {}
+        for index, (key, _, converter) in enumerate(cls.fields):
+            value = f"row[{index}]"
+            if converter is not None:
+                name = f"convert_{index}"
+                namespace[name] = converter
+                args = value
+                if getattr(converter, "uses_timezone", False):
+                    args += ", tz"
+                value = f"(None if {value} is None else {name}({args}))"
+            *parents, leaf = key.split(".")
+            node = objects
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+
+        def literal(node):
+            if isinstance(node, str):
+                return node
+            return "{%s}" % ", ".join(f"{k!r}: {literal(v)}" for k, v in node.items())
+
+        exec(f"def build(row, tz):\n    return {literal(objects)}\n", namespace)
+        cls._build = staticmethod(namespace["build"])
+        return namespace["build"]
+
+
+class UserFastSerializer(FastSerializer):
+    """Mirrors ``UserSerializer``."""
+
+    fields = (
+        ("uid", "uid", str),
+        ("email", "email", None),
+        ("displayName", "displayName", None),
+        ("role", "role", None),
+        ("date_joined", "date_joined", to_datetime),
+        ("createdAt", "createdAt", to_datetime),
+    )
+
+
+class PhotographerListFastSerializer(FastSerializer):
+    """Mirrors ``PhotographerListSerializer``."""
+
+    fields = (
+        *(
+            (f"user.{key}", f"user__{path}", converter)
+            for key, path, converter in UserFastSerializer.fields
+        ),
+        ("bio", "bio", None),
+        ("profile_image", "profile_image", None),
+        ("availableForBooking", "availableForBooking", None),
+    )
+
+
+class BookingFastSerializer(FastSerializer):
+    """Mirrors ``BookingSerializer``."""
+
+    fields = (
+        ("id", "id", str),
+        ("customer", "customer_id", str),
+        ("photographer", "photographer_id", str),
+        ("customer_name", "customer__displayName", None),
+        ("photographer_name", "photographer__displayName", None),
+        ("date", "date", to_iso),
+        ("time", "time", to_iso),
+        ("status", "status", None),
+        ("createdAt", "createdAt", to_datetime),
+    )
+
+
+class NotificationFastSerializer(FastSerializer):
+    """Mirrors ``NotificationSerializer``."""
+
+    fields = (
+        ("id", "id", str),
+        ("booking", "booking_id", str),
+        ("message", "message", None),
+        ("is_read", "is_read", None),
+        ("createdAt", "createdAt", to_datetime),
+    )
+
+
+class FastListMixin:
+    """
+    ListAPIView mixin that serves plain requests through
+    ``fast_serializer_class``. Requests using ``?fields=`` or ``?expand=``
+    take the regular serializer path.
+    """
+
+    fast_serializer_class = None
+
+    def use_fast_path(self, request):
+        params = request.query_params
+        return (
+            self.fast_serializer_class is not None
+            and "fields" not in params
+            and "expand" not in params
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_path(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.fast_serializer_class.values_list(queryset, self.paginator, self)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                self.fast_serializer_class.serialize(page)
+            )
+        return Response(self.fast_serializer_class.serialize(rows))
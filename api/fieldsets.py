@@ -0,0 +1,127 @@
+"""
+Sparse fieldsets for read endpoints.
+
+``?fields=`` picks the output fields as a comma separated list, with dots
+reaching into nested objects (``?fields=user.uid,user.displayName,bio``).
+``?expand=`` swaps a serializer's ``expandable_fields`` from their compact
+form (usually a primary key) for the nested object. The serializer then
+reports the model paths its remaining fields read, and the view loads just
+those columns with ``select_related()`` and ``only()``.
+"""
+
+from rest_framework import serializers
+
+UNSET = object()
+
+
+def parse_fieldset(value):
+    """
+    Parse ``"a,b.c,b.d"`` into ``{"a": {}, "b": {"c": {}, "d": {}}}``. An
+    empty dict selects every field of that object.
+    """
+    tree = {}
+    for path in value.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        for name in path.split("."):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that applies the request's ``fields`` and ``expand``
+    query parameters. The top-level serializer reads them from the request;
+    nested ones are handed their branch by their parent.
+    """
+
+    # Field name -> serializer class used when the field is expanded
+    expandable_fields = {}
+    fieldset = UNSET
+    expand = UNSET
+
+    def get_fieldset(self):
+        if self.fieldset is UNSET:
+            request = self.context.get("request")
+            value = request.query_params.get("fields") if request else None
+            self.fieldset = parse_fieldset(value) if value else None
+        if self.expand is UNSET:
+            request = self.context.get("request")
+            value = request.query_params.get("expand") if request else None
+            self.expand = parse_fieldset(value) if value else {}
+        return self.fieldset, self.expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset, expand = self.get_fieldset()
+
+        unknown = set(expand) - set(self.expandable_fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"expand": [f"Cannot expand: {', '.join(sorted(unknown))}"]}
+            )
+        for name in expand:
+            fields[name] = self.expandable_fields[name](read_only=True)
+
+        if fieldset:
+            unknown = set(fieldset) - set(fields)
+            if unknown:
+                raise serializers.ValidationError(
+                    {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}"]}
+                )
+            fields = {name: fields[name] for name in fields if name in fieldset}
+
+        for name, field in fields.items():
+            if isinstance(field, SparseFieldsMixin):
+                field.fieldset = (fieldset or {}).get(name) or None
+                field.expand = expand.get(name, {})
+        return fields
+
+    def get_model_paths(self, prefix=""):
+        """
+        Return ``(only, related)``: the model paths the selected fields read
+        and the relations to join for them, or ``None`` when a field reads
+        the whole object and the queryset cannot be narrowed.
+        """
+        only, related = [], []
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            if field.source == "*":
+                return None
+            path = prefix + field.source.replace(".", "__")
+            if isinstance(field, SparseFieldsMixin):
+                nested = field.get_model_paths(path + "__")
+                if nested is None:
+                    return None
+                related.append(path)
+                only.extend(nested[0])
+                related.extend(nested[1])
+            else:
+                if "." in field.source:
+                    related.append(path.rsplit("__", 1)[0])
+                only.append(path)
+        return only, related
+
+
+class SparseQuerysetMixin:
+    """
+    View mixin that narrows the filtered queryset to the columns the
+    request's fieldset needs. The paginator's ordering column is always
+    kept so the keyset cursor can be built without reloading rows.
+    """
+
+    def filter_queryset(self, queryset):
+        return self.narrow_queryset(super().filter_queryset(queryset))
+
+    def narrow_queryset(self, queryset):
+        paths = self.get_serializer().get_model_paths()
+        if paths is None:
+            return queryset
+        only, related = paths
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, "get_ordering"):
+            only.append(paginator.get_ordering(queryset, self)[0].lstrip("-"))
+        return queryset.select_related(None).select_related(*related).only(*only)
@@ -0,0 +1,112 @@
+"""
+Password hashing strategy.
+
+``PASSWORD_HASHER`` in settings picks the hasher for new hashes: Django's
+PBKDF2 (the default), Django's scrypt, or the memory-hard Argon2id below
+(needs argon2-cffi). Hashes made by the other hashers keep verifying and
+are rewritten with the preferred one on the user's next successful login,
+so switching strategy needs no migration.
+
+Hashing is deliberately slow CPU work. The async helpers run it in a
+bounded thread pool of ``PASSWORD_HASH_WORKERS`` threads rather than on the
+event loop; hashlib and argon2-cffi release the GIL, so the pool hashes on
+several cores at once and a burst of logins queues there instead of
+stalling every other request on the worker. ``benchmarks/bench_hashing.py``
+measures logins per second per core for each hasher.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id at the OWASP baseline of 19 MiB, two passes and one lane:
+    several times cheaper per login than Django's defaults (100 MiB, eight
+    lanes), yet still memory-hard. Hashes with other parameters are
+    upgraded on login.
+    """
+
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, "PASSWORD_HASH_WORKERS", None)
+            _executor = ThreadPoolExecutor(
+                max_workers=workers or os.cpu_count() or 1,
+                thread_name_prefix="password-hash",
+            )
+        return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(setting, **kwargs):
+    global _executor
+    if setting == "PASSWORD_HASH_WORKERS":
+        with _lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+async def run_hashing(func, *args, **kwargs):
+    """Run a hashing function in the password hashing pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def amake_password(password):
+    return await run_hashing(hashers.make_password, password)
+
+
+async def acheck_password(user, raw_password):
+    """
+    ``user.check_password`` for async code: the hash is verified in the
+    pool and an outdated hash is replaced with one from the preferred
+    hasher.
+    """
+    is_correct, must_update = await run_hashing(
+        hashers.verify_password, raw_password, user.password
+    )
+    if is_correct and must_update:
+        user.password = await amake_password(raw_password)
+        # A hash upgrade is not a password change
+        user._password = None
+        await user.asave(update_fields=["password"])
+    return is_correct
+
+
+async def aauthenticate(email, password):
+    """
+    Return the active user with this email and password, or ``None``, with
+    the semantics of ``ModelBackend.authenticate``.
+    """
+    User = get_user_model()
+    try:
+        user = await User._default_manager.aget_by_natural_key(email)
+    except User.DoesNotExist:
+        # Hash anyway so an unknown email takes as long as a wrong password
+        await amake_password(password)
+        return None
+    if await acheck_password(user, password) and user.is_active:
+        return user
+    return None
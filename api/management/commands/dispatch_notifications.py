@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from api.outbox import dispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver the notifications waiting in the outbox, for deployments "
+        "that run the dispatcher outside the web workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Deliver the events that are due now, purge old delivered "
+            "ones and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["once"]:
+            dispatcher.run()
+            return
+        delivered = 0
+        while due := dispatcher.deliver_pending():
+            delivered += due
+        purged = dispatcher.purge_delivered()
+        self.stdout.write(
+            f"Processed {delivered} outbox events, purged {purged} delivered ones"
+        )
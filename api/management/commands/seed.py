@@ -0,0 +1,68 @@
+import random
+import time
+from datetime import date, datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from api import factories
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate deterministic customers, photographers, bookings and "
+        "notifications for benchmarks and query plan checks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=1000)
+        parser.add_argument("--photographers", type=int, default=100)
+        parser.add_argument("--bookings", type=int, default=10_000)
+        parser.add_argument("--notifications", type=int, default=10_000)
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed (default 0)."
+        )
+        parser.add_argument(
+            "--epoch",
+            type=date.fromisoformat,
+            help="Date bookings are spread around (default today). Pass it "
+            "to reproduce a dataset exactly.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=factories.DEFAULT_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously seeded users and their data first.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        epoch = options["epoch"]
+        if epoch is not None:
+            epoch = datetime.combine(epoch, datetime.min.time(), timezone.utc)
+
+        start = time.perf_counter()
+        with transaction.atomic(using=using):
+            if options["clear"]:
+                deleted = factories.clear(using=using)
+                self.stdout.write(f"Deleted {deleted} seeded rows")
+            try:
+                counts = factories.seed(
+                    random.Random(options["seed"]),
+                    customers=options["customers"],
+                    photographers=options["photographers"],
+                    bookings_count=options["bookings"],
+                    notifications_count=options["notifications"],
+                    epoch=epoch,
+                    batch_size=options["batch_size"],
+                    using=using,
+                )
+            except ValueError as exc:
+                raise CommandError(exc)
+
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {elapsed:.1f}s"))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_notification"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["photographer", "-createdAt", "-id"],
+                name="booking_photog_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["customer", "-createdAt", "-id"],
+                name="booking_customer_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-createdAt", "-id"], name="notif_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["user", "-createdAt", "-id"],
+                name="notif_user_unread_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="photographerprofile",
+            index=models.Index(
+                condition=models.Q(("availableForBooking", True)),
+                fields=["-createdAt", "-id"],
+                name="profile_available_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:02
+
+import logging
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def reject_double_bookings(apps, schema_editor):
+    # Earlier releases allowed several active bookings for one slot; keep the
+    # oldest so the unique constraint can be created, and tell both parties
+    # about the ones that were dropped.
+    Booking = apps.get_model("api", "Booking")
+    Notification = apps.get_model("api", "Notification")
+    seen = set()
+    duplicates = []
+    active = Booking.objects.exclude(status="rejected").order_by("createdAt", "id")
+    fields = ("id", "customer_id", "photographer_id", "date", "time")
+    for booking in active.only(*fields).iterator():
+        slot = (booking.photographer_id, booking.date, booking.time)
+        if slot in seen:
+            duplicates.append(booking)
+        else:
+            seen.add(slot)
+    if not duplicates:
+        return
+
+    logger.warning(
+        "Rejected %d bookings that double-booked a slot: %s",
+        len(duplicates),
+        ", ".join(str(booking.id) for booking in duplicates),
+    )
+    Booking.objects.filter(id__in=[booking.id for booking in duplicates]).update(
+        status="rejected"
+    )
+    Notification.objects.bulk_create(
+        Notification(
+            user_id=user_id,
+            booking_id=booking.id,
+            message=(
+                f"Booking rejected: {booking.date} at {booking.time} "
+                "was already booked"
+            ),
+        )
+        for booking in duplicates
+        for user_id in (booking.customer_id, booking.photographer_id)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_booking_notification_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_double_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "rejected"), _negated=True),
+                fields=("photographer", "date", "time"),
+                name="booking_unique_active_slot",
+            ),
+        ),
+    ]
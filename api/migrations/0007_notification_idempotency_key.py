@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_booking_unique_active_slot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="idempotency_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=100, null=True, unique=True
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:16
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+FTS_TABLE = "api_photographer_search"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Build the vendor specific search structures and index existing
+    profiles: a GIN index over search_vector on PostgreSQL, an FTS5 table on
+    SQLite. Other backends get no full-text index.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX profile_search_idx ON api_photographerprofile"
+            " USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            "UPDATE api_photographerprofile p SET search_vector ="
+            " setweight(to_tsvector('english', coalesce(u.\"displayName\", '')), 'A')"
+            " || setweight(to_tsvector('english', p.bio), 'B')"
+            " FROM api_user u WHERE u.uid = p.user_id"
+        )
+    elif connection.vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "displayName, bio, tokenize = 'porter unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, displayName, bio)"
+            " SELECT p.id, u.displayName, p.bio FROM api_photographerprofile p"
+            " JOIN api_user u ON u.uid = p.user_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS profile_search_idx")
+    elif connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_workinghours"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photographerprofile",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
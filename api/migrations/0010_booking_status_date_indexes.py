@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_photographer_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["photographer", "status", "date"],
+                name="booking_photog_status_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["customer", "status", "date"],
+                name="booking_cust_status_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.core.management import call_command
+from django.db import migrations
+
+# DIRECTORY_CACHE_TABLE in settings; created whatever the backend, so any
+# process can switch to DIRECTORY_CACHE_BACKEND=database
+TABLE = "api_directory_cache"
+
+
+def create_table(apps, schema_editor):
+    call_command(
+        "createcachetable",
+        TABLE,
+        database=schema_editor.connection.alias,
+        verbosity=0,
+    )
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {schema_editor.quote_name(TABLE)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_outboxevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_table, drop_table),
+    ]
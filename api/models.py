@@ -1,7 +1,9 @@
 import uuid
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -61,10 +63,20 @@ class PhotographerProfile(models.Model):
     profile_image = models.URLField(blank=True, help_text="URL to profile image")
     availableForBooking = models.BooleanField(default=True)
     createdAt = models.DateTimeField(auto_now_add=True)
+    # Maintained by api.search on PostgreSQL; unused on SQLite
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "Photographer Profile"
         verbose_name_plural = "Photographer Profiles"
+        indexes = [
+            # Public directory only ever lists bookable profiles
+            models.Index(
+                fields=["-createdAt", "-id"],
+                condition=models.Q(availableForBooking=True),
+                name="profile_available_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Profile for {self.user.email}"
@@ -78,6 +90,71 @@ class PhotographerProfile(models.Model):
         super().save(*args, **kwargs)
 
 
+class BookingQuerySet(models.QuerySet):
+    def active(self):
+        return self.exclude(status=Booking.Status.REJECTED)
+
+    def matching(
+        self, status=None, date_from=None, date_to=None, upcoming=False, past=False
+    ):
+        """
+        Bookings in any of ``status`` whose date falls within ``date_from``
+        .. ``date_to`` (inclusive), and from today on (``upcoming``) or
+        before today (``past``). Per user, the booking_*_status_date_idx
+        indexes answer this without reading the rest of the history.
+        """
+        queryset = self
+        if status:
+            queryset = queryset.filter(status__in=sorted(status))
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to is not None:
+            queryset = queryset.filter(date__lte=date_to)
+        if upcoming:
+            queryset = queryset.filter(date__gte=timezone.localdate())
+        if past:
+            queryset = queryset.filter(date__lt=timezone.localdate())
+        return queryset
+
+    def slot_taken(self, photographer, date, time):
+        # Answered from the booking_unique_active_slot partial index
+        return (
+            self.active()
+            .filter(photographer=photographer, date=date, time=time)
+            .exists()
+        )
+
+    def transition(self, ids, photographer_id, status, from_statuses):
+        """
+        Move the photographer's bookings among ``ids`` that are currently in
+        one of ``from_statuses`` to ``status``, in a single
+        ``UPDATE ... RETURNING``. Returns the updated rows as Booking
+        instances; bookings that did not qualify are simply absent.
+        """
+        if not ids:
+            return []
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        opts = self.model._meta
+        pk = opts.pk
+        status_col = qn(opts.get_field("status").column)
+        photographer = opts.get_field("photographer")
+        sql = (
+            f"UPDATE {qn(opts.db_table)} SET {status_col} = %s"
+            f" WHERE {qn(pk.column)} IN ({', '.join(['%s'] * len(ids))})"
+            f" AND {qn(photographer.column)} = %s"
+            f" AND {status_col} IN ({', '.join(['%s'] * len(from_statuses))})"
+            f" RETURNING {', '.join(qn(f.column) for f in opts.concrete_fields)}"
+        )
+        params = [
+            status,
+            *(pk.get_db_prep_value(pk.to_python(i), connection) for i in ids),
+            photographer.get_db_prep_value(photographer_id, connection),
+            *from_statuses,
+        ]
+        return list(self.raw(sql, params))
+
+
 class Booking(models.Model):
     class Status(models.TextChoices):
         PENDING = "pending", "Pending"
@@ -85,6 +162,25 @@ class Booking(models.Model):
         REJECTED = "rejected", "Rejected"
         COMPLETED = "completed", "Completed"
 
+        @classmethod
+        def transitions(cls):
+            """Map each status to the statuses a booking may move to next."""
+            return {
+                cls.PENDING: {cls.ACCEPTED, cls.REJECTED},
+                cls.ACCEPTED: {cls.REJECTED, cls.COMPLETED},
+                cls.REJECTED: set(),
+                cls.COMPLETED: set(),
+            }
+
+        @classmethod
+        def sources(cls, target):
+            """Statuses from which a booking may move to ``target``."""
+            return [
+                status
+                for status, targets in cls.transitions().items()
+                if target in targets
+            ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     customer = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="customer_bookings"
@@ -99,8 +195,51 @@ class Booking(models.Model):
     )
     createdAt = models.DateTimeField(auto_now_add=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         ordering = ["-createdAt"]
+        indexes = [
+            models.Index(
+                fields=["photographer", "-createdAt", "-id"],
+                name="booking_photog_created_idx",
+            ),
+            models.Index(
+                fields=["customer", "-createdAt", "-id"],
+                name="booking_customer_created_idx",
+            ),
+            # Status and date filters of the booking lists
+            models.Index(
+                fields=["photographer", "status", "date"],
+                name="booking_photog_status_date_idx",
+            ),
+            models.Index(
+                fields=["customer", "status", "date"],
+                name="booking_cust_status_date_idx",
+            ),
+        ]
+        constraints = [
+            # A slot stays taken until the photographer rejects the booking
+            models.UniqueConstraint(
+                fields=["photographer", "date", "time"],
+                condition=~models.Q(status="rejected"),
+                name="booking_unique_active_slot",
+            ),
+        ]
+
+    @classmethod
+    def is_slot_conflict(cls, error):
+        """Whether an ``IntegrityError`` violated booking_unique_active_slot."""
+        diag = getattr(error.__cause__, "diag", None)
+        if diag is not None:
+            # PostgreSQL names the violated constraint
+            return diag.constraint_name == "booking_unique_active_slot"
+        # SQLite lists the columns of the violated unique index instead
+        columns = ", ".join(
+            f"{cls._meta.db_table}.{cls._meta.get_field(name).column}"
+            for name in ("photographer", "date", "time")
+        )
+        return str(error) == f"UNIQUE constraint failed: {columns}"
 
     def clean(self):
         # Enforce correct roles at the model level
@@ -132,9 +271,111 @@ class Notification(models.Model):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
     createdAt = models.DateTimeField(auto_now_add=True)
+    # Set by api.outbox so a retried or repeated event never duplicates a row
+    idempotency_key = models.CharField(
+        max_length=100, unique=True, null=True, blank=True, editable=False
+    )
 
     class Meta:
         ordering = ["-createdAt"]
+        indexes = [
+            models.Index(
+                fields=["user", "-createdAt", "-id"],
+                name="notif_user_created_idx",
+            ),
+            # Partial rather than (user, is_read, ...): Django renders
+            # is_read=False as "NOT is_read", which SQLite cannot seek on
+            # through a composite key but matches against this condition.
+            models.Index(
+                fields=["user", "-createdAt", "-id"],
+                condition=models.Q(is_read=False),
+                name="notif_user_unread_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Notification to {self.user.email}: {self.message[:40]}"
+
+
+class OutboxEventQuerySet(models.QuerySet):
+    def due(self, now=None):
+        """Undelivered events whose next attempt is not in the future."""
+        return self.filter(
+            delivered_at__isnull=True, next_attempt_at__lte=now or timezone.now()
+        ).order_by("next_attempt_at", "id")
+
+
+class OutboxEvent(models.Model):
+    """
+    A notification written in the same transaction as the booking change
+    that causes it, and turned into a Notification row by api.outbox.
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    booking = models.ForeignKey(
+        "Booking", on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    message = models.TextField()
+    createdAt = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                condition=models.Q(delivered_at__isnull=True),
+                name="outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Outbox event {self.key}"
+
+
+class WorkingHours(models.Model):
+    """
+    A weekly window during which a photographer takes bookings.
+
+    A photographer may have several windows per weekday (e.g. a lunch break
+    splits the day in two).
+    """
+
+    class Weekday(models.IntegerChoices):
+        MONDAY = 0, "Monday"
+        TUESDAY = 1, "Tuesday"
+        WEDNESDAY = 2, "Wednesday"
+        THURSDAY = 3, "Thursday"
+        FRIDAY = 4, "Friday"
+        SATURDAY = 5, "Saturday"
+        SUNDAY = 6, "Sunday"
+
+    photographer = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="working_hours"
+    )
+    weekday = models.PositiveSmallIntegerField(choices=Weekday.choices)
+    start = models.TimeField()
+    end = models.TimeField()
+
+    class Meta:
+        ordering = ["weekday", "start"]
+        verbose_name_plural = "Working hours"
+        indexes = [
+            models.Index(
+                fields=["photographer", "weekday", "start"],
+                name="hours_photog_weekday_idx",
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end__gt=models.F("start")),
+                name="hours_end_after_start",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_weekday_display()} {self.start}-{self.end}"
@@ -1,12 +1,39 @@
+from django.conf import settings
 from django.urls import path
 
-from .views import NotificationMarkReadView, NotificationMeListView
+from .async_views import AsyncNotificationMeListView, NotificationStreamView
+from .views import (
+    NotificationBulkReadView,
+    NotificationMarkReadView,
+    NotificationMeListView,
+    NotificationUnreadCountView,
+)
+
+if settings.API_ASYNC_VIEWS:
+    NotificationMeListView = AsyncNotificationMeListView
 
 urlpatterns = [
     path("me/", NotificationMeListView.as_view(), name="notifications-me"),
+    path("read/", NotificationBulkReadView.as_view(), name="notifications-read"),
+    path(
+        "unread-count/",
+        NotificationUnreadCountView.as_view(),
+        name="notifications-unread-count",
+    ),
     path(
         "<uuid:id>/read/",
         NotificationMarkReadView.as_view(),
         name="notification-mark-read",
     ),
 ]
+
+if settings.NOTIFICATION_STREAM_ENABLED:
+    # A WSGI worker would buffer the whole stream and hold a thread meanwhile,
+    # and without a pool every poll would open a PostgreSQL connection
+    urlpatterns.append(
+        path(
+            "stream/",
+            NotificationStreamView.as_view(),
+            name="notifications-stream",
+        )
+    )
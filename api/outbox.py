@@ -0,0 +1,228 @@
+"""
+Notification outbox.
+
+Booking writes describe the notifications they cause as events with an
+idempotency key and hand them to ``enqueue``. In ``sync`` mode the
+Notification rows are inserted inside the caller's transaction. In
+``thread`` mode the events are stored as OutboxEvent rows in that
+transaction, and a background worker (``dispatcher``, or the
+``dispatch_notifications`` command) turns them into notifications in
+batches and marks them delivered. Events survive worker restarts and
+crashes; one that fails is retried until it goes through. The unique
+``Notification.idempotency_key`` makes retries and duplicate events
+harmless. Delivered events are kept for ``NOTIFICATION_OUTBOX_RETENTION``
+seconds, then purged.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import Notification, OutboxEvent
+from .pubsub import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NotificationEvent:
+    key: str
+    user_id: UUID
+    booking_id: UUID | None
+    message: str
+
+    @classmethod
+    def for_booking(cls, booking, user_id, message, event):
+        return cls(
+            key=f"booking:{booking.pk}:{event}",
+            user_id=user_id,
+            booking_id=booking.pk,
+            message=message,
+        )
+
+
+def write_notifications(events):
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=event.user_id,
+                booking_id=event.booking_id,
+                message=event.message,
+                idempotency_key=event.key,
+            )
+            for event in events
+        ],
+        ignore_conflicts=True,
+    )
+    user_ids = {event.user_id for event in events}
+    # Wake the recipients' notification streams once the rows are visible
+    transaction.on_commit(lambda: get_broker().publish(user_ids))
+
+
+def store_events(events):
+    OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                key=event.key,
+                user_id=event.user_id,
+                booking_id=event.booking_id,
+                message=event.message,
+            )
+            for event in events
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class NotificationDispatcher:
+    """
+    Background thread that delivers due OutboxEvent rows as notifications.
+
+    It wakes when a transaction that stored events commits, and every
+    ``poll_interval`` seconds otherwise, so events left behind by another
+    process (recycled, crashed or redeployed) are delivered as well. Each
+    batch of up to ``batch_size`` events is written and marked delivered in
+    one transaction. Events that fail stay in the outbox and are retried
+    after an exponential backoff, capped at ``max_backoff`` seconds. Every
+    ``purge_interval`` seconds, delivered events past their retention are
+    deleted.
+    """
+
+    batch_size = 500
+    poll_interval = 5
+    backoff = 0.1
+    max_backoff = 300
+    purge_interval = 3600
+
+    def __init__(self):
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._passes = threading.Condition()
+        self._started = 0
+        self._finished = 0
+        self._next_purge = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self.run, name="notification-dispatcher", daemon=True
+                )
+                self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wake.set()
+
+    def flush(self):
+        """Block until the worker has delivered every event due now."""
+        with self._passes:
+            wanted = self._started + 1
+            self.wake()
+            self._passes.wait_for(lambda: self._finished >= wanted)
+
+    def run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self._passes:
+                self._started += 1
+                current = self._started
+            try:
+                close_old_connections()
+                while self.deliver_pending():
+                    pass
+                if time.monotonic() >= self._next_purge:
+                    self.purge_delivered()
+                    self._next_purge = time.monotonic() + self.purge_interval
+            except Exception:
+                logger.exception("Notification outbox pass failed")
+            finally:
+                close_old_connections()
+                with self._passes:
+                    self._finished = current
+                    self._passes.notify_all()
+
+    def deliver_pending(self):
+        """Deliver one batch of due events and return how many were due."""
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                OutboxEvent.objects.due(now).select_for_update(skip_locked=True)[
+                    : self.batch_size
+                ]
+            )
+            if not batch:
+                return 0
+            if self._write(batch):
+                delivered, failed = batch, []
+            elif len(batch) == 1:
+                delivered, failed = [], batch
+            else:
+                # Find the events that fail so they do not hold up the rest
+                delivered, failed = [], []
+                for event in batch:
+                    (delivered if self._write([event]) else failed).append(event)
+
+            OutboxEvent.objects.filter(pk__in=[e.pk for e in delivered]).update(
+                delivered_at=now
+            )
+            for event in failed:
+                event.attempts += 1
+                delay = min(self.backoff * 2 ** (event.attempts - 1), self.max_backoff)
+                event.next_attempt_at = now + timedelta(seconds=delay)
+            OutboxEvent.objects.bulk_update(failed, ["attempts", "next_attempt_at"])
+        return len(batch)
+
+    def purge_delivered(self, now=None):
+        """Delete delivered events past their retention; return how many."""
+        cutoff = (now or timezone.now()) - timedelta(
+            seconds=settings.NOTIFICATION_OUTBOX_RETENTION
+        )
+        deleted, _ = OutboxEvent.objects.filter(delivered_at__lt=cutoff).delete()
+        return deleted
+
+    def _write(self, events):
+        try:
+            with transaction.atomic():
+                write_notifications(
+                    [
+                        NotificationEvent(
+                            key=event.key,
+                            user_id=event.user_id,
+                            booking_id=event.booking_id,
+                            message=event.message,
+                        )
+                        for event in events
+                    ]
+                )
+                # Foreign keys are only checked at commit, where a bad event
+                # would fail the whole batch; check them in this savepoint
+                connection.check_constraints(table_names=[Notification._meta.db_table])
+        except Exception:
+            logger.exception(
+                "Failed to deliver %d notification(s), will retry: %s",
+                len(events),
+                [event.key for event in events],
+            )
+            return False
+        return True
+
+
+dispatcher = NotificationDispatcher()
+
+
+def enqueue(*events):
+    if getattr(settings, "NOTIFICATION_DISPATCH", "sync") == "sync":
+        write_notifications(events)
+    else:
+        store_events(events)
+        transaction.on_commit(dispatcher.wake)
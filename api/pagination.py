@@ -0,0 +1,137 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination on ``(createdAt, pk)``.
+
+    The page boundary is expressed as a WHERE clause on the ordering columns,
+    so the database never has to skip rows with OFFSET. The response body
+    stays a plain JSON list; the next page is advertised through the
+    ``Link`` header as an opaque ``cursor`` query parameter.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 200
+    default_ordering = ("-createdAt",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, through the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        self.request = request
+        self.field, self.pk_field = self.get_ordering(queryset, view)
+        self.descending = self.field.startswith("-")
+        self.field_name = self.field.lstrip("-")
+        self.pk_attname = queryset.model._meta.pk.attname
+        self.limit = self.get_page_size(request)
+
+        queryset = queryset.order_by(self.field, self.pk_field)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(*position))
+
+        # Fetch one extra row to find out whether there is a next page
+        return queryset[: self.limit + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.limit
+        self.page = results[: self.limit]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return self.add_link_header(Response(data))
+
+    def add_link_header(self, response):
+        next_link = self.get_next_link()
+        if next_link is not None:
+            response["Link"] = f'<{next_link}>; rel="next"'
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        return schema
+
+    def get_ordering(self, queryset, view):
+        ordering = (
+            getattr(view, "ordering", None)
+            or queryset.model._meta.ordering
+            or self.default_ordering
+        )
+        field = ordering[0]
+        # The primary key breaks ties between rows sharing a timestamp
+        pk_field = "-pk" if field.startswith("-") else "pk"
+        return field, pk_field
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_seek_filter(self, value, pk):
+        op = "lt" if self.descending else "gt"
+        return Q(**{f"{self.field_name}__{op}": value}) | Q(
+            **{self.field_name: value, f"pk__{op}": pk}
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = self.encode_cursor(*self.get_position(self.page[-1]))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_position(self, row):
+        """
+        The ``(ordering value, pk)`` of a page row, which may be a model
+        instance, a named ``values_list()`` row or a ``values()`` dict.
+        """
+        if isinstance(row, dict):
+            return row[self.field_name], row[self.pk_attname]
+        return getattr(row, self.field_name), getattr(row, self.pk_attname)
+
+    @staticmethod
+    def encode_cursor(value, pk):
+        payload = json.dumps([value.isoformat(), str(pk)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def parse_cursor(encoded, model):
+        """Return the ``(createdAt, pk)`` position or raise ``ValueError``."""
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(value), model._meta.pk.to_python(pk)
+        except (TypeError, ValidationError) as exc:
+            raise ValueError(encoded) from exc
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return self.parse_cursor(encoded, model)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
@@ -1,15 +1,31 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import AsyncPhotographerDetailView, AsyncPhotographerListView
 from .views import (
+    PhotographerAvailabilityView,
     PhotographerDetailView,
+    PhotographerHoursView,
     PhotographerListView,
+    PhotographerSearchView,
     PhotographersTestView,
     PhotographerUpdateView,
 )
 
+if settings.API_ASYNC_VIEWS:
+    PhotographerListView = AsyncPhotographerListView
+    PhotographerDetailView = AsyncPhotographerDetailView
+
 urlpatterns = [
     path("", PhotographerListView.as_view(), name="photographer-list"),
+    path("search/", PhotographerSearchView.as_view(), name="photographer-search"),
     path("<uuid:id>/", PhotographerDetailView.as_view(), name="photographer-detail"),
     path("me/", PhotographerUpdateView.as_view(), name="photographer-me"),
+    path("me/hours/", PhotographerHoursView.as_view(), name="photographer-hours"),
+    path(
+        "availability/",
+        PhotographerAvailabilityView.as_view(),
+        name="photographer-availability",
+    ),
     path("test/", PhotographersTestView.as_view(), name="photographers-test"),
 ]
@@ -0,0 +1,91 @@
+"""
+Wake-up signals for notification streams.
+
+Subscribers (one per open stream) wait on their user's channel; notification
+writes publish the user ids they touched. The signal carries no payload:
+streams re-read the database from their cursor, so the database stays the
+source of truth and a missed signal only delays delivery until the next
+heartbeat poll. ``LocalBroker`` works within one process; a shared broker
+for multi-worker deployments only has to implement ``subscribe`` and
+``publish`` and be named in the ``NOTIFICATION_BROKER`` setting.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    def notify(self):
+        # May be called from any thread, e.g. the outbox worker
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # The stream's event loop has already shut down
+            pass
+
+    async def wait(self, timeout):
+        """Return True if woken by a publish, False on timeout."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process broker: one set of subscriptions per channel."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, str(channel))
+        with self._lock:
+            self._subscriptions[subscription.channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channels):
+        with self._lock:
+            targets = [
+                subscription
+                for channel in {str(c) for c in channels}
+                for subscription in self._subscriptions.get(channel, ())
+            ]
+        for subscription in targets:
+            subscription.notify()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            path = getattr(settings, "NOTIFICATION_BROKER", "api.pubsub.LocalBroker")
+            _broker = import_string(path)()
+        return _broker
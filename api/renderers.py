@@ -0,0 +1,63 @@
+"""
+JSON renderer with an orjson fast path.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` for
+the compact, non-ASCII-escaping output this API uses, but encodes UUIDs,
+datetimes, dates and times natively through orjson instead of calling back
+into Python for each one. Anything orjson cannot encode (lazy strings,
+querysets, integers beyond 64 bits, non-string keys, ...) falls back to
+DRF's encoder, as do indented responses and installs without orjson.
+
+Responses whose data is ``EncodedJSON`` are written out as they are, so
+cached JSON does not have to be parsed and encoded again.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# orjson leaves these unescaped, DRF escapes them for JavaScript consumers
+LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class EncodedJSON(bytes):
+    """Bytes that already hold a rendered JSON document."""
+
+
+class FastJSONRenderer(JSONRenderer):
+    # orjson's UTC_Z matches DRF writing "Z" for any zero UTC offset
+    orjson_options = orjson.OPT_UTC_Z if orjson else 0
+    accepts_encoded = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, EncodedJSON):
+            return bytes(data)
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data, default=self.encoder_default, option=self.orjson_options
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in content:
+            for raw, escaped in LINE_SEPARATORS:
+                content = content.replace(raw, escaped)
+        return content
+
+    def encoder_default(self, obj):
+        return self.encoder_class().default(obj)
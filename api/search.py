@@ -0,0 +1,126 @@
+"""
+Photographer full-text search over display name and bio.
+
+On PostgreSQL each profile stores a weighted tsvector (display name ``A``,
+bio ``B``) in ``PhotographerProfile.search_vector``, covered by a GIN index
+and ranked with ``ts_rank``. On SQLite the same text lives in the FTS5 table
+``api_photographer_search``, keyed by profile id, and is ranked with
+``bm25``. Both are created by migration 0009 and refreshed from the
+PhotographerProfile and User signals through ``index_profiles``.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+
+from .models import PhotographerProfile, User
+
+CONFIG = "english"
+FTS_TABLE = "api_photographer_search"
+# bm25 column weights for (displayName, bio)
+FTS_WEIGHTS = (10.0, 1.0)
+
+
+def _source_sql(connection, where):
+    qn = connection.ops.quote_name
+    profile = PhotographerProfile._meta.db_table
+    return (
+        f"FROM {qn(profile)} p JOIN {qn(User._meta.db_table)} u"
+        f" ON u.{qn('uid')} = p.{qn('user_id')} WHERE {where}"
+    )
+
+
+def index_profiles(profile_ids=None, user_ids=None, using="default"):
+    """
+    Refresh the search text of the given profiles, or of the profiles
+    belonging to ``user_ids``. With neither, every profile is reindexed.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    if profile_ids is not None:
+        column, ids = "id", list(profile_ids)
+    elif user_ids is not None:
+        pk = User._meta.pk
+        column = "user_id"
+        ids = [pk.get_db_prep_value(pk.to_python(u), connection) for u in user_ids]
+    else:
+        column, ids = None, None
+    if ids == []:
+        return
+    where = "1 = 1"
+    if ids is not None:
+        where = f"p.{qn(column)} IN ({', '.join(['%s'] * len(ids))})"
+    params = ids or []
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            profile = qn(PhotographerProfile._meta.db_table)
+            cursor.execute(
+                f"UPDATE {profile} p SET {qn('search_vector')} ="
+                f" setweight(to_tsvector(%s, coalesce(u.{qn('displayName')}, '')), 'A')"
+                f" || setweight(to_tsvector(%s, p.{qn('bio')}), 'B')"
+                f" FROM {qn(User._meta.db_table)} u"
+                f" WHERE u.{qn('uid')} = p.{qn('user_id')} AND {where}",
+                [CONFIG, CONFIG, *params],
+            )
+        elif connection.vendor == "sqlite":
+            if ids is None:
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            else:
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid IN"
+                    f" (SELECT p.id {_source_sql(connection, where)})",
+                    params,
+                )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {qn('displayName')}, bio)"
+                f" SELECT p.id, u.{qn('displayName')}, p.bio"
+                f" {_source_sql(connection, where)}",
+                params,
+            )
+
+
+def unindex_profile(profile_id, using="default"):
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [profile_id])
+
+
+def fts5_query(text):
+    """
+    Turn free text into an FTS5 query that matches every word, treating
+    the user's input as plain words rather than FTS5 syntax.
+    """
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+def search_profiles(queryset, text):
+    """
+    Restrict ``queryset`` to profiles matching ``text``, annotated with a
+    ``rank`` (higher is better) and ordered by it.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        query = SearchQuery(text, config=CONFIG, search_type="websearch")
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "-createdAt", "-id")
+        )
+
+    match = fts5_query(text)
+    if not match:
+        return queryset.none()
+    table = connection.ops.quote_name(PhotographerProfile._meta.db_table)
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    # Django cannot join a virtual table, so the match is spliced in with
+    # extra(); FTS5 drives the join and each hit is a primary key lookup
+    return queryset.extra(
+        select={"rank": f"-bm25({FTS_TABLE}, {weights})"},
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE} MATCH %s", f"{FTS_TABLE}.rowid = {table}.id"],
+        params=[match],
+    ).order_by("-rank", "-createdAt", "-id")
@@ -2,12 +2,13 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
-from .models import Booking, Notification, PhotographerProfile
+from .fieldsets import SparseFieldsMixin
+from .models import Booking, Notification, PhotographerProfile, WorkingHours
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["uid", "email", "displayName", "role", "date_joined", "createdAt"]
@@ -28,13 +29,19 @@ class SignupSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop("password")
+        # The async signup view hashes in api.hashing's pool and passes
+        # the result to save()
+        encoded = validated_data.pop("encoded_password", None)
         user = User(**validated_data)
-        user.set_password(password)
+        if encoded is None:
+            user.set_password(password)
+        else:
+            user.password = encoded
         user.save()
         return user
 
 
-class PhotographerProfileSerializer(serializers.ModelSerializer):
+class PhotographerProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -43,7 +50,7 @@ class PhotographerProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["createdAt"]
 
 
-class PhotographerListSerializer(serializers.ModelSerializer):
+class PhotographerListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -57,7 +64,9 @@ class PhotographerUpdateSerializer(serializers.ModelSerializer):
         fields = ["bio", "profile_image", "availableForBooking"]
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {"customer": UserSerializer, "photographer": UserSerializer}
+
     customer_name = serializers.CharField(source="customer.displayName", read_only=True)
     photographer_name = serializers.CharField(
         source="photographer.displayName", read_only=True
@@ -83,6 +92,8 @@ class BookingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Booking
         fields = ["photographer", "date", "time"]
+        # Slot conflicts are reported by BookingCreateView as 409, not 400
+        validators = []
 
     @staticmethod
     def validate_photographer(value):
@@ -111,12 +122,126 @@ class BookingStatusUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class BookingTransitionSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.ChoiceField(
+        choices=[
+            Booking.Status.ACCEPTED,
+            Booking.Status.REJECTED,
+            Booking.Status.COMPLETED,
+        ]
+    )
+
+
+class BookingBulkTransitionSerializer(serializers.Serializer):
+    transitions = BookingTransitionSerializer(
+        many=True, allow_empty=False, max_length=200
+    )
+
+    @staticmethod
+    def validate_transitions(value):
+        ids = [item["id"] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each booking may appear only once")
+        return value
+
+
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {"booking": BookingSerializer}
+
     booking = serializers.UUIDField(
-        source="booking.id", allow_null=True, read_only=True
+        source="booking_id", allow_null=True, read_only=True
     )
 
     class Meta:
         model = Notification
         fields = ["id", "booking", "message", "is_read", "createdAt"]
         read_only_fields = ["id", "booking", "message", "createdAt"]
+
+
+class NotificationBulkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=1000
+    )
+    all = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs["all"] == ("ids" in attrs):
+            raise serializers.ValidationError('Provide either "ids" or "all": true')
+        return attrs
+
+
+class WorkingHoursSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WorkingHours
+        fields = ["weekday", "start", "end"]
+
+    def validate(self, attrs):
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError("end must be after start")
+        return attrs
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    max_days = 62
+
+    photographer = serializers.ListField(
+        child=serializers.UUIDField(), min_length=1, max_length=50
+    )
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    duration = serializers.IntegerField(required=False, min_value=15, max_value=24 * 60)
+
+    def validate(self, attrs):
+        days = (attrs["date_to"] - attrs["date_from"]).days
+        if days < 0:
+            raise serializers.ValidationError("date_to must not be before date_from")
+        if days >= self.max_days:
+            raise serializers.ValidationError(
+                f"The range may span at most {self.max_days} days"
+            )
+        return attrs
+
+
+class PhotographerSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=False, allow_blank=True, max_length=200)
+    available = serializers.BooleanField(required=False, default=True)
+    has_image = serializers.BooleanField(required=False, allow_null=True, default=None)
+    free_on = serializers.DateField(required=False)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=100, default=20
+    )
+
+
+class MultipleChoiceListField(serializers.MultipleChoiceField):
+    """
+    ``MultipleChoiceField`` for query parameters: takes repeated
+    (``?status=a&status=b``) and comma separated (``?status=a,b``) values.
+    """
+
+    def get_value(self, dictionary):
+        value = super().get_value(dictionary)
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            value = [item for part in value for item in part.split(",") if item]
+        return value
+
+
+class BookingListQuerySerializer(serializers.Serializer):
+    status = MultipleChoiceListField(choices=Booking.Status.choices, required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    upcoming = serializers.BooleanField(required=False, default=False)
+    past = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if attrs["upcoming"] and attrs["past"]:
+            raise serializers.ValidationError("upcoming and past exclude each other")
+        if (
+            "date_from" in attrs
+            and "date_to" in attrs
+            and attrs["date_to"] < attrs["date_from"]
+        ):
+            raise serializers.ValidationError("date_to must not be before date_from")
+        return attrs
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_state_cache
+from .cache import bump_directory_version
+from .models import PhotographerProfile
+from .search import index_profiles, unindex_profile
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_state(sender, instance, **kwargs):
+    # Drop the cached active/password state so revocation applies at once
+    user_state_cache.delete(str(instance.pk))
+
+
+# Saves of these fields alone (login, password rehash) never show up in the
+# directory
+PRIVATE_USER_FIELDS = frozenset({"last_login", "password"})
+
+
+@receiver(post_save, sender=PhotographerProfile)
+@receiver(post_delete, sender=PhotographerProfile)
+def invalidate_directory(sender, using, **kwargs):
+    # After commit: a read in between would cache the old rows under the new
+    # version
+    transaction.on_commit(bump_directory_version, using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_directory_for_user(
+    sender, instance, using, update_fields=None, **kwargs
+):
+    if instance.role != User.Roles.PHOTOGRAPHER:
+        return
+    if update_fields is not None and update_fields <= PRIVATE_USER_FIELDS:
+        return
+    transaction.on_commit(bump_directory_version, using=using)
+
+
+@receiver(post_save, sender=PhotographerProfile)
+def reindex_profile(sender, instance, using, **kwargs):
+    index_profiles(profile_ids=[instance.pk], using=using)
+
+
+@receiver(post_save, sender=User)
+def reindex_user_profile(sender, instance, using, update_fields, **kwargs):
+    # Only the display name is searched; skip e.g. last_login updates
+    if instance.role != User.Roles.PHOTOGRAPHER:
+        return
+    if update_fields is not None and "displayName" not in update_fields:
+        return
+    index_profiles(user_ids=[instance.pk], using=using)
+
+
+@receiver(post_delete, sender=PhotographerProfile)
+def unindex_deleted_profile(sender, instance, using, **kwargs):
+    unindex_profile(instance.pk, using=using)
@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from . import outbox
+from .models import Booking
+from .outbox import NotificationEvent
+
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+ILLEGAL_TRANSITION = "illegal_transition"
+
+
+def apply_transitions(photographer, changes):
+    """
+    Apply ``changes`` (booking id -> target status) for ``photographer``.
+
+    Everything happens in one transaction: one conditional UPDATE per
+    distinct target status (see ``BookingQuerySet.transition``), a single
+    lookup explaining the bookings that did not move, and one batch of
+    customer notifications. Returns ``(updated, failures)`` where
+    ``updated`` maps ids to the updated bookings and ``failures`` maps ids to
+    ``(code, detail)``.
+    """
+    by_target = defaultdict(list)
+    for booking_id, status in changes.items():
+        by_target[status].append(booking_id)
+
+    with transaction.atomic():
+        updated = {}
+        for status, ids in by_target.items():
+            for booking in Booking.objects.transition(
+                ids, photographer.pk, status, Booking.Status.sources(status)
+            ):
+                updated[booking.pk] = booking
+
+        failures = {}
+        missing = [booking_id for booking_id in changes if booking_id not in updated]
+        if missing:
+            current = {
+                booking_id: (photographer_id, status)
+                for booking_id, photographer_id, status in Booking.objects.filter(
+                    id__in=missing
+                ).values_list("id", "photographer_id", "status")
+            }
+            for booking_id in missing:
+                failures[booking_id] = explain_failure(
+                    photographer, current.get(booking_id), changes[booking_id]
+                )
+
+        outbox.enqueue(
+            *(
+                NotificationEvent.for_booking(
+                    booking,
+                    booking.customer_id,
+                    f"Booking {booking.status}",
+                    booking.status,
+                )
+                for booking in updated.values()
+            )
+        )
+    return updated, failures
+
+
+def explain_failure(photographer, current, target):
+    if current is None:
+        return NOT_FOUND, "Booking not found."
+    photographer_id, status = current
+    if photographer_id != photographer.pk:
+        return FORBIDDEN, "Only the assigned photographer can update this booking"
+    return ILLEGAL_TRANSITION, f"Cannot change a {status} booking to {target}."
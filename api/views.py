@@ -1,23 +1,44 @@
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
 from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .models import Booking, Notification, PhotographerProfile
+from . import outbox, transitions
+from .authentication import StatelessJWTAuthentication
+from .cache import CachedDirectoryMixin
+from .exceptions import BookingConflict
+from .fastserializers import (
+    BookingFastSerializer,
+    FastListMixin,
+    NotificationFastSerializer,
+    PhotographerListFastSerializer,
+)
+from .fieldsets import SparseQuerysetMixin
+from .availability import free_slots
+from .search import search_profiles
+from .models import Booking, Notification, PhotographerProfile, WorkingHours
+from .outbox import NotificationEvent
 from .serializers import (
+    AvailabilityQuerySerializer,
+    BookingBulkTransitionSerializer,
     BookingCreateSerializer,
+    BookingListQuerySerializer,
     BookingSerializer,
     BookingStatusUpdateSerializer,
+    NotificationBulkReadSerializer,
     NotificationSerializer,
     PhotographerListSerializer,
     PhotographerProfileSerializer,
+    PhotographerSearchQuerySerializer,
     PhotographerUpdateSerializer,
     SignupSerializer,
     UserSerializer,
+    WorkingHoursSerializer,
 )
 
 User = get_user_model()
@@ -29,6 +50,8 @@ class SignupView(generics.CreateAPIView):
 
 
 class MeView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
+
     @staticmethod
     def get(request):
         return Response(UserSerializer(request.user).data)
@@ -43,6 +66,9 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["role"] = user.role
         token["email"] = user.email
         token["displayName"] = user.displayName
+        # Lets StatelessJWTAuthentication serve MeView without a user lookup
+        token["createdAt"] = user.createdAt.isoformat()
+        token["date_joined"] = user.date_joined.isoformat()
         return token
 
     def validate(self, attrs):
@@ -94,13 +120,17 @@ class AuthTestView(APIView):
         return Response({"authenticated": False})
 
 
-class PhotographerListView(generics.ListAPIView):
+class PhotographerListView(
+    CachedDirectoryMixin, FastListMixin, SparseQuerysetMixin, generics.ListAPIView
+):
     """
     List all photographers available for booking.
     Public endpoint - no authentication required.
+    Served from the versioned directory cache.
     """
 
     serializer_class = PhotographerListSerializer
+    fast_serializer_class = PhotographerListFastSerializer
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -109,18 +139,94 @@ class PhotographerListView(generics.ListAPIView):
         ).select_related("user")
 
 
-class PhotographerDetailView(generics.RetrieveAPIView):
+class PhotographerSearchView(SparseQuerysetMixin, generics.ListAPIView):
+    """
+    Ranked full-text search over photographer display names and bios.
+    Public endpoint - no authentication required.
+
+    Query parameters: ``q`` (free text), ``available`` (default true),
+    ``has_image``, ``free_on`` (a date with at least one free slot) and
+    ``limit`` (default 20, at most 100). Without ``q`` the newest profiles
+    come first. Returns the top ``limit`` matches, unpaginated.
+    """
+
+    serializer_class = PhotographerListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        serializer = PhotographerSearchQuerySerializer(
+            data=self.request.query_params.dict()
+        )
+        serializer.is_valid(raise_exception=True)
+        self.query = query = serializer.validated_data
+
+        queryset = PhotographerProfile.objects.filter(
+            availableForBooking=query["available"]
+        )
+        if query["has_image"] is True:
+            queryset = queryset.exclude(profile_image="")
+        elif query["has_image"] is False:
+            queryset = queryset.filter(profile_image="")
+        if "free_on" in query:
+            queryset = queryset.filter(
+                Exists(
+                    WorkingHours.objects.filter(
+                        photographer=OuterRef("user"),
+                        weekday=query["free_on"].weekday(),
+                    )
+                )
+            )
+        if query.get("q", "").strip():
+            return search_profiles(queryset, query["q"])
+        return queryset.order_by("-createdAt", "-id")
+
+    def list(self, request, *args, **kwargs):
+        # Rank and filter over profile ids only, so the user join and row
+        # decoding are paid for the returned page rather than every match
+        candidates = self.get_queryset().values_list("pk", "user_id")
+        limit = self.query["limit"]
+        if "free_on" not in self.query:
+            ids = [pk for pk, _ in candidates[:limit]]
+        else:
+            ids = self.free_on(candidates, self.query["free_on"], limit)
+        profiles = self.narrow_queryset(
+            PhotographerProfile.objects.select_related("user")
+        ).in_bulk(ids)
+        return Response(
+            self.get_serializer([profiles[pk] for pk in ids], many=True).data
+        )
+
+    @staticmethod
+    def free_on(candidates, day, limit):
+        # Working hours are filtered in SQL; whether a day is fully booked
+        # is settled by free_slots, one batch of candidates at a time
+        ids = []
+        offset = 0
+        while len(ids) < limit:
+            batch = list(candidates[offset : offset + limit])
+            slots = free_slots([user_id for _, user_id in batch], day, day)
+            ids.extend(pk for pk, user_id in batch if slots[user_id])
+            if len(batch) < limit:
+                break
+            offset += limit
+        return ids[:limit]
+
+
+class PhotographerDetailView(
+    CachedDirectoryMixin, SparseQuerysetMixin, generics.RetrieveAPIView
+):
     """
     Get single photographer profile by user ID.
     Public endpoint - no authentication required.
+    Served from the versioned directory cache.
     """
 
+    queryset = PhotographerProfile.objects.select_related("user")
     serializer_class = PhotographerProfileSerializer
     permission_classes = [permissions.AllowAny]
-
-    def get_object(self):
-        user_id = self.kwargs.get("id")
-        return get_object_or_404(PhotographerProfile, user__uid=user_id)
+    lookup_field = "user__uid"
+    lookup_url_kwarg = "id"
 
 
 class PhotographerUpdateView(generics.RetrieveUpdateAPIView):
@@ -133,13 +239,15 @@ class PhotographerUpdateView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        if not self.request.user.is_photographer():
+        if self.request.user.role != User.Roles.PHOTOGRAPHER:
             raise PermissionDenied("Only photographers can update their profile")
 
         profile, _ = PhotographerProfile.objects.get_or_create(
             user=self.request.user,
             defaults={"bio": "", "profile_image": "", "availableForBooking": True},
         )
+        # Serializing the owner's name must not reload the requesting user
+        profile.user = self.request.user
         return profile
 
     def get_serializer_class(self):
@@ -148,6 +256,94 @@ class PhotographerUpdateView(generics.RetrieveUpdateAPIView):
         return PhotographerUpdateSerializer
 
 
+class PhotographerHoursView(APIView):
+    """
+    Read or replace the logged-in photographer's weekly working hours.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_photographer(self):
+        if self.request.user.role != User.Roles.PHOTOGRAPHER:
+            raise PermissionDenied("Only photographers have working hours")
+        return self.request.user
+
+    def get(self, request):
+        hours = WorkingHours.objects.filter(photographer=self.get_photographer())
+        return Response(WorkingHoursSerializer(hours, many=True).data)
+
+    def put(self, request):
+        photographer = self.get_photographer()
+        serializer = WorkingHoursSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            WorkingHours.objects.filter(photographer=photographer).delete()
+            hours = WorkingHours.objects.bulk_create(
+                WorkingHours(photographer=photographer, **item)
+                for item in serializer.validated_data
+            )
+        return Response(WorkingHoursSerializer(hours, many=True).data)
+
+
+class PhotographerAvailabilityView(APIView):
+    """
+    Free windows for one or many photographers over a date range.
+    Public endpoint - no authentication required.
+
+    Query parameters: ``photographer`` (repeated or comma separated user
+    ids), ``date_from``, ``date_to`` and optionally ``duration`` (minutes,
+    defaults to one booking slot).
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    @staticmethod
+    def get(request):
+        params = request.query_params
+        serializer = AvailabilityQuerySerializer(
+            data={
+                "photographer": [
+                    uid
+                    for value in params.getlist("photographer")
+                    for uid in value.split(",")
+                    if uid
+                ],
+                **{
+                    key: params[key]
+                    for key in ("date_from", "date_to", "duration")
+                    if key in params
+                },
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        photographer_ids = list(
+            PhotographerProfile.objects.filter(
+                user_id__in=query["photographer"], availableForBooking=True
+            ).values_list("user_id", flat=True)
+        )
+        slots = free_slots(
+            photographer_ids,
+            query["date_from"],
+            query["date_to"],
+            query.get("duration"),
+        )
+        return Response(
+            {
+                "results": [
+                    {
+                        "photographer": photographer_id,
+                        "slots": [
+                            {"date": day, "start": start, "end": end}
+                            for day, start, end in windows
+                        ],
+                    }
+                    for photographer_id, windows in slots.items()
+                ]
+            }
+        )
+
+
 class PhotographersTestView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -164,41 +360,67 @@ class BookingCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         if self.request.user.role != User.Roles.CUSTOMER:
             raise PermissionDenied("Only customers can create bookings")
+        data = serializer.validated_data
+        if Booking.objects.slot_taken(data["photographer"], data["date"], data["time"]):
+            raise BookingConflict()
         serializer.save()
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        booking = serializer.instance
-        # Notify photographer of new booking request
-        Notification.objects.create(
-            user=booking.photographer,
-            booking=booking,
-            message="New booking request",
-        )
+        try:
+            # Booking and its notification are written together or not at all;
+            # the unique slot constraint settles races the pre-check missed.
+            with transaction.atomic():
+                self.perform_create(serializer)
+                booking = serializer.instance
+                # Notify photographer of new booking request
+                outbox.enqueue(
+                    NotificationEvent.for_booking(
+                        booking,
+                        booking.photographer_id,
+                        "New booking request",
+                        "created",
+                    )
+                )
+        except IntegrityError as exc:
+            if not Booking.is_slot_conflict(exc):
+                raise
+            raise BookingConflict()
         output = BookingSerializer(booking).data
         return Response(output, status=201)
 
 
-class BookingMeListView(generics.ListAPIView):
+class BookingMeListView(FastListMixin, SparseQuerysetMixin, generics.ListAPIView):
+    """
+    The user's bookings, newest first.
+
+    Query parameters: ``status`` (repeated or comma separated),
+    ``date_from`` and ``date_to`` (inclusive), and ``upcoming`` or ``past``
+    (relative to today).
+    """
+
     serializer_class = BookingSerializer
+    fast_serializer_class = BookingFastSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.role == User.Roles.CUSTOMER:
-            return Booking.objects.filter(customer=user).select_related(
-                "customer", "photographer"
-            )
+            queryset = Booking.objects.filter(customer=user)
         elif user.role == User.Roles.PHOTOGRAPHER:
-            return Booking.objects.filter(photographer=user).select_related(
-                "customer", "photographer"
-            )
-        return Booking.objects.none()
+            queryset = Booking.objects.filter(photographer=user)
+        else:
+            return Booking.objects.none()
+        query = BookingListQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return queryset.matching(**query.validated_data).select_related(
+            "customer", "photographer"
+        )
 
 
 class BookingsTestView(APIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     @staticmethod
@@ -213,63 +435,101 @@ class BookingsTestView(APIView):
         return Response({"bookings_count": count})
 
 
-class BookingStatusUpdateView(generics.UpdateAPIView):
-    serializer_class = BookingStatusUpdateSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    queryset = Booking.objects.all()
-    lookup_field = "id"
+class BookingTransitionMixin:
+    """
+    Move a single booking through ``apply_transitions``.
 
-    def get_object(self):
-        booking = get_object_or_404(Booking, id=self.kwargs["id"])
-        if (
-            self.request.user.role != User.Roles.PHOTOGRAPHER
-            or booking.photographer != self.request.user
-        ):
+    Ownership, the legality of the transition and the write itself are one
+    conditional UPDATE ... RETURNING, committed together with the customer
+    notification; the booking is only read back when nothing matched.
+    """
+
+    failure_exceptions = {
+        transitions.NOT_FOUND: NotFound,
+        transitions.FORBIDDEN: PermissionDenied,
+        transitions.ILLEGAL_TRANSITION: BookingConflict,
+    }
+
+    def transition(self, status):
+        if self.request.user.role != User.Roles.PHOTOGRAPHER:
             raise PermissionDenied(
                 "Only the assigned photographer can update this booking"
             )
+        booking_id = self.kwargs["id"]
+        updated, failures = transitions.apply_transitions(
+            self.request.user, {booking_id: status}
+        )
+        if booking_id in failures:
+            code, detail = failures[booking_id]
+            raise self.failure_exceptions[code](detail)
+        booking = updated[booking_id]
+        booking.photographer = self.request.user
         return booking
 
+
+class BookingStatusUpdateView(BookingTransitionMixin, generics.UpdateAPIView):
+    serializer_class = BookingStatusUpdateSerializer
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = "id"
+
     def update(self, request, *args, **kwargs):
-        response = super().update(request, *args, **kwargs)
-        booking = self.get_object()
-        Notification.objects.create(
-            user=booking.customer,
-            booking=booking,
-            message=f"Booking {booking.status}",
-        )
-        return response
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        booking = self.transition(serializer.validated_data["status"])
+        return Response(self.get_serializer(booking).data)
 
 
-class BookingCompleteView(generics.UpdateAPIView):
+class BookingCompleteView(BookingTransitionMixin, generics.UpdateAPIView):
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BookingSerializer
-    queryset = Booking.objects.all()
     lookup_field = "id"
 
     def update(self, request, *args, **kwargs):
-        booking = self.get_object()
-        if (
-            request.user.role != User.Roles.PHOTOGRAPHER
-            or booking.photographer != request.user
-        ):
-            raise PermissionDenied(
-                "Only the assigned photographer can complete this booking"
-            )
-        booking.status = Booking.Status.COMPLETED
-        booking.save()
-        # Notify customer of completion
-        Notification.objects.create(
-            user=booking.customer,
-            booking=booking,
-            message="Booking completed",
-        )
+        booking = self.transition(Booking.Status.COMPLETED)
         serializer = BookingSerializer(booking)
         return Response(serializer.data)
 
 
-class NotificationMeListView(generics.ListAPIView):
+class BookingBulkTransitionView(APIView):
+    """
+    Accept, reject or complete many bookings in one request.
+
+    All changes are applied in one transaction with one UPDATE per target
+    status. Each item reports its own outcome, in request order.
+    """
+
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role != User.Roles.PHOTOGRAPHER:
+            raise PermissionDenied("Only photographers can update bookings")
+        serializer = BookingBulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changes = {
+            item["id"]: item["status"]
+            for item in serializer.validated_data["transitions"]
+        }
+        updated, failures = transitions.apply_transitions(request.user, changes)
+
+        results = []
+        for booking_id, status in changes.items():
+            if booking_id in updated:
+                results.append({"id": booking_id, "status": status, "ok": True})
+            else:
+                code, detail = failures[booking_id]
+                results.append(
+                    {"id": booking_id, "ok": False, "error": code, "detail": detail}
+                )
+        return Response({"results": results})
+
+
+class NotificationMeListView(FastListMixin, SparseQuerysetMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
+    fast_serializer_class = NotificationFastSerializer
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -290,3 +550,34 @@ class NotificationMarkReadView(generics.UpdateAPIView):
         notification.is_read = True
         notification.save(update_fields=["is_read"])
         return Response(NotificationSerializer(notification).data)
+
+
+class NotificationBulkReadView(APIView):
+    """
+    Mark many (or all) of the user's notifications as read in one UPDATE.
+    """
+
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = NotificationBulkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        unread = Notification.objects.filter(user=request.user, is_read=False)
+        if not serializer.validated_data["all"]:
+            unread = unread.filter(id__in=serializer.validated_data["ids"])
+        return Response({"updated": unread.update(is_read=True)})
+
+
+class NotificationUnreadCountView(APIView):
+    """
+    Number of unread notifications, counted from the partial unread index.
+    """
+
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @staticmethod
+    def get(request):
+        count = Notification.objects.filter(user=request.user, is_read=False).count()
+        return Response({"unread": count})
@@ -0,0 +1,109 @@
+"""
+Concurrency of the sync and async read views when the database is slow.
+
+    python benchmarks/bench_async.py [--delay-ms 20] [--clients 32]
+        [--threads 4] [--duration 5]
+
+Seeds a small dataset, then serves it from one gunicorn worker per mode,
+with every query delayed by ``--delay-ms`` (see ``benchmarks/slowdb.py``):
+
+    wsgi  the DRF views on a gthread worker with ``--threads`` threads
+    asgi  the async views (API_ASYNC_VIEWS) on a uvicorn worker, as
+          ``GUNICORN_WORKER_CLASS=uvicorn`` serves them
+
+``--clients`` keep-alive clients poll the profile, booking and
+notification lists of random customers. A sync worker has at most
+``--threads`` requests in flight, each holding its thread while it waits
+on the database. The async views still wait in threads, because Django's
+async ORM runs queries through ``sync_to_async``, but they take a thread
+per request in flight, up to ``ASYNC_VIEW_CONCURRENCY``. So a slow
+database lets them keep more requests in flight than ``--threads``; the
+cap, not the event loop, is what bounds them.
+
+Runs on a throwaway SQLite database unless ``DB_ENGINE`` is set.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_db_connections import (  # noqa: E402
+    free_port,
+    gthread,
+    start_gunicorn,
+)
+from benchmarks.bench_load import Workloads, drive, seed, summarize  # noqa: E402
+from benchmarks.common import setup_django  # noqa: E402
+
+MODES = ["wsgi", "asgi"]
+READS = ["/api/auth/me/", "/api/bookings/me/", "/api/notifications/me/"]
+
+
+def modes(threads):
+    return {
+        "wsgi": ("benchmarks.slowdb:wsgi", gthread(threads), {}),
+        "asgi": (
+            "benchmarks.slowdb:asgi",
+            ["--worker-class", "uvicorn.workers.UvicornWorker", "--workers", "1"],
+            {"GUNICORN_WORKER_CLASS": "uvicorn", "DB_CONN_MAX_AGE": "0"},
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--delay-ms", type=float, default=20.0)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "False")
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command("flush", interactive=False, verbosity=0)
+    workloads = Workloads(*seed(50, 10, 1000, 2000))
+    connection.close()
+
+    def reads(rng):
+        token = workloads.tokens[rng.choice(workloads.customers)]
+        return "GET", rng.choice(READS), None, token
+
+    print(
+        f"{args.delay_ms:g} ms per query, {args.clients} clients, "
+        f"{args.threads} gthread threads"
+    )
+    for mode, (app, options, extra_env) in modes(args.threads).items():
+        if mode not in args.modes:
+            continue
+        env = {
+            **os.environ,
+            **extra_env,
+            "SLOW_DB_MS": str(args.delay_ms),
+            "PYTHONWARNINGS": "ignore:No directory",
+        }
+        port = free_port()
+        process = start_gunicorn(port, env, options, app)
+        try:
+            samples, errors, elapsed = drive(
+                port, reads, args.clients, args.duration, 0
+            )
+        finally:
+            process.terminate()
+            process.wait()
+        result = summarize(samples, errors, elapsed)
+        latency = result["latency_ms"]
+        print(
+            f"{mode:<5} {result['rps']:8.1f} req/s  p50={latency['p50']}ms "
+            f"p90={latency['p90']}ms p99={latency['p99']}ms errors={errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
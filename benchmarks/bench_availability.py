@@ -0,0 +1,104 @@
+"""
+Free-slot search over photographers with a large booking history.
+
+    python benchmarks/bench_availability.py [--photographers 5] [--bookings 10000]
+
+Seeds working hours Monday to Friday, 08:00-20:00, and ``--bookings`` hourly
+bookings per photographer spread over the past and future, then times
+``free_slots`` for one photographer and for all of them over 31 days.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report, setup_django, timeit  # noqa: E402
+
+
+def seed(photographers, bookings):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from api.models import Booking, PhotographerProfile, WorkingHours
+
+    User = get_user_model()
+    password = make_password(None)
+    customer = User.objects.create(
+        email="bench-customer@example.com", role="customer", password=password
+    )
+    users = User.objects.bulk_create(
+        User(
+            email=f"bench-photo-{i}@example.com",
+            role="photographer",
+            password=password,
+        )
+        for i in range(photographers)
+    )
+    PhotographerProfile.objects.bulk_create(
+        PhotographerProfile(user=user, availableForBooking=True) for user in users
+    )
+    WorkingHours.objects.bulk_create(
+        WorkingHours(photographer=user, weekday=day, start=time(8), end=time(20))
+        for user in users
+        for day in range(5)
+    )
+
+    # Hourly slots 08:00-19:00, centred on today so the searched month is busy
+    start = date.today() - timedelta(days=bookings // 24)
+    for user in users:
+        rows = []
+        for n in range(bookings):
+            day, hour = divmod(n, 12)
+            rows.append(
+                Booking(
+                    customer=customer,
+                    photographer=user,
+                    date=start + timedelta(days=day * 2 + hour % 2),
+                    time=time(8 + hour),
+                    status=Booking.Status.ACCEPTED,
+                )
+            )
+        Booking.objects.bulk_create(rows, batch_size=2000, ignore_conflicts=True)
+    return [user.pk for user in users]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--photographers", type=int, default=5)
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from api.availability import free_slots
+    from api.models import Booking
+
+    ids = seed(args.photographers, args.bookings)
+    print(f"{Booking.objects.count()} bookings across {len(ids)} photographers")
+
+    date_from = date.today()
+    date_to = date_from + timedelta(days=30)
+    for label, subset in (("one photographer", ids[:1]), ("all photographers", ids)):
+        with CaptureQueriesContext(connection) as queries:
+            slots = free_slots(subset, date_from, date_to)
+        median, p95 = timeit(
+            lambda: free_slots(subset, date_from, date_to), repeat=args.repeat
+        )
+        report(
+            f"free_slots 31 days, {label}",
+            median,
+            p95,
+            queries=len(queries),
+            slots=sum(len(s) for s in slots.values()),
+        )
+
+
+if __name__ == "__main__":
+    main()
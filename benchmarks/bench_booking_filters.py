@@ -0,0 +1,98 @@
+"""
+Filtered booking lists as a photographer's history grows.
+
+    python benchmarks/bench_booking_filters.py [--history 1000 10000 50000]
+
+A photographer has 20 upcoming pending bookings; completed bookings pile up
+in the past until each ``--history`` size is reached. At every size, times
+``GET /api/bookings/me/`` for the upcoming pending/accepted work and for the
+unfiltered first page.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report, setup_django, timeit  # noqa: E402
+
+
+def grow_history(customer, photographer, start, count):
+    from api.models import Booking
+
+    rows = []
+    for n in range(start, start + count):
+        day, hour = divmod(n, 12)
+        rows.append(
+            Booking(
+                customer=customer,
+                photographer=photographer,
+                date=date.today() - timedelta(days=day + 1),
+                time=time(8 + hour),
+                status=Booking.Status.COMPLETED,
+            )
+        )
+    Booking.objects.bulk_create(rows, batch_size=2000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--history", type=int, nargs="+", default=[1_000, 10_000, 50_000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from api.models import Booking
+    from api.views import EmailTokenObtainPairSerializer
+
+    User = get_user_model()
+    password = make_password(None)
+    customer = User.objects.create(
+        email="bench-customer@example.com", role="customer", password=password
+    )
+    photographer = User.objects.create(
+        email="bench-photo@example.com", role="photographer", password=password
+    )
+    Booking.objects.bulk_create(
+        Booking(
+            customer=customer,
+            photographer=photographer,
+            date=date.today() + timedelta(days=n + 1),
+            time=time(10),
+            status=Booking.Status.PENDING,
+        )
+        for n in range(20)
+    )
+
+    client = APIClient()
+    token = EmailTokenObtainPairSerializer.get_token(photographer).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    history = 0
+    for size in sorted(args.history):
+        grow_history(customer, photographer, history, size - history)
+        history = size
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        for label, query in (
+            ("upcoming", "?upcoming=true&status=pending,accepted"),
+            ("unfiltered", ""),
+        ):
+            path = f"/api/bookings/me/{query}"
+            rows = len(client.get(path).json())
+            median, p95 = timeit(lambda: client.get(path), repeat=args.repeat)
+            report(f"{label}, history={size}", median, p95, rows=rows)
+
+
+if __name__ == "__main__":
+    main()
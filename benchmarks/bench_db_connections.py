@@ -0,0 +1,148 @@
+"""
+Per-request latency with and without database connection reuse.
+
+    DB_ENGINE=django.db.backends.postgresql DB_NAME=lumlens DB_USER=... \\
+        python benchmarks/bench_db_connections.py [--requests 500] [--threads 4]
+
+Seeds a small dataset, then for each connection mode starts gunicorn
+(gthread, one worker, ``--threads`` threads) with the matching settings
+and measures the notification endpoints, first from one client and then
+from ``--threads`` concurrent clients:
+
+    none        DB_CONN_MAX_AGE=0: connect and disconnect on every request
+    persistent  DB_CONN_MAX_AGE=60 with health checks
+    pool        DB_POOL=True: psycopg pool (needs psycopg 3 with psycopg-pool)
+
+The modes only differ on PostgreSQL; without ``DB_ENGINE`` the script
+runs on a throwaway SQLite database as a smoke test. Point it at a
+PostgreSQL server reached over the network to see the handshake cost.
+"""
+
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_load import Workloads, drive, seed, summarize  # noqa: E402
+from benchmarks.common import ROOT, setup_django  # noqa: E402
+
+MODES = {
+    "none": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "False"},
+    "persistent": {
+        "DB_CONN_MAX_AGE": "60",
+        "DB_CONN_HEALTH_CHECKS": "True",
+        "DB_POOL": "False",
+    },
+    "pool": {"DB_POOL": "True"},
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def gthread(threads):
+    return ["--worker-class", "gthread", "--workers", "1", "--threads", str(threads)]
+
+
+def start_gunicorn(port, env, options, app="mysite.wsgi:application"):
+    """Start gunicorn serving ``app``; return the process once it answers."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            app,
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--log-level",
+            "warning",
+            # gunicorn.conf.py applies too; no worker recycling mid-run
+            "--max-requests",
+            "0",
+            *options,
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health/")
+            conn.getresponse().read()
+            conn.close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "False")
+    setup_django()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        print("Not on PostgreSQL: connection modes will not differ\n")
+    call_command("flush", interactive=False, verbosity=0)
+    workloads = Workloads(*seed(50, 10, 1000, 2000))
+    connection.close()
+
+    for mode in args.modes:
+        port = free_port()
+        env = {**os.environ, **MODES[mode], "PYTHONWARNINGS": "ignore:No directory"}
+        process = start_gunicorn(port, env, gthread(args.threads))
+        try:
+            # Sequential requests: the per-request latency connection setup adds
+            samples = []
+            rng = random.Random(0)
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            for _ in range(args.requests):
+                method, path, body, token = workloads.notifications(rng)
+                start = time.perf_counter()
+                conn.request(method, path, headers={"Authorization": token})
+                conn.getresponse().read()
+                samples.append((time.perf_counter() - start) * 1000)
+            conn.close()
+            samples.sort()
+            single = summarize(samples, 0, sum(samples) / 1000)["latency_ms"]
+
+            samples, errors, elapsed = drive(
+                port, workloads.notifications, args.threads, args.duration, 0
+            )
+            result = summarize(samples, errors, elapsed)
+        finally:
+            process.terminate()
+            process.wait()
+
+        print(
+            f"{mode:<11} 1 client p50={single['p50']}ms p90={single['p90']}ms | "
+            f"{args.threads} clients {result['rps']} req/s "
+            f"p50={result['latency_ms']['p50']}ms p99={result['latency_ms']['p99']}ms "
+            f"errors={errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
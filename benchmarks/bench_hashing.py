@@ -0,0 +1,95 @@
+"""
+Login throughput for each password hashing strategy.
+
+    python benchmarks/bench_hashing.py [--logins 20] [--workers N]
+
+For each ``PASSWORD_HASHER`` option, measures:
+
+- the cost of verifying one password, as logins per second per core;
+- aggregate verifications per second from ``--workers`` threads (default
+  one per CPU), as the api.hashing pool runs them: the hashers release
+  the GIL, so this scales with cores;
+- the median latency of a full POST /api/auth/login/.
+
+argon2 is skipped when argon2-cffi is not installed.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report, setup_django, timeit  # noqa: E402
+
+PASSWORD = "Passw0rd!"
+# The PASSWORD_HASHER options in mysite/settings.py
+HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "api.hashing.Argon2PasswordHasher",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model, hashers
+    from django.test.utils import override_settings
+    from rest_framework.test import APIClient
+
+    for name, path in HASHERS.items():
+        with override_settings(PASSWORD_HASHERS=[path]):
+            try:
+                encoded = hashers.make_password(PASSWORD)
+            except ValueError as exc:
+                print(f"{name:<8} skipped: {exc}")
+                continue
+
+            median, p95 = timeit(
+                lambda: hashers.check_password(PASSWORD, encoded),
+                repeat=args.logins,
+                warmup=1,
+            )
+            report(f"{name} verify", median, p95, per_core=f"{1000 / median:.1f}/s")
+
+            total = args.logins * args.workers
+            with ThreadPoolExecutor(args.workers) as pool:
+                start = time.perf_counter()
+                list(
+                    pool.map(
+                        lambda _: hashers.check_password(PASSWORD, encoded),
+                        range(total),
+                    )
+                )
+                elapsed = time.perf_counter() - start
+            print(
+                f"{name + ' pool':<40} {total / elapsed:8.1f} logins/s"
+                f" with {args.workers} threads"
+            )
+
+            user = get_user_model().objects.create(
+                email=f"bench-{name}@example.com", role="customer", password=encoded
+            )
+            client = APIClient()
+            median, p95 = timeit(
+                lambda: client.post(
+                    "/api/auth/login/",
+                    {"email": user.email, "password": PASSWORD},
+                    format="json",
+                ),
+                repeat=args.logins,
+                warmup=1,
+            )
+            report(f"{name} POST /api/auth/login/", median, p95)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Concurrent API workloads against an in-process server.
+
+    python benchmarks/bench_load.py [--server wsgi|asgi] [--concurrency 8]
+        [--duration 10] [--workloads directory notifications]
+        [--output load.json]
+
+Seeds customers, photographers, bookings and notifications with
+``bulk_create``, serves the project on a local port through Django's
+threaded WSGI server or uvicorn (ASGI) and runs each workload for
+``--duration`` seconds from ``--concurrency`` keep-alive clients:
+
+    directory       photographer list and profile pages
+    booking-create  customers booking free slots
+    status-update   photographers accepting pending bookings
+    notifications   unread count and notification list polling
+
+Requests per second and latency percentiles are printed for each workload
+and, with ``--output``, written as JSON along with the commit and run
+settings so results can be compared across commits.
+
+Runs offline on a throwaway SQLite database. Set ``DB_ENGINE`` (and
+``DB_NAME``, ``DB_USER``, ...) to run against PostgreSQL instead; that
+database is flushed and reseeded.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ROOT, setup_django  # noqa: E402
+
+SEED_START = date(2030, 1, 7)
+CREATE_START = date(2040, 1, 2)
+SLOTS_PER_DAY = 10
+
+
+def slot(n, photographers, start):
+    """The ``n``-th booking slot, spread round-robin over photographers."""
+    k = n // photographers
+    return start + timedelta(days=k // SLOTS_PER_DAY), clock(8 + k % SLOTS_PER_DAY)
+
+
+def seed(customers, photographers, bookings, notifications):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from api.models import Booking, Notification, PhotographerProfile, WorkingHours
+    from api.search import index_profiles
+
+    User = get_user_model()
+    password = make_password("Passw0rd!")
+    customer_users = User.objects.bulk_create(
+        User(
+            email=f"load-customer-{n}@example.com",
+            displayName=f"Customer {n}",
+            role="customer",
+            password=password,
+        )
+        for n in range(customers)
+    )
+    photographer_users = User.objects.bulk_create(
+        User(
+            email=f"load-photo-{n}@example.com",
+            displayName=f"Photographer {n}",
+            role="photographer",
+            password=password,
+        )
+        for n in range(photographers)
+    )
+    PhotographerProfile.objects.bulk_create(
+        PhotographerProfile(user=user, bio=f"Weddings and portraits, studio {n}")
+        for n, user in enumerate(photographer_users)
+    )
+    index_profiles()
+    WorkingHours.objects.bulk_create(
+        WorkingHours(photographer=user, weekday=day, start=clock(8), end=clock(18))
+        for user in photographer_users
+        for day in range(7)
+    )
+    booking_rows = Booking.objects.bulk_create(
+        Booking(
+            customer=customer_users[n % customers],
+            photographer=photographer_users[n % photographers],
+            date=day,
+            time=hour,
+        )
+        for n in range(bookings)
+        for day, hour in [slot(n, photographers, SEED_START)]
+    )
+    Notification.objects.bulk_create(
+        Notification(
+            user=customer_users[n % customers],
+            booking=booking_rows[n % bookings] if bookings else None,
+            message="Booking created",
+        )
+        for n in range(notifications)
+    )
+    return customer_users, photographer_users, booking_rows
+
+
+class Workloads:
+    """
+    Request generators for each workload. Each returns ``(method, path,
+    body, token)`` or ``None`` once the workload has run out of work.
+    """
+
+    def __init__(self, customers, photographers, bookings):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.customers = [str(user.uid) for user in customers]
+        self.photographers = [str(user.uid) for user in photographers]
+        self.tokens = {
+            str(user.uid): f"Bearer {AccessToken.for_user(user)}"
+            for user in [*customers, *photographers]
+        }
+        self.pending = list(reversed(bookings))
+        self.slots = itertools.count()
+
+    def directory(self, rng):
+        if rng.random() < 0.5:
+            return "GET", "/api/photographers/", None, None
+        uid = rng.choice(self.photographers)
+        return "GET", f"/api/photographers/{uid}/", None, None
+
+    def booking_create(self, rng):
+        # next() on itertools.count is atomic, so every slot is booked once
+        n = next(self.slots)
+        day, hour = slot(n, len(self.photographers), CREATE_START)
+        body = {
+            "photographer": self.photographers[n % len(self.photographers)],
+            "date": day.isoformat(),
+            "time": hour.isoformat(),
+        }
+        return "POST", "/api/bookings/", body, self.tokens[rng.choice(self.customers)]
+
+    def status_update(self, rng):
+        try:
+            booking = self.pending.pop()
+        except IndexError:
+            return None
+        token = self.tokens[str(booking.photographer_id)]
+        return "PATCH", f"/api/bookings/{booking.pk}/", {"status": "accepted"}, token
+
+    def notifications(self, rng):
+        token = self.tokens[rng.choice(self.customers)]
+        if rng.random() < 0.75:
+            return "GET", "/api/notifications/unread-count/", None, token
+        return "GET", "/api/notifications/me/", None, token
+
+    def get(self, name):
+        return getattr(self, name.replace("-", "_"))
+
+
+WORKLOADS = ["directory", "booking-create", "status-update", "notifications"]
+
+
+@contextmanager
+def serve(kind):
+    """Serve the project on 127.0.0.1 in a background thread; yield the port."""
+    if kind == "wsgi":
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler)
+        server.set_app(get_wsgi_application())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server.server_address[1]
+        finally:
+            server.shutdown()
+            server.server_close()
+    else:
+        import uvicorn
+        from django.core.asgi import get_asgi_application
+
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        config = uvicorn.Config(
+            get_asgi_application(), log_level="warning", lifespan="off"
+        )
+        server = uvicorn.Server(config)
+        thread = threading.Thread(
+            target=server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        try:
+            yield sock.getsockname()[1]
+        finally:
+            server.should_exit = True
+            thread.join()
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of sorted ``samples``."""
+    if not samples:
+        return None
+    index = max(0, min(len(samples) - 1, int(round(fraction * len(samples))) - 1))
+    return round(samples[index], 2)
+
+
+def drive(port, make_request, concurrency, duration, seed):
+    """
+    Run ``make_request`` from ``concurrency`` client threads for ``duration``
+    seconds; return the latency samples (ms) and the error count.
+    """
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(seed + index)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        samples, failed = [], 0
+        while time.perf_counter() < deadline:
+            request = make_request(rng)
+            if request is None:
+                break
+            method, path, body, token = request
+            headers = {"Accept": "application/json"}
+            if token:
+                headers["Authorization"] = token
+            if body is not None:
+                body = json.dumps(body)
+                headers["Content-Type"] = "application/json"
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            samples.append((time.perf_counter() - start) * 1000)
+            failed += not ok
+        conn.close()
+        latencies.extend(samples)
+        errors.append(failed)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), sum(errors), time.perf_counter() - started
+
+
+def summarize(samples, errors, elapsed):
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(samples) / len(samples), 2) if samples else None,
+            "p50": percentile(samples, 0.50),
+            "p90": percentile(samples, 0.90),
+            "p99": percentile(samples, 0.99),
+            "max": percentile(samples, 1.0),
+        },
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        return None, None
+    return commit or None, bool(dirty)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=["wsgi", "asgi"], default="wsgi")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--photographers", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    # Measure production-like request handling, without the DEBUG query log
+    os.environ.setdefault("DJANGO_DEBUG", "False")
+    warnings.filterwarnings("ignore", message="No directory at")
+    setup_django()
+
+    import django
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command("flush", interactive=False, verbosity=0)
+    workloads = Workloads(
+        *seed(args.customers, args.photographers, args.bookings, args.notifications)
+    )
+
+    results = {}
+    with serve(args.server) as port:
+        for name in args.workloads:
+            samples, errors, elapsed = drive(
+                port, workloads.get(name), args.concurrency, args.duration, args.seed
+            )
+            result = results[name] = summarize(samples, errors, elapsed)
+            latency = result["latency_ms"]
+            print(
+                f"{name:<16} {result['rps']:8.1f} req/s  p50={latency['p50']}ms "
+                f"p90={latency['p90']}ms p99={latency['p99']}ms "
+                f"requests={result['requests']} errors={errors}"
+            )
+
+    commit, dirty = git_revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "server": args.server,
+        "database": connection.vendor,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "seeded": {
+            "customers": args.customers,
+            "photographers": args.photographers,
+            "bookings": args.bookings,
+            "notifications": args.notifications,
+        },
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "workloads": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Boot time and request overhead of the API-only settings profile.
+
+    python benchmarks/bench_profiles.py [--boots 5] [--repeat 200]
+
+For ``mysite.settings`` and ``mysite.settings_api``, boots a worker
+``--boots`` times in a fresh interpreter under ``python -X importtime`` and
+reports the median boot time, the time spent in import statements and the
+number of modules loaded. Then times ``GET /api/health/`` through each
+profile's middleware and URLconf, and counts the Python function calls one
+request makes.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import re
+import statistics
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ROOT, report, setup_django, timeit  # noqa: E402
+
+PROFILES = ("mysite.settings", "mysite.settings_api")
+BOOT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from mysite.wsgi import application
+from django.urls import resolve
+resolve("/api/health/")
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": len(sys.modules)}))
+"""
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)")
+
+
+def boot(settings_module):
+    """Boot a worker once. Return boot and import time in ms, and its modules."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Top-level entries only; nested ones are part of their cumulative time
+    imports = sum(int(us) for us, _ in IMPORT_LINE.findall(result.stderr))
+    stats = json.loads(result.stdout)
+    return stats["seconds"] * 1000, imports / 1000, stats["modules"]
+
+
+def calls_per_request(client, path):
+    client.get(path)  # warm up
+    profile = cProfile.Profile()
+    profile.enable()
+    client.get(path)
+    profile.disable()
+    return pstats.Stats(profile).total_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boots", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+
+    for settings_module in PROFILES:
+        runs = [boot(settings_module) for _ in range(args.boots)]
+        print(
+            f"{settings_module:<20} "
+            f"boot={statistics.median(run[0] for run in runs):6.0f}ms "
+            f"imports={statistics.median(run[1] for run in runs):6.0f}ms "
+            f"modules={runs[0][2]}"
+        )
+
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from mysite import settings_api
+
+    path = "/api/health/"
+    for settings_module, overrides in (
+        ("mysite.settings", {}),
+        (
+            "mysite.settings_api",
+            {
+                "MIDDLEWARE": settings_api.MIDDLEWARE,
+                "ROOT_URLCONF": settings_api.ROOT_URLCONF,
+            },
+        ),
+    ):
+        with override_settings(**overrides):
+            client = Client()
+            calls = calls_per_request(client, path)
+            median, p95 = timeit(lambda: client.get(path), repeat=args.repeat)
+        report(f"{settings_module} GET {path}", median, p95, calls=calls)
+
+
+if __name__ == "__main__":
+    main()
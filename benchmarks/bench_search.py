@@ -0,0 +1,129 @@
+"""
+Photographer search over a large directory.
+
+    python benchmarks/bench_search.py [--profiles 100000]
+
+Seeds ``--profiles`` photographers with generated names and bios, working
+hours for a third of them and an image for half, then times the search
+endpoint for plain text, combined filters and the unfiltered listing.
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import date, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report, setup_django, timeit  # noqa: E402
+
+FIRST = ["Ada", "Grace", "Alan", "Linus", "Barbara", "Ken", "Margaret", "Dennis"]
+LAST = ["Lovelace", "Hopper", "Turing", "Liskov", "Thompson", "Hamilton", "Ritchie"]
+GENRES = (
+    "wedding portrait landscape studio fashion event corporate family newborn"
+    " drone street documentary sports food product travel architecture film"
+    " wildlife maternity pet concert theatre real-estate automotive aerial"
+).split()
+STYLES = (
+    "natural light golden hour candid editorial fine art black white moody"
+    " bright airy vintage cinematic minimalist documentary-style classic bold"
+    " colourful timeless romantic dramatic playful relaxed authentic modern"
+).split()
+PLACES = (
+    "london paris berlin madrid rome lisbon dublin vienna prague warsaw oslo"
+    " stockholm copenhagen amsterdam brussels zurich geneva milan munich lyon"
+).split()
+
+
+def bio(rng):
+    return " ".join(
+        [
+            *rng.sample(GENRES, 3),
+            *rng.sample(STYLES, 4),
+            "based in",
+            rng.choice(PLACES),
+            "available for",
+            rng.choice(GENRES),
+            "shoots",
+        ]
+    )
+
+
+def seed(profiles):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from api.models import PhotographerProfile, WorkingHours
+    from api.search import index_profiles
+
+    rng = random.Random(42)
+    User = get_user_model()
+    password = make_password(None)
+    batch = 5000
+    for offset in range(0, profiles, batch):
+        users = User.objects.bulk_create(
+            User(
+                email=f"bench-photo-{n}@example.com",
+                role="photographer",
+                displayName=f"{rng.choice(FIRST)} {rng.choice(LAST)} {n}",
+                password=password,
+            )
+            for n in range(offset, min(offset + batch, profiles))
+        )
+        PhotographerProfile.objects.bulk_create(
+            PhotographerProfile(
+                user=user,
+                bio=bio(rng),
+                profile_image=f"https://img.example.com/{n}.jpg" if n % 2 else "",
+                availableForBooking=n % 10 != 0,
+            )
+            for n, user in enumerate(users, offset)
+        )
+        WorkingHours.objects.bulk_create(
+            WorkingHours(photographer=user, weekday=day, start=time(9), end=time(17))
+            for user in users[::3]
+            for day in range(5)
+        )
+    # bulk_create skips the signals that keep the search index current
+    index_profiles()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.test import APIClient
+
+    seed(args.profiles)
+    client = APIClient()
+    monday = date.today() + timedelta(days=7 - date.today().weekday())
+    cases = {
+        "one common word": {"q": "wedding"},
+        "text": {"q": "wedding lisbon"},
+        "name": {"q": "grace hopper"},
+        "text + has_image": {"q": "drone paris", "has_image": "true"},
+        "text + image + free_on": {
+            "q": "studio berlin",
+            "has_image": "true",
+            "free_on": monday.isoformat(),
+        },
+        "unfiltered newest": {},
+    }
+    print(f"{args.profiles} profiles")
+    for name, params in cases.items():
+        response = client.get("/api/photographers/search/", params)
+        assert response.status_code == 200, response.content
+        median, p95 = timeit(
+            lambda: client.get("/api/photographers/search/", params),
+            repeat=args.repeat,
+        )
+        report(f"search {name}", median, p95, results=len(response.json()))
+
+
+if __name__ == "__main__":
+    main()
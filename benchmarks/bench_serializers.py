@@ -0,0 +1,119 @@
+"""
+DRF serializers against the values_list() fast serializers.
+
+    python benchmarks/bench_serializers.py [--rows 1000 10000]
+
+For bookings, notifications and photographer profiles, times fetching and
+serializing ``--rows`` rows through the DRF ModelSerializer (model
+instances with select_related) and through the matching FastSerializer.
+Rendering to JSON is left out; both produce the same bytes.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import report, setup_django, timeit  # noqa: E402
+
+
+def seed(rows):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from api.models import Booking, Notification, PhotographerProfile
+
+    User = get_user_model()
+    password = make_password(None)
+    customer = User.objects.create(
+        email="bench-customer@example.com", role="customer", password=password
+    )
+    photographers = User.objects.bulk_create(
+        User(
+            email=f"bench-photo-{n}@example.com",
+            displayName=f"Photographer {n}",
+            role="photographer",
+            password=password,
+        )
+        for n in range(rows)
+    )
+    PhotographerProfile.objects.bulk_create(
+        PhotographerProfile(user=user, bio=f"Bio {n}")
+        for n, user in enumerate(photographers)
+    )
+    start = date(2030, 1, 1)
+    bookings = Booking.objects.bulk_create(
+        Booking(
+            customer=customer,
+            photographer=photographers[n % len(photographers)],
+            date=start + timedelta(days=n // 10),
+            time=time(8 + n % 10),
+        )
+        for n in range(rows)
+    )
+    Notification.objects.bulk_create(
+        Notification(user=customer, booking=booking, message="Booking accepted")
+        for booking in bookings
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    from api import fastserializers
+    from api.models import Booking, Notification, PhotographerProfile
+    from api.serializers import (
+        BookingSerializer,
+        NotificationSerializer,
+        PhotographerListSerializer,
+    )
+
+    cases = [
+        (
+            "bookings",
+            Booking.objects.select_related("customer", "photographer"),
+            BookingSerializer,
+            fastserializers.BookingFastSerializer,
+        ),
+        (
+            "notifications",
+            Notification.objects.select_related("booking"),
+            NotificationSerializer,
+            fastserializers.NotificationFastSerializer,
+        ),
+        (
+            "photographers",
+            PhotographerProfile.objects.select_related("user"),
+            PhotographerListSerializer,
+            fastserializers.PhotographerListFastSerializer,
+        ),
+    ]
+    for rows in args.rows:
+        call_command("flush", interactive=False, verbosity=0)
+        seed(rows)
+        for name, queryset, serializer, fast in cases:
+            drf, _ = timeit(
+                lambda: serializer(queryset.all(), many=True).data,
+                repeat=args.repeat,
+                warmup=1,
+            )
+            quick, _ = timeit(
+                lambda: fast.serialize(queryset.values_list(*fast.get_paths())),
+                repeat=args.repeat,
+                warmup=1,
+            )
+            report(f"{name} x{rows} DRF", drf, drf)
+            report(f"{name} x{rows} fast", quick, quick, speedup=f"{drf / quick:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Boot time and memory of gunicorn.conf.py per worker class.
+
+    python benchmarks/bench_startup.py [--workers 4] [--requests 200]
+
+For each ``GUNICORN_WORKER_CLASS`` (sync, gthread, uvicorn), with and
+without ``GUNICORN_PRELOAD``, starts gunicorn with ``--workers`` workers
+and reports:
+
+- boot: seconds from launch until the first request is answered;
+- pss: proportional memory of the master and workers together, after
+  ``--requests`` requests have warmed every worker up. Pages shared
+  copy-on-write with the master count once, split between the processes,
+  so this is what the server really costs;
+- private: memory each worker holds alone, on average.
+
+Reads /proc, so it runs on Linux only.
+"""
+
+import argparse
+import http.client
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_db_connections import free_port, start_gunicorn  # noqa: E402
+from benchmarks.common import setup_django  # noqa: E402
+
+APPS = {
+    "sync": "mysite.wsgi:application",
+    "gthread": "mysite.wsgi:application",
+    "uvicorn": "mysite.asgi:application",
+}
+
+
+def children(pid):
+    found = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(stat.parent.name))
+    return found
+
+
+def memory_kib(pid):
+    """``(pss, private)`` of a process in KiB."""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":")
+        values[name] = int(value.split()[0])
+    return values["Pss"], values["Private_Clean"] + values["Private_Dirty"]
+
+
+def warm_up(port, requests):
+    for _ in range(requests):
+        # A new connection each time, so requests spread over the workers
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", "/api/photographers/")
+        conn.getresponse().read()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--classes", nargs="+", choices=APPS, default=list(APPS))
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_DEBUG", "False")
+    setup_django()
+
+    for kind in args.classes:
+        for preload in (True, False):
+            env = {
+                **os.environ,
+                "GUNICORN_WORKER_CLASS": kind,
+                "GUNICORN_PRELOAD": str(preload),
+                "WEB_CONCURRENCY": str(args.workers),
+                "PYTHONWARNINGS": "ignore:No directory",
+            }
+            port = free_port()
+            start = time.perf_counter()
+            process = start_gunicorn(port, env, [], APPS[kind])
+            boot = time.perf_counter() - start
+            try:
+                warm_up(port, args.requests)
+                time.sleep(0.5)
+                workers = children(process.pid)
+                pss = memory_kib(process.pid)[0]
+                private = 0
+                for pid in workers:
+                    worker_pss, worker_private = memory_kib(pid)
+                    pss += worker_pss
+                    private += worker_private
+            finally:
+                process.terminate()
+                process.wait()
+
+            print(
+                f"{kind:<8} preload={'on ' if preload else 'off'} "
+                f"boot={boot:5.2f}s  pss={pss / 1024:6.1f} MiB  "
+                f"private={private / 1024 / max(len(workers), 1):5.1f} MiB/worker "
+                f"({len(workers)} workers)"
+            )
+
+
+if __name__ == "__main__":
+    main()
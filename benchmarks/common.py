@@ -0,0 +1,55 @@
+"""
+Shared setup for the benchmark scripts.
+
+Each script runs against a throwaway SQLite database unless ``DB_ENGINE`` is
+already set, so benchmarks never touch the development database.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    if "DB_ENGINE" not in os.environ:
+        os.environ["DB_ENGINE"] = "django.db.backends.sqlite3"
+        os.environ["DB_NAME"] = os.path.join(
+            tempfile.mkdtemp(prefix="bench-"), "bench.sqlite3"
+        )
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+    os.environ.setdefault("DJANGO_DEBUG", "True")
+    os.environ.setdefault("DJANGO_SECURE_SSL_REDIRECT", "False")
+    os.environ.setdefault("DJANGO_ALLOWED_HOSTS", "testserver,localhost,127.0.0.1")
+    # No per-request log line from health.middleware in the timings
+    os.environ.setdefault("REQUEST_LOG_LEVEL", "WARNING")
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+
+
+def timeit(fn, repeat=20, warmup=2):
+    """Run ``fn`` and return ``(median, p95)`` wall time in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def report(name, median, p95, **extra):
+    details = " ".join(f"{key}={value}" for key, value in extra.items())
+    print(f"{name:<40} median={median:8.2f}ms p95={p95:8.2f}ms {details}".rstrip())
@@ -0,0 +1,32 @@
+"""
+The project's WSGI and ASGI applications with every query delayed by
+``SLOW_DB_MS`` milliseconds, standing in for a distant or busy database:
+
+    SLOW_DB_MS=20 gunicorn benchmarks.slowdb:wsgi
+    SLOW_DB_MS=20 gunicorn benchmarks.slowdb:asgi -k uvicorn.workers.UvicornWorker
+
+The delay blocks the thread running the query, as waiting on a real
+database would.
+"""
+
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+DELAY = float(os.environ.get("SLOW_DB_MS", "20")) / 1000
+
+
+def delay(execute, sql, params, many, context):
+    time.sleep(DELAY)
+    return execute(sql, params, many, context)
+
+
+def slow_down(sender, connection, **kwargs):
+    connection.execute_wrappers.append(delay)
+
+
+connection_created.connect(slow_down)
+
+from mysite.asgi import application as asgi  # noqa: E402
+from mysite.wsgi import application as wsgi  # noqa: E402
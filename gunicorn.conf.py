@@ -0,0 +1,167 @@
+"""
+gunicorn configuration, sized from the machine it starts on.
+
+    gunicorn -c gunicorn.conf.py
+
+``GUNICORN_WORKER_CLASS`` picks how requests are served:
+
+    gthread (default)  the WSGI app on threaded workers
+    sync               the WSGI app on single-threaded workers; only behind a
+                       proxy that buffers slow clients
+    uvicorn            the ASGI app with the async views (API_ASYNC_VIEWS)
+
+``API_ASYNC_VIEWS`` (and with it the notification stream) needs uvicorn: a
+WSGI worker would buffer each stream to its end, and a sync worker would be
+killed by ``timeout`` in the middle of it.
+
+Workers follow the usable CPUs (2 x CPUs + 1 for sync, CPUs + 1 for
+gthread, one per CPU for uvicorn), capped by the memory available at
+``GUNICORN_WORKER_MEMORY_MB`` per worker. gthread workers get
+``GUNICORN_THREADS`` threads, more when memory cut the worker count, so
+concurrency stays the same. ``WEB_CONCURRENCY`` sets the worker count
+outright. With ``DB_POOL``, each gthread thread may hold a pooled
+connection, so ``DB_POOL_MAX_SIZE`` defaults to the thread count, and an
+explicit smaller pool caps the threads instead. With more than one worker,
+``DIRECTORY_CACHE_BACKEND`` defaults to ``database``, so a directory write
+invalidates the cached pages of every worker, not just its own.
+
+The app is loaded once in the master before forking (``preload_app``), so
+workers share its memory copy-on-write, and each worker is replaced after
+``GUNICORN_MAX_REQUESTS`` requests, give or take the jitter, so leaks stay
+bounded and workers do not all restart at once.
+"""
+
+import gc
+import math
+import os
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn.workers.UvicornWorker",
+}
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def cpu_count():
+    """CPUs this process may use, honouring affinity and a cgroup v2 quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def memory_mb():
+    """Memory this process may use in MiB: the cgroup limit or MemTotal."""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            return int(limit) // 2**20
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def size_workers(kind, cpus, memory, worker_memory, threads_per_worker):
+    """Return ``(workers, threads)`` for a worker class on this machine."""
+    by_cpu = {"sync": 2 * cpus + 1, "gthread": cpus + 1, "uvicorn": cpus}[kind]
+    workers = by_cpu
+    if memory is not None:
+        workers = min(workers, memory // worker_memory)
+    workers = max(workers, 1)
+    if kind != "gthread":
+        return workers, 1
+    # Make up for workers the memory cap removed with threads
+    return workers, threads_per_worker * math.ceil(by_cpu / workers)
+
+
+kind = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+if kind not in WORKER_CLASSES:
+    raise RuntimeError(f"Unknown GUNICORN_WORKER_CLASS {kind!r}")
+worker_class = WORKER_CLASSES[kind]
+
+if kind == "uvicorn":
+    wsgi_app = "mysite.asgi:application"
+    os.environ["API_ASYNC_VIEWS"] = "True"
+    # Under ASGI each request's ORM calls run in a thread of their own, so
+    # persistent connections would pile up; reuse them through DB_POOL
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+else:
+    wsgi_app = "mysite.wsgi:application"
+    if os.environ.get("API_ASYNC_VIEWS", "False").lower() == "true":
+        raise RuntimeError("API_ASYNC_VIEWS needs GUNICORN_WORKER_CLASS=uvicorn")
+
+workers, threads = size_workers(
+    kind,
+    cpu_count(),
+    memory_mb(),
+    env_int("GUNICORN_WORKER_MEMORY_MB", 150),
+    env_int("GUNICORN_THREADS", 4),
+)
+workers = env_int("WEB_CONCURRENCY", workers)
+if kind == "gthread" and os.environ.get("DB_POOL", "False").lower() == "true":
+    # Threads beyond the pool size would queue for a connection
+    if os.environ.get("DB_POOL_MAX_SIZE"):
+        threads = min(threads, env_int("DB_POOL_MAX_SIZE", threads))
+    else:
+        os.environ["DB_POOL_MAX_SIZE"] = str(threads)
+if workers > 1:
+    os.environ.setdefault("DIRECTORY_CACHE_BACKEND", "database")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True").lower() == "true"
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = timeout
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+errorlog = "-"
+# Heartbeat files on tmpfs: a disk-backed /tmp can stall workers in Docker
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    # Keep the preloaded objects out of the collector so it never writes to
+    # (and so copies) their pages in the workers
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    # Connections opened by the master while loading the app are not safe
+    # to share between processes
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Deliver outbox events from boot, including those earlier workers left
+    from django.conf import settings
+
+    if settings.NOTIFICATION_DISPATCH == "thread":
+        from api.outbox import dispatcher
+
+        dispatcher.start()
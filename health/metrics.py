@@ -0,0 +1,156 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters and histograms are keyed by label values and guarded by a lock;
+``registry.render()`` produces the text format served at
+``/api/health/metrics/``. Values are per process, so with several gunicorn
+workers each scrape sees the worker that answered it.
+"""
+
+import math
+import threading
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{%s}" % ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _format_number(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}{labels} {_format_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = (*sorted(buckets), math.inf)
+        # label values -> [bucket counts..., sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        for label_values, state in sorted(values.items()):
+            for bound, count in zip(self.buckets, state):
+                labels = _format_labels(
+                    self.labels, label_values, [("le", _format_number(bound))]
+                )
+                yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_number(state[-2])}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Requests served, by view, method and status code.",
+        labels=("view", "method", "status"),
+    )
+)
+request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Total time spent handling a request.",
+        labels=("view", "method"),
+    )
+)
+db_queries = registry.register(
+    Histogram(
+        "db_queries_per_request",
+        "SQL queries executed while handling a request.",
+        labels=("view", "method"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+db_duration = registry.register(
+    Histogram(
+        "db_duration_seconds",
+        "Time spent in SQL queries per request.",
+        labels=("view", "method"),
+    )
+)
+serialization_duration = registry.register(
+    Histogram(
+        "serialization_duration_seconds",
+        "Time spent serializing and rendering the response body per request.",
+        labels=("view", "method"),
+    )
+)
+repeated_queries = registry.register(
+    Counter(
+        "db_repeated_query_requests_total",
+        "Requests that ran one SQL statement more often than the N+1 threshold.",
+        labels=("view", "method"),
+    )
+)
@@ -0,0 +1,205 @@
+import functools
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+from . import metrics
+
+logger = logging.getLogger("health.requests")
+
+# The stats of the request being served. Context variables follow the
+# request into the threads sync_to_async runs its queries in.
+current_stats = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.view = "unresolved"
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.statements = Counter()
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def most_repeated(self):
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats.record_query(execute, sql, params, many, context)
+
+
+def install_query_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Connections are per thread; wrap those opened later by other threads
+connection_created.connect(install_query_wrapper)
+
+
+def timed_serialization(func):
+    """
+    Count the time spent in ``func`` as the current request's serialization
+    time, less the queries it runs (a lazy queryset evaluated while
+    serializing is database time). Nested calls count once.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stats = current_stats.get()
+        if stats is None or stats.serializing:
+            return func(*args, **kwargs)
+        stats.serializing = True
+        start, db_time = time.perf_counter(), stats.db_time
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.serializing = False
+            elapsed = time.perf_counter() - start
+            stats.serialize_time += elapsed - (stats.db_time - db_time)
+
+    return wrapper
+
+
+# Serializers build their output in ``.data``, inside the view, before the
+# renderer ever runs
+BaseSerializer.data = property(timed_serialization(BaseSerializer.data.fget))
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure every request: SQL query count and time (through
+    ``connection.execute_wrapper``), serialization time and total time,
+    attributed to the resolved view class. Serialization covers serializer
+    ``.data`` (and anything else wrapped in ``timed_serialization``) as well
+    as rendering the response body.
+
+    The numbers are returned in a ``Server-Timing`` header, logged as one
+    JSON line on the ``health.requests`` logger and aggregated into the
+    histograms served by ``/api/health/metrics/``. A request that runs the
+    same SQL statement ``REQUEST_METRICS_REPEATED_QUERIES`` times or more,
+    the signature of an N+1 query, is logged as a warning and counted.
+
+    Works natively under WSGI and ASGI, so async views reach the database
+    without a thread hop here, and the queries they run through
+    ``sync_to_async`` are counted too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, "REQUEST_METRICS_REPEATED_QUERIES", 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django runs sync hooks of an async middleware in a thread
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        for alias in connections:
+            install_query_wrapper(connections[alias])
+        stats, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats, start)
+
+    @staticmethod
+    def start(request):
+        stats = request.request_stats = RequestStats()
+        return stats, current_stats.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, start):
+        total = time.perf_counter() - start
+        response["Server-Timing"] = (
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+            f"serialize;dur={stats.serialize_time * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        self.record(request, response, stats, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "view_class", view_func)
+        request.request_stats.view = view.__name__
+
+    def process_template_response(self, request, response):
+        # Called just before DRF renders the response body
+        stats = request.request_stats
+        start = time.perf_counter()
+
+        def rendered(response):
+            stats.serialize_time += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self.process_view(request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return self.process_template_response(request, response)
+
+    def record(self, request, response, stats, total):
+        view, method = stats.view, request.method
+        metrics.requests_total.inc(view, method, str(response.status_code))
+        metrics.request_duration.observe(total, view, method)
+        metrics.db_queries.observe(stats.queries, view, method)
+        metrics.db_duration.observe(stats.db_time, view, method)
+        metrics.serialization_duration.observe(stats.serialize_time, view, method)
+
+        entry = {
+            "event": "request",
+            "method": method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            "queries": stats.queries,
+            "db_ms": round(stats.db_time * 1000, 2),
+            "serialize_ms": round(stats.serialize_time * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+        sql, count = stats.most_repeated()
+        if count >= self.repeat_threshold:
+            metrics.repeated_queries.inc(view, method)
+            entry["repeated_query"] = {"sql": sql, "count": count}
+            logger.warning(json.dumps(entry))
+        else:
+            logger.info(json.dumps(entry))
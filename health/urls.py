@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import HealthView
+from .views import HealthView, MetricsView
 
 urlpatterns = [
     path("", HealthView.as_view(), name="health"),
+    path("metrics/", MetricsView.as_view(), name="health-metrics"),
 ]
@@ -1,8 +1,14 @@
+import hmac
 from datetime import datetime, timezone
 
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .metrics import registry
+
 
 class HealthView(APIView):
     authentication_classes = []
@@ -13,3 +19,30 @@ class HealthView(APIView):
         return Response(
             {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
         )
+
+
+class HasMetricsToken(BasePermission):
+    """Allow requests bearing ``METRICS_TOKEN``; deny all while it is unset."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        header = request.headers.get("Authorization", "")
+        return bool(token) and hmac.compare_digest(
+            header.encode(), f"Bearer {token}".encode()
+        )
+
+
+class MetricsView(APIView):
+    """
+    Request metrics in the Prometheus text exposition format, for scrapers
+    configured with ``METRICS_TOKEN`` as their bearer token.
+    """
+
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    @staticmethod
+    def get(request):
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
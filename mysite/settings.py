@@ -55,6 +55,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    "health.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -100,6 +102,79 @@ DATABASES = {
     }
 }
 
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    # Connection reuse. With DB_POOL each process keeps a psycopg pool of
+    # DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections and requests borrow
+    # from it; otherwise each worker thread keeps its own connection for
+    # DB_CONN_MAX_AGE seconds ("none" for no limit, 0 to close after every
+    # request). CONN_HEALTH_CHECKS replaces a connection the database has
+    # dropped before a request uses it.
+    if os.environ.get("DB_POOL", "False").lower() == "true":
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+                # Seconds a request waits for a free connection
+                "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            }
+        }
+        # Django rejects persistent connections on top of a pool
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+    else:
+        conn_max_age = os.environ.get("DB_CONN_MAX_AGE", "60")
+        DATABASES["default"]["CONN_MAX_AGE"] = (
+            None if conn_max_age.lower() == "none" else int(conn_max_age)
+        )
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = (
+            os.environ.get("DB_CONN_HEALTH_CHECKS", "True").lower() == "true"
+        )
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = {
+        # Take the write lock at BEGIN so concurrent booking transactions
+        # queue on the busy timeout instead of failing lock upgrades. This
+        # applies to every transaction, read-only ones included, so SQLite
+        # serializes them all; it is meant for development and tests only.
+        "transaction_mode": "IMMEDIATE",
+        "timeout": 20,
+    }
+    # A file (not shared-cache memory) so threaded tests get real locking
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db_api.sqlite3"}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Public photographer directory responses. Local memory is per-process, so a
+# write would only invalidate the worker that served it: gunicorn.conf.py
+# switches to DIRECTORY_CACHE_BACKEND=database (one table for every worker
+# and host, created by the api migrations) whenever it runs more than one
+# worker. "file" shares the cache between the workers of a single host.
+DIRECTORY_CACHE_ALIAS = "directory"
+DIRECTORY_CACHE_BACKEND = os.environ.get("DIRECTORY_CACHE_BACKEND", "locmem")
+DIRECTORY_CACHE_TABLE = "api_directory_cache"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    DIRECTORY_CACHE_ALIAS: {
+        "BACKEND": {
+            "locmem": "django.core.cache.backends.locmem.LocMemCache",
+            "file": "django.core.cache.backends.filebased.FileBasedCache",
+            "database": "django.core.cache.backends.db.DatabaseCache",
+        }[DIRECTORY_CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "DIRECTORY_CACHE_LOCATION",
+            {
+                "file": "/tmp/lumlens-directory-cache",
+                "database": DIRECTORY_CACHE_TABLE,
+            }.get(DIRECTORY_CACHE_BACKEND, "lumlens-directory"),
+        ),
+        "TIMEOUT": int(os.environ.get("DIRECTORY_CACHE_TIMEOUT", "300")),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -119,6 +194,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New password hashes use PASSWORD_HASHER: "pbkdf2", "scrypt" or "argon2"
+# (Argon2id, see api.hashing). Hashes from the other hashers still verify
+# and are upgraded on the user's next login.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "argon2": "api.hashing.Argon2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+    # Legacy hashes from Django's default list. Its Argon2 hashes verify
+    # with api.hashing's, which registers the same "argon2" algorithm.
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+# Threads hashing passwords for the async auth views; defaults to one per CPU
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "0")) or None
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -174,6 +269,12 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetPagination",
+    "PAGE_SIZE": int(os.environ.get("API_PAGE_SIZE", "50")),
 }
 
 from datetime import timedelta
@@ -197,6 +298,75 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "USER_ID_FIELD": "uid",
     "USER_ID_CLAIM": "user_id",
+    "CHECK_REVOKE_TOKEN": os.environ.get("JWT_CHECK_REVOKE", "False").lower() == "true",
+}
+
+# Minutes a booking occupies from its start time, used by the free-slot search
+BOOKING_SLOT_MINUTES = int(os.environ.get("BOOKING_SLOT_MINUTES", "60"))
+
+# How booking writes deliver notifications (see api.outbox): "thread" stores
+# them in the outbox table for a background worker to deliver, "sync"
+# inserts them in the request.
+NOTIFICATION_DISPATCH = os.environ.get("NOTIFICATION_DISPATCH", "thread")
+# Seconds delivered outbox events are kept before the dispatcher purges them
+NOTIFICATION_OUTBOX_RETENTION = int(
+    os.environ.get("NOTIFICATION_OUTBOX_RETENTION", "86400")
+)
+
+# Notification event streams (api.async_views.NotificationStreamView).
+# The broker wakes streams on new notifications; LocalBroker is per-process,
+# so other workers' writes are picked up by the heartbeat poll.
+NOTIFICATION_BROKER = os.environ.get("NOTIFICATION_BROKER", "api.pubsub.LocalBroker")
+NOTIFICATION_STREAM_HEARTBEAT = int(
+    os.environ.get("NOTIFICATION_STREAM_HEARTBEAT", "15")
+)
+NOTIFICATION_STREAM_MAX_AGE = int(os.environ.get("NOTIFICATION_STREAM_MAX_AGE", "300"))
+# Seconds each stream poll looks back for notifications that committed after
+# newer ones were sent
+NOTIFICATION_STREAM_LAG = float(os.environ.get("NOTIFICATION_STREAM_LAG", "5"))
+
+# Serve the async variants of views (api.async_views) in place of the
+# synchronous ones. Enable when running under an ASGI server, as
+# gunicorn.conf.py does for GUNICORN_WORKER_CLASS=uvicorn.
+API_ASYNC_VIEWS = os.environ.get("API_ASYNC_VIEWS", "False").lower() == "true"
+# Requests each worker's async views serve at once (api.async_views
+# .BoundedView). Every one of them holds an executor thread and a database
+# connection, so the default follows the connection pool size.
+ASYNC_VIEW_CONCURRENCY = int(
+    os.environ.get("ASYNC_VIEW_CONCURRENCY", os.environ.get("DB_POOL_MAX_SIZE", "10"))
+)
+# The notification stream needs the async views, and each of its polls takes
+# a connection and closes it again. On PostgreSQL that would open a new
+# connection per poll of every open stream, so it is only served with
+# DB_POOL, where polls borrow pooled connections.
+NOTIFICATION_STREAM_ENABLED = API_ASYNC_VIEWS and (
+    DATABASES["default"]["ENGINE"] != "django.db.backends.postgresql"
+    or "pool" in DATABASES["default"].get("OPTIONS", {})
+)
+
+# Seconds StatelessJWTAuthentication trusts a cached is_active/password state
+JWT_USER_STATE_TTL = int(os.environ.get("JWT_USER_STATE_TTL", "60"))
+
+# Per-request instrumentation (health.middleware.RequestMetricsMiddleware).
+# A request running one SQL statement this many times is logged as N+1.
+REQUEST_METRICS_REPEATED_QUERIES = int(
+    os.environ.get("REQUEST_METRICS_REPEATED_QUERIES", "5")
+)
+# Bearer token /api/health/metrics/ requires; the endpoint is closed without it
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # One JSON line per request
+        "health.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
 }
 
 # CORS
@@ -0,0 +1,58 @@
+"""
+API-only settings: the project without its browser-facing parts.
+
+    DJANGO_SETTINGS_MODULE=mysite.settings_api gunicorn -c gunicorn.conf.py
+
+Clients of the JSON API authenticate with bearer tokens, so they never use
+the admin, sessions, messages, static files or the browsable API. This
+profile drops those apps and their middleware (session, CSRF, message,
+clickjacking, WhiteNoise, and AuthenticationMiddleware, which needs
+sessions; DRF authenticates requests itself), so workers import less at
+boot and every request passes through fewer layers.
+
+The admin and static files keep being served by a second process on
+``mysite.settings``, which the proxy routes ``/admin/`` and ``/static/``
+to. Both use the same database; migrations still run under
+``mysite.settings``.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+BROWSER_APPS = {
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+}
+BROWSER_MIDDLEWARE = {
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in BROWSER_APPS]
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in BROWSER_MIDDLEWARE]
+ROOT_URLCONF = "mysite.urls_api"
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "context_processors": [
+                processor
+                for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.contrib.messages.context_processors.messages"
+            ],
+        },
+    }
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("api.renderers.FastJSONRenderer",),
+}
@@ -0,0 +1,8 @@
+"""URL configuration of the API-only profile, ``mysite.settings_api``."""
+
+from django.urls import include, path
+
+urlpatterns = [
+    path("api/", include("api.urls")),
+    path("api/health/", include("health.urls")),
+]
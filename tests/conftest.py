@@ -1,6 +1,7 @@
 import os
 
 import pytest
+from django.core.cache import caches
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -20,3 +21,16 @@ def disable_whitenoise(settings):
         for m in settings.MIDDLEWARE
         if m != "whitenoise.middleware.WhiteNoiseMiddleware"
     ]
+
+
+@pytest.fixture(autouse=True)
+def sync_notifications(settings):
+    # Write notifications inside the request so tests can read them back
+    settings.NOTIFICATION_DISPATCH = "sync"
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cached responses must not leak between tests once the DB rolls back
+    for cache in caches.all():
+        cache.clear()
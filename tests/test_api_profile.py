@@ -0,0 +1,86 @@
+"""
+What the API-only settings profile, ``mysite.settings_api``, leaves out
+compared with the full ``mysite.settings``. For boot and request timings,
+run ``benchmarks/bench_profiles.py``.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.test import Client
+
+from mysite import settings_api
+
+pytestmark = pytest.mark.django_db
+
+# Imported only for the browser-facing apps and middleware. DRF imports
+# parts of the admin and messages itself (rest_framework.schemas pulls in
+# django.contrib.admindocs), so those are not a signal.
+BROWSER_MODULES = (
+    "django.contrib.sessions",
+    "django.contrib.staticfiles",
+    "django.middleware.clickjacking",
+    "whitenoise",
+    "api.admin",
+)
+BOOT = """
+import json, sys
+import django
+django.setup()
+from mysite.wsgi import application
+from django.urls import resolve
+resolve("/api/health/")
+print(json.dumps(list(sys.modules)))
+"""
+
+
+def boot(settings_module):
+    """Boot a worker in a fresh interpreter and return its modules."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_api_profile_boots_without_browser_apps():
+    full = boot("mysite.settings")
+    api = boot("mysite.settings_api")
+
+    assert any(module.startswith(BROWSER_MODULES) for module in full)
+    assert not [module for module in api if module.startswith(BROWSER_MODULES)]
+    assert len(api) < len(full)
+
+
+def profiled_calls(client, path):
+    client.get(path)  # warm up
+    profile = cProfile.Profile()
+    profile.enable()
+    response = client.get(path)
+    profile.disable()
+    return response, pstats.Stats(profile).total_calls
+
+
+def test_api_profile_trims_request_path(settings):
+    full_response, full_calls = profiled_calls(Client(), "/api/health/")
+
+    settings.MIDDLEWARE = settings_api.MIDDLEWARE
+    settings.ROOT_URLCONF = settings_api.ROOT_URLCONF
+    api_response, api_calls = profiled_calls(Client(), "/api/health/")
+
+    assert api_response.status_code == full_response.status_code == 200
+    assert "X-Frame-Options" in full_response
+    assert "X-Frame-Options" not in api_response
+    assert not api_response.cookies
+    assert api_calls < full_calls
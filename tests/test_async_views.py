@@ -0,0 +1,218 @@
+import asyncio
+import json
+import uuid
+from datetime import date, time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.async_views import (
+    AsyncBookingMeListView,
+    BoundedView,
+    AsyncMeView,
+    AsyncNotificationMeListView,
+    AsyncPhotographerDetailView,
+    AsyncPhotographerListView,
+)
+from api.authentication import user_state_cache
+from api.models import Booking, Notification, PhotographerProfile
+from api.views import EmailTokenObtainPairSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_user_state():
+    user_state_cache.clear()
+
+
+@pytest.fixture()
+def world():
+    User = get_user_model()
+    customer = User.objects.create_user(
+        email="asynccust@example.com", displayName="asynccust", role="customer"
+    )
+    photographers = []
+    for i in range(3):
+        photographer = User.objects.create_user(
+            email=f"asyncphoto{i}@example.com",
+            displayName=f"asyncphoto{i}",
+            role="photographer",
+        )
+        PhotographerProfile.objects.create(user=photographer, bio=f"bio {i}")
+        photographers.append(photographer)
+    for hour in range(9, 14):
+        booking = Booking.objects.create(
+            customer=customer,
+            photographer=photographers[0],
+            date=date(2031, 3, 3),
+            time=time(hour),
+        )
+        Notification.objects.create(
+            user=customer, booking=booking, message=f"Booked {hour}"
+        )
+    return customer, photographers
+
+
+def token(user):
+    return str(EmailTokenObtainPairSerializer.get_token(user).access_token)
+
+
+def call(view, path, user=None, **kwargs):
+    headers = {"Authorization": f"Bearer {token(user)}"} if user else {}
+    request = AsyncRequestFactory().get(path, headers=headers)
+    return async_to_sync(view.as_view())(request, **kwargs)
+
+
+def sync_get(path, user=None):
+    client = APIClient()
+    if user:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token(user)}")
+    return client.get(path)
+
+
+@pytest.mark.parametrize(
+    "view,path,role",
+    [
+        (AsyncPhotographerListView, "/api/photographers/", None),
+        (AsyncBookingMeListView, "/api/bookings/me/", "customer"),
+        (AsyncBookingMeListView, "/api/bookings/me/", "photographer"),
+        (AsyncNotificationMeListView, "/api/notifications/me/", "customer"),
+    ],
+)
+def test_async_lists_match_sync_views(world, view, path, role):
+    customer, photographers = world
+    user = {"customer": customer, "photographer": photographers[0]}.get(role)
+    url = f"{path}?page_size=2"
+    pages = 0
+    while url:
+        expected = sync_get(url, user)
+        response = call(view, url, user)
+        assert response.status_code == expected.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        assert response.content == expected.content
+        assert response.get("Link") == expected.get("Link")
+        pages += 1
+        link = response.get("Link")
+        url = link[link.index("/api/") : link.index(">")] if link else None
+    assert pages == 2 if view is AsyncPhotographerListView else 3
+
+
+def test_async_me_matches_sync_view(world):
+    customer, _ = world
+    response = call(AsyncMeView, "/api/auth/me/", customer)
+    assert response.status_code == 200
+    assert json.loads(response.content) == sync_get("/api/auth/me/", customer).json()
+
+
+def test_async_detail_matches_sync_view(world):
+    _, photographers = world
+    path = f"/api/photographers/{photographers[1].uid}/"
+    response = call(AsyncPhotographerDetailView, path, id=photographers[1].uid)
+    assert response.status_code == 200
+    assert response.content == sync_get(path).content
+    assert sync_get(path)["ETag"] == response["ETag"]
+
+    missing = uuid.uuid4()
+    path = f"/api/photographers/{missing}/"
+    response = call(AsyncPhotographerDetailView, path, id=missing)
+    assert response.status_code == 404
+    assert json.loads(response.content) == sync_get(path).json()
+
+
+def test_async_directory_shares_the_sync_cache(world, django_assert_num_queries):
+    response = call(AsyncPhotographerListView, "/api/photographers/")
+    etag = response["ETag"]
+    with django_assert_num_queries(0):
+        cached = sync_get("/api/photographers/")
+    assert cached["ETag"] == etag
+    assert cached.content == response.content
+
+    request = AsyncRequestFactory().get(
+        "/api/photographers/", headers={"If-None-Match": etag}
+    )
+    response = async_to_sync(AsyncPhotographerListView.as_view())(request)
+    assert response.status_code == 304
+
+
+def test_async_sparse_fieldsets_use_the_sync_serializers(world):
+    customer, _ = world
+    path = "/api/bookings/me/?fields=id,photographer&expand=photographer"
+    response = call(AsyncBookingMeListView, path, customer)
+    assert response.status_code == 200
+    assert response.content == sync_get(path, customer).content
+    assert set(json.loads(response.content)[0]) == {"id", "photographer"}
+
+
+def test_async_views_require_authentication(world):
+    for view, path in [
+        (AsyncMeView, "/api/auth/me/"),
+        (AsyncBookingMeListView, "/api/bookings/me/"),
+        (AsyncNotificationMeListView, "/api/notifications/me/"),
+    ]:
+        response = call(view, path)
+        expected = sync_get(path)
+        assert response.status_code == expected.status_code == 401
+        assert response["WWW-Authenticate"] == expected["WWW-Authenticate"]
+        assert json.loads(response.content) == expected.json()
+
+
+def test_async_list_rejects_invalid_cursor(world):
+    customer, _ = world
+    response = call(
+        AsyncNotificationMeListView, "/api/notifications/me/?cursor=x", customer
+    )
+    assert response.status_code == 404
+    assert json.loads(response.content) == {"detail": "Invalid cursor"}
+
+
+def test_async_authentication_checks_user_state(world):
+    customer, _ = world
+    customer.is_active = False
+    customer.save()
+    response = call(AsyncMeView, "/api/auth/me/", customer)
+    assert response.status_code == 401
+    expected = sync_get("/api/auth/me/", customer).json()
+    assert json.loads(response.content) == expected
+    assert expected["code"] == "user_inactive"
+
+
+def test_async_authentication_loads_users_of_claimless_tokens(world):
+    customer, _ = world
+    # A token issued before the user claims were added
+    access = AccessToken.for_user(customer)
+    request = AsyncRequestFactory().get(
+        "/api/auth/me/", headers={"Authorization": f"Bearer {access}"}
+    )
+    response = async_to_sync(AsyncMeView.as_view())(request)
+    assert response.status_code == 200
+    assert json.loads(response.content)["email"] == customer.email
+
+
+def test_async_views_serve_a_bounded_number_of_requests(settings):
+    settings.ASYNC_VIEW_CONCURRENCY = 2
+    running = []
+    peak = []
+
+    class SlowView(BoundedView):
+        async def get(self, request):
+            running.append(request)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(request)
+            return HttpResponse("ok")
+
+    async def scenario():
+        view = SlowView.as_view()
+        return await asyncio.gather(
+            *(view(AsyncRequestFactory().get("/")) for _ in range(6))
+        )
+
+    responses = async_to_sync(scenario)()
+    assert [r.status_code for r in responses] == [200] * 6
+    assert max(peak) == 2
@@ -1,5 +1,7 @@
 import pytest
+from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 pytestmark = pytest.mark.django_db
 
@@ -69,3 +71,57 @@ def test_me_with_valid_token_returns_user(client):
     user = resp.json()
     assert user["email"] == "meuser@example.com"
     assert user["role"] == "customer"
+
+
+def _signup_and_login(client, email):
+    client.post(
+        "/api/auth/signup/",
+        {
+            "email": email,
+            "password": "Passw0rd!",
+            "displayName": email.split("@")[0],
+            "role": "customer",
+        },
+        format="json",
+    )
+    login = client.post(
+        "/api/auth/login/", {"email": email, "password": "Passw0rd!"}, format="json"
+    )
+    return login.json()
+
+
+def test_me_is_served_from_token_claims(client, django_assert_num_queries):
+    data = _signup_and_login(client, "claims@example.com")
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+
+    # First request caches the user's active/revocation state
+    with django_assert_num_queries(1):
+        resp = client.get("/api/auth/me/")
+    with django_assert_num_queries(0):
+        resp = client.get("/api/auth/me/")
+    assert resp.status_code == 200
+    assert resp.json() == data["user"]
+
+
+def test_stateless_auth_rejects_deactivated_user(client):
+    data = _signup_and_login(client, "deactivated@example.com")
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+    assert client.get("/api/auth/me/").status_code == 200
+
+    User = get_user_model()
+    user = User.objects.get(email="deactivated@example.com")
+    user.is_active = False
+    user.save()
+    assert client.get("/api/auth/me/").status_code == 401
+
+
+def test_stateless_auth_accepts_tokens_without_profile_claims(client):
+    _signup_and_login(client, "legacy@example.com")
+    User = get_user_model()
+    user = User.objects.get(email="legacy@example.com")
+    access = AccessToken.for_user(user)
+
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    resp = client.get("/api/auth/me/")
+    assert resp.status_code == 200
+    assert resp.json()["email"] == "legacy@example.com"
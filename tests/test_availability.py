@@ -0,0 +1,114 @@
+from datetime import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from api.availability import merge, subtract
+from api.models import Booking, PhotographerProfile, WorkingHours
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = "2030-01-07"
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    photographer = User.objects.create_user(
+        email="hoursphoto@example.com", role="photographer"
+    )
+    PhotographerProfile.objects.create(user=photographer)
+    WorkingHours.objects.create(
+        photographer=photographer,
+        weekday=WorkingHours.Weekday.MONDAY,
+        start=time(9),
+        end=time(17),
+    )
+    return {
+        "photographer": photographer,
+        "customer": User.objects.create_user(
+            email="hourscust@example.com", role="customer"
+        ),
+    }
+
+
+def _book(users, hour, status=Booking.Status.PENDING):
+    Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["photographer"],
+        date=MONDAY,
+        time=time(hour),
+        status=status,
+    )
+
+
+def test_interval_helpers():
+    assert merge([(0, 10), (5, 20), (20, 30), (40, 50)]) == [[0, 30], [40, 50]]
+    assert subtract([[0, 100]], [[10, 20], [50, 60]], 15) == [(20, 50), (60, 100)]
+    assert subtract([[0, 30], [60, 90]], [[20, 70]], 1) == [(0, 20), (70, 90)]
+
+
+def test_free_windows_skip_active_bookings(client, users, django_assert_num_queries):
+    for hour in (10, 11, 14):
+        _book(users, hour)
+    _book(users, 16, status=Booking.Status.REJECTED)
+
+    url = (
+        f"/api/photographers/availability/?photographer={users['photographer'].uid}"
+        f"&date_from={MONDAY}&date_to=2030-01-08"
+    )
+    # Profiles, working hours, one range scan of bookings
+    with django_assert_num_queries(3):
+        r = client.get(url)
+    assert r.status_code == 200, r.content
+    [result] = r.json()["results"]
+    assert result["slots"] == [
+        {"date": MONDAY, "start": "09:00:00", "end": "10:00:00"},
+        {"date": MONDAY, "start": "12:00:00", "end": "14:00:00"},
+        {"date": MONDAY, "start": "15:00:00", "end": "17:00:00"},
+    ]
+
+    r = client.get(url + "&duration=120")
+    assert r.json()["results"][0]["slots"] == [
+        {"date": MONDAY, "start": "12:00:00", "end": "14:00:00"},
+        {"date": MONDAY, "start": "15:00:00", "end": "17:00:00"},
+    ]
+
+
+def test_availability_validates_range(client, users):
+    uid = users["photographer"].uid
+    r = client.get(
+        f"/api/photographers/availability/?photographer={uid}"
+        "&date_from=2030-01-01&date_to=2030-06-01"
+    )
+    assert r.status_code == 400
+
+
+def test_photographer_replaces_working_hours(client, users):
+    client.force_authenticate(users["photographer"])
+    r = client.put(
+        "/api/photographers/me/hours/",
+        [
+            {"weekday": 0, "start": "08:00", "end": "12:00"},
+            {"weekday": 0, "start": "13:00", "end": "18:00"},
+        ],
+        format="json",
+    )
+    assert r.status_code == 200, r.content
+    assert WorkingHours.objects.filter(photographer=users["photographer"]).count() == 2
+
+    r = client.put(
+        "/api/photographers/me/hours/",
+        [{"weekday": 1, "start": "18:00", "end": "08:00"}],
+        format="json",
+    )
+    assert r.status_code == 400
+
+    client.force_authenticate(users["customer"])
+    assert client.get("/api/photographers/me/hours/").status_code == 403
@@ -0,0 +1,158 @@
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework.test import APIClient
+
+from api.models import Booking, Notification
+
+SLOT = {"date": "2030-03-01", "time": "09:00:00"}
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customers": [
+            User.objects.create_user(email=f"race{i}@example.com", role="customer")
+            for i in range(6)
+        ],
+        "photographer": User.objects.create_user(
+            email="racephoto@example.com", role="photographer"
+        ),
+    }
+
+
+def _book(client, customer, photographer):
+    client.force_authenticate(customer)
+    return client.post(
+        "/api/bookings/",
+        {"photographer": str(photographer.uid), **SLOT},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_double_booking_returns_409(client, users):
+    first = _book(client, users["customers"][0], users["photographer"])
+    assert first.status_code == 201
+
+    second = _book(client, users["customers"][1], users["photographer"])
+    assert second.status_code == 409
+    assert Booking.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_rejected_booking_frees_the_slot(client, users):
+    first = _book(client, users["customers"][0], users["photographer"])
+    Booking.objects.filter(id=first.json()["id"]).update(status=Booking.Status.REJECTED)
+
+    second = _book(client, users["customers"][1], users["photographer"])
+    assert second.status_code == 201
+
+
+@pytest.mark.django_db
+def test_slot_check_uses_unique_index(users):
+    qs = (
+        Booking.objects.active()
+        .filter(photographer=users["photographer"], date=SLOT["date"])
+        .filter(time=SLOT["time"])
+    )
+    assert "booking_unique_active_slot" in qs.explain()
+
+
+@pytest.mark.django_db
+def test_only_the_slot_constraint_is_a_conflict(users):
+    booking = Booking.objects.create(
+        customer=users["customers"][0], photographer=users["photographer"], **SLOT
+    )
+    with pytest.raises(IntegrityError) as slot, transaction.atomic():
+        Booking.objects.create(
+            customer=users["customers"][1], photographer=users["photographer"], **SLOT
+        )
+    assert Booking.is_slot_conflict(slot.value)
+
+    with pytest.raises(IntegrityError) as other, transaction.atomic():
+        Booking.objects.filter(pk=booking.pk).update(customer=None)
+    assert not Booking.is_slot_conflict(other.value)
+
+
+@pytest.mark.django_db
+def test_other_integrity_errors_are_not_reported_as_409(client, users, monkeypatch):
+    def enqueue(event):
+        raise IntegrityError("FOREIGN KEY constraint failed")
+
+    monkeypatch.setattr("api.views.outbox.enqueue", enqueue)
+    with pytest.raises(IntegrityError):
+        _book(client, users["customers"][0], users["photographer"])
+    assert not Booking.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_bookings_for_one_slot(users):
+    barrier = threading.Barrier(len(users["customers"]))
+    statuses = []
+
+    def worker(customer):
+        try:
+            barrier.wait()
+            response = _book(APIClient(), customer, users["photographer"])
+            statuses.append(response.status_code)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in users["customers"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(statuses) == [201] + [409] * (len(threads) - 1)
+    booking = Booking.objects.get()
+    # The winning booking always has its notification, losers leave nothing
+    assert Notification.objects.filter(booking=booking).count() == 1
+    assert Notification.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_reports_the_double_bookings_it_rejects(caplog):
+    before = [("api", "0005_booking_notification_indexes")]
+    executor = MigrationExecutor(connection)
+    executor.migrate(before)
+    apps = executor.loader.project_state(before).apps
+    User = apps.get_model(*get_user_model()._meta.label.split("."))
+    HistoricalBooking = apps.get_model("api", "Booking")
+    customers = [
+        User.objects.create(email=f"dup{i}@example.com", role="customer")
+        for i in range(3)
+    ]
+    photographer = User.objects.create(
+        email="dupphoto@example.com", role="photographer"
+    )
+    kept, *dropped = [
+        HistoricalBooking.objects.create(
+            customer=customer, photographer=photographer, status="pending", **SLOT
+        )
+        for customer in customers
+    ]
+
+    executor.loader.build_graph()
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    assert Booking.objects.get(pk=kept.pk).status == "pending"
+    assert {
+        b.status for b in Booking.objects.filter(pk__in=[b.pk for b in dropped])
+    } == {"rejected"}
+    notified = Notification.objects.filter(booking__in=[b.pk for b in dropped])
+    assert sorted(notified.values_list("user_id", flat=True)) == sorted(
+        [customers[1].pk, customers[2].pk, photographer.pk, photographer.pk]
+    )
+    assert all("already booked" in n.message for n in notified)
+    assert all(str(b.pk) in caplog.text for b in dropped)
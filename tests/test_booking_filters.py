@@ -0,0 +1,132 @@
+import json
+from datetime import time, timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.async_views import AsyncBookingMeListView
+from api.authentication import user_state_cache
+from api.models import Booking
+from api.views import EmailTokenObtainPairSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_user_state():
+    user_state_cache.clear()
+
+
+@pytest.fixture()
+def bookings():
+    User = get_user_model()
+    customer = User.objects.create_user(
+        email="filtercust@example.com", displayName="filtercust", role="customer"
+    )
+    photographer = User.objects.create_user(
+        email="filterphoto@example.com",
+        displayName="filterphoto",
+        role="photographer",
+    )
+    today = timezone.localdate()
+    created = {}
+    for name, days, status in [
+        ("old", -30, Booking.Status.COMPLETED),
+        ("yesterday", -1, Booking.Status.REJECTED),
+        ("today", 0, Booking.Status.ACCEPTED),
+        ("soon", 3, Booking.Status.PENDING),
+        ("later", 20, Booking.Status.PENDING),
+    ]:
+        created[name] = Booking.objects.create(
+            customer=customer,
+            photographer=photographer,
+            date=today + timedelta(days=days),
+            time=time(10),
+            status=status,
+        )
+    return customer, photographer, created
+
+
+def get(user, query):
+    token = EmailTokenObtainPairSerializer.get_token(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client.get(f"/api/bookings/me/?{query}")
+
+
+def ids(response):
+    return {booking["id"] for booking in response.json()}
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("", {"old", "yesterday", "today", "soon", "later"}),
+        ("status=pending", {"soon", "later"}),
+        ("status=pending&status=accepted", {"today", "soon", "later"}),
+        ("status=pending,accepted", {"today", "soon", "later"}),
+        ("upcoming=true", {"today", "soon", "later"}),
+        ("past=true", {"old", "yesterday"}),
+        ("upcoming=true&status=pending,accepted", {"today", "soon", "later"}),
+        ("past=true&status=completed", {"old"}),
+    ],
+)
+def test_bookings_me_filters(bookings, query, expected):
+    customer, photographer, created = bookings
+    for user in (customer, photographer):
+        response = get(user, query)
+        assert response.status_code == 200, response.content
+        assert ids(response) == {str(created[name].id) for name in expected}
+
+
+def test_bookings_me_filters_by_date_range(bookings):
+    customer, _, created = bookings
+    today = timezone.localdate()
+    query = f"date_from={today - timedelta(days=1)}&date_to={today + timedelta(days=3)}"
+    assert ids(get(customer, query)) == {
+        str(created[name].id) for name in ("yesterday", "today", "soon")
+    }
+    assert ids(get(customer, f"date_from={today}&date_to={today}")) == {
+        str(created["today"].id)
+    }
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "status=unknown",
+        "status=pending,unknown",
+        "date_from=yesterday",
+        "date_from=2030-01-02&date_to=2030-01-01",
+        "upcoming=true&past=true",
+    ],
+)
+def test_bookings_me_rejects_invalid_filters(bookings, query):
+    customer, _, _ = bookings
+    assert get(customer, query).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "status=pending,accepted&upcoming=true",
+        "past=true&page_size=1",
+        "date_from=2030-01-02&date_to=2030-01-01",
+        "status=unknown",
+    ],
+)
+def test_async_bookings_me_filters_match_sync_view(bookings, query):
+    customer, _, _ = bookings
+    token = EmailTokenObtainPairSerializer.get_token(customer).access_token
+    request = AsyncRequestFactory().get(
+        f"/api/bookings/me/?{query}", headers={"Authorization": f"Bearer {token}"}
+    )
+    response = async_to_sync(AsyncBookingMeListView.as_view())(request)
+    expected = get(customer, query)
+    assert response.status_code == expected.status_code
+    assert json.loads(response.content) == expected.json()
+    assert response.get("Link") == expected.get("Link")
@@ -0,0 +1,173 @@
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from api.models import Booking, Notification
+from api.views import EmailTokenObtainPairSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customer": User.objects.create_user(
+            email="statuscust@example.com", displayName="cust", role="customer"
+        ),
+        "photographer": User.objects.create_user(
+            email="statusphoto@example.com", displayName="photo", role="photographer"
+        ),
+        "other": User.objects.create_user(
+            email="otherphoto@example.com", displayName="other", role="photographer"
+        ),
+    }
+
+
+@pytest.fixture()
+def booking(users):
+    return Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["photographer"],
+        date="2030-05-01",
+        time="10:00:00",
+    )
+
+
+def _client(user):
+    client = APIClient()
+    token = EmailTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    # Prime the stateless authentication cache
+    client.get("/api/auth/me/")
+    return client
+
+
+def test_accept_runs_within_query_budget(users, booking, django_assert_num_queries):
+    client = _client(users["photographer"])
+    # SAVEPOINT, UPDATE ... RETURNING, notification INSERT, RELEASE
+    with django_assert_num_queries(4):
+        r = client.patch(
+            f"/api/bookings/{booking.id}/", {"status": "accepted"}, format="json"
+        )
+    assert r.status_code == 200
+    assert r.json() == {"status": "accepted"}
+
+    booking.refresh_from_db()
+    assert booking.status == Booking.Status.ACCEPTED
+    notification = Notification.objects.get(booking=booking)
+    assert notification.user == users["customer"]
+    assert notification.message == "Booking accepted"
+
+
+def test_other_photographer_is_forbidden(users, booking):
+    r = _client(users["other"]).patch(
+        f"/api/bookings/{booking.id}/", {"status": "accepted"}, format="json"
+    )
+    assert r.status_code == 403
+    booking.refresh_from_db()
+    assert booking.status == Booking.Status.PENDING
+    assert not Notification.objects.exists()
+
+
+def test_unknown_booking_is_404(users):
+    r = _client(users["photographer"]).patch(
+        f"/api/bookings/{uuid.uuid4()}/", {"status": "accepted"}, format="json"
+    )
+    assert r.status_code == 404
+
+
+def test_illegal_transition_is_409(users, booking):
+    booking.status = Booking.Status.COMPLETED
+    booking.save()
+
+    r = _client(users["photographer"]).patch(
+        f"/api/bookings/{booking.id}/", {"status": "rejected"}, format="json"
+    )
+    assert r.status_code == 409
+    booking.refresh_from_db()
+    assert booking.status == Booking.Status.COMPLETED
+
+
+def test_rejected_booking_cannot_be_completed(users, booking):
+    booking.status = Booking.Status.REJECTED
+    booking.save()
+
+    r = _client(users["photographer"]).put(f"/api/bookings/{booking.id}/complete/")
+    assert r.status_code == 409
+
+
+def test_transition_table():
+    Status = Booking.Status
+    assert Status.sources(Status.ACCEPTED) == [Status.PENDING]
+    assert Status.sources(Status.COMPLETED) == [Status.ACCEPTED]
+    assert Status.sources(Status.PENDING) == []
+
+
+def test_bulk_transitions_report_per_item(users, django_assert_num_queries):
+    mine = Booking.objects.bulk_create(
+        Booking(
+            customer=users["customer"],
+            photographer=users["photographer"],
+            date="2030-06-01",
+            time=f"{hour:02d}:00:00",
+        )
+        for hour in range(20)
+    )
+    foreign = Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["other"],
+        date="2030-06-02",
+        time="10:00:00",
+    )
+    unknown = uuid.uuid4()
+    items = (
+        [{"id": str(b.id), "status": "accepted"} for b in mine[:15]]
+        + [{"id": str(b.id), "status": "rejected"} for b in mine[15:]]
+        + [
+            {"id": str(mine[0].id), "status": "completed"},
+            {"id": str(foreign.id), "status": "accepted"},
+            {"id": str(unknown), "status": "accepted"},
+        ]
+    )
+    client = _client(users["photographer"])
+
+    r = client.post("/api/bookings/transitions/", {"transitions": items}, format="json")
+    assert r.status_code == 400  # mine[0] appears twice
+
+    items.pop(-3)
+    # SAVEPOINT, one UPDATE per target status, one lookup for the failures,
+    # one bulk notification INSERT, RELEASE
+    with django_assert_num_queries(6):
+        r = client.post(
+            "/api/bookings/transitions/", {"transitions": items}, format="json"
+        )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [item["id"] for item in results] == [item["id"] for item in items]
+    assert all(item["ok"] for item in results[:20])
+    assert results[20]["error"] == "forbidden"
+    assert results[21]["error"] == "not_found"
+
+    assert Booking.objects.filter(status="accepted").count() == 15
+    assert Booking.objects.filter(status="rejected").count() == 5
+    assert Notification.objects.filter(user=users["customer"]).count() == 20
+
+    # Rejected bookings cannot be accepted again
+    r = client.post(
+        "/api/bookings/transitions/",
+        {"transitions": [{"id": str(mine[19].id), "status": "accepted"}]},
+        format="json",
+    )
+    assert r.json()["results"][0]["error"] == "illegal_transition"
+
+
+def test_customers_cannot_use_bulk_transitions(users, booking):
+    r = _client(users["customer"]).post(
+        "/api/bookings/transitions/",
+        {"transitions": [{"id": str(booking.id), "status": "accepted"}]},
+        format="json",
+    )
+    assert r.status_code == 403
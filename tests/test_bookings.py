@@ -76,13 +76,13 @@ def test_customer_can_create_booking(client, users, tokens):
 def test_bookings_me_filters_by_role(client, users, tokens):
     # Create two bookings for the same photographer by the customer
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['customer_access']}")
-    for _ in range(2):
+    for hour in (10, 11):
         client.post(
             "/api/bookings/",
             {
                 "photographer": str(users["photographer"].uid),
                 "date": "2030-01-01",
-                "time": "10:00:00",
+                "time": f"{hour}:00:00",
             },
             format="json",
         )
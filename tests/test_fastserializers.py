@@ -0,0 +1,91 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.fastserializers import (
+    BookingFastSerializer,
+    NotificationFastSerializer,
+    PhotographerListFastSerializer,
+)
+from api.models import Booking, Notification, PhotographerProfile
+from api.serializers import (
+    BookingSerializer,
+    NotificationSerializer,
+    PhotographerListSerializer,
+)
+
+pytestmark = pytest.mark.django_db
+
+PARITY = [
+    (PhotographerListSerializer, PhotographerListFastSerializer, PhotographerProfile),
+    (BookingSerializer, BookingFastSerializer, Booking),
+    (NotificationSerializer, NotificationFastSerializer, Notification),
+]
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    photographer = User.objects.create_user(
+        email="fastphoto@example.com", displayName="Fäst ✓", role="photographer"
+    )
+    customer = User.objects.create_user(email="fastcust@example.com", role="customer")
+    PhotographerProfile.objects.create(user=photographer, bio='Line\n"quoted"')
+    booking = Booking.objects.create(
+        customer=customer, photographer=photographer, date="2030-05-01", time="09:30"
+    )
+    Notification.objects.create(user=customer, booking=booking, message="Booked")
+    Notification.objects.create(user=customer, message="No booking")
+    return {"photographer": photographer, "customer": customer}
+
+
+@pytest.mark.parametrize("tz", ["UTC", "Asia/Kolkata"])
+@pytest.mark.parametrize("serializer, fast, model", PARITY)
+def test_fast_serializer_matches_drf(users, settings, tz, serializer, fast, model):
+    settings.TIME_ZONE = tz
+    render = JSONRenderer().render
+    rows = model.objects.order_by("pk")
+    expected = render(serializer(rows, many=True).data)
+    assert render(fast.serialize(rows.values_list(*fast.get_paths()))) == expected
+
+
+def fast_serializer_for(path):
+    return {
+        "/api/photographers/": PhotographerListFastSerializer,
+        "/api/bookings/me/": BookingFastSerializer,
+        "/api/notifications/me/": NotificationFastSerializer,
+    }[path]
+
+
+@pytest.mark.parametrize(
+    "path, role",
+    [
+        ("/api/photographers/", None),
+        ("/api/bookings/me/", "customer"),
+        ("/api/bookings/me/", "photographer"),
+        ("/api/notifications/me/", "customer"),
+    ],
+)
+def test_fast_list_views_match_serializer_path(users, path, role):
+    client = APIClient()
+    if role:
+        client.force_authenticate(users[role])
+    fast = client.get(path)
+    # Listing every field forces the regular serializer path
+    fields = ",".join(key for key, _, _ in fast_serializer_for(path).fields)
+    slow = client.get(path, {"fields": fields})
+    assert fast.status_code == slow.status_code == 200
+    assert fast.json()
+    assert fast.content == slow.content
+
+
+def test_fast_path_paginates_with_cursor(users):
+    client = APIClient()
+    client.force_authenticate(users["customer"])
+    first = client.get("/api/notifications/me/", {"page_size": 1})
+    assert [n["message"] for n in first.json()] == ["No booking"]
+    next_url = first["Link"].split(";")[0].strip("<>")
+    second = client.get(next_url)
+    assert [n["message"] for n in second.json()] == ["Booked"]
+    assert "Link" not in second
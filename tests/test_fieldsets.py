@@ -0,0 +1,115 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.fieldsets import parse_fieldset
+from api.models import Booking, Notification, PhotographerProfile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    photographer = User.objects.create_user(
+        email="sparsephoto@example.com", displayName="Sparse", role="photographer"
+    )
+    PhotographerProfile.objects.create(
+        user=photographer, bio="Weddings", profile_image="https://x/p.png"
+    )
+    return {
+        "photographer": photographer,
+        "customer": User.objects.create_user(
+            email="sparsecust@example.com", displayName="Cust", role="customer"
+        ),
+    }
+
+
+@pytest.fixture()
+def booking(users):
+    return Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["photographer"],
+        date="2030-03-01",
+        time="10:00:00",
+    )
+
+
+def test_parse_fieldset():
+    assert parse_fieldset("a, b.c,b.d,,") == {"a": {}, "b": {"c": {}, "d": {}}}
+
+
+def test_directory_returns_and_loads_only_requested_columns(client, users):
+    with CaptureQueriesContext(connection) as queries:
+        r = client.get(
+            "/api/photographers/?fields=user.uid,user.displayName,profile_image"
+        )
+    assert r.status_code == 200, r.content
+    assert r.json() == [
+        {
+            "user": {"uid": str(users["photographer"].uid), "displayName": "Sparse"},
+            "profile_image": "https://x/p.png",
+        }
+    ]
+    [select] = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+    assert '"bio"' not in select
+    assert '"email"' not in select
+
+
+def test_detail_view_accepts_fieldset(client, users):
+    r = client.get(f"/api/photographers/{users['photographer'].uid}/?fields=bio")
+    assert r.json() == {"bio": "Weddings"}
+
+
+def test_unknown_fields_are_rejected(client, users):
+    assert client.get("/api/photographers/?fields=password").status_code == 400
+    assert client.get("/api/photographers/?fields=user.password").status_code == 400
+    assert client.get("/api/photographers/?expand=user").status_code == 400
+
+
+def test_booking_expand(client, users, booking, django_assert_num_queries):
+    client.force_authenticate(users["customer"])
+    r = client.get("/api/bookings/me/")
+    assert r.json()[0]["photographer"] == str(users["photographer"].uid)
+
+    with django_assert_num_queries(1):
+        r = client.get(
+            "/api/bookings/me/?expand=photographer"
+            "&fields=id,status,photographer.displayName"
+        )
+    assert r.json() == [
+        {
+            "id": str(booking.id),
+            "status": "pending",
+            "photographer": {"displayName": "Sparse"},
+        }
+    ]
+
+
+def test_notification_expand_booking(client, users, booking, django_assert_num_queries):
+    for _ in range(3):
+        Notification.objects.create(
+            user=users["customer"], booking=booking, message="Booking accepted"
+        )
+    Notification.objects.create(user=users["customer"], message="Welcome")
+    client.force_authenticate(users["customer"])
+
+    with django_assert_num_queries(1):
+        r = client.get(
+            "/api/notifications/me/?expand=booking.customer"
+            "&fields=message,booking.date,booking.customer.displayName"
+        )
+    assert r.status_code == 200, r.content
+    results = r.json()
+    assert results[0] == {"message": "Welcome", "booking": None}
+    assert results[1] == {
+        "message": "Booking accepted",
+        "booking": {"date": "2030-03-01", "customer": {"displayName": "Cust"}},
+    }
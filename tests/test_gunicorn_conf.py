@@ -0,0 +1,96 @@
+import os
+import runpy
+
+import pytest
+from django.conf import settings
+
+ENV = (
+    "GUNICORN_WORKER_CLASS",
+    "GUNICORN_THREADS",
+    "GUNICORN_MAX_REQUESTS",
+    "GUNICORN_PRELOAD",
+    "WEB_CONCURRENCY",
+    "API_ASYNC_VIEWS",
+    "DB_CONN_MAX_AGE",
+    "DB_POOL",
+    "DB_POOL_MAX_SIZE",
+    "DIRECTORY_CACHE_BACKEND",
+)
+
+
+@pytest.fixture()
+def load_conf():
+    # The config writes os.environ itself, so restore all of it afterwards
+    saved = dict(os.environ)
+
+    def load(**env):
+        for name in ENV:
+            os.environ.pop(name, None)
+        os.environ.update(env)
+        return runpy.run_path(settings.BASE_DIR / "gunicorn.conf.py")
+
+    yield load
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def test_defaults(load_conf):
+    conf = load_conf()
+    assert conf["worker_class"] == "gthread"
+    assert conf["wsgi_app"] == "mysite.wsgi:application"
+    assert conf["preload_app"] is True
+    assert conf["max_requests"] == 1000
+    assert conf["max_requests_jitter"] == 100
+    assert conf["workers"] >= 1 and conf["threads"] >= 4
+
+
+def test_uvicorn_serves_the_async_views(load_conf):
+    conf = load_conf(GUNICORN_WORKER_CLASS="uvicorn", WEB_CONCURRENCY="3")
+    assert conf["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert conf["wsgi_app"] == "mysite.asgi:application"
+    assert conf["workers"] == 3
+    assert conf["os"].environ["API_ASYNC_VIEWS"] == "True"
+    assert conf["os"].environ["DB_CONN_MAX_AGE"] == "0"
+
+
+def test_unknown_worker_class(load_conf):
+    with pytest.raises(RuntimeError):
+        load_conf(GUNICORN_WORKER_CLASS="eventlet")
+
+
+@pytest.mark.parametrize("kind", ["sync", "gthread"])
+def test_async_views_need_uvicorn(load_conf, kind):
+    with pytest.raises(RuntimeError):
+        load_conf(GUNICORN_WORKER_CLASS=kind, API_ASYNC_VIEWS="True")
+
+
+def test_pool_follows_gthread_threads(load_conf):
+    conf = load_conf(DB_POOL="True", GUNICORN_THREADS="12")
+    assert conf["threads"] >= 12
+    assert conf["os"].environ["DB_POOL_MAX_SIZE"] == str(conf["threads"])
+
+    conf = load_conf(DB_POOL="True", GUNICORN_THREADS="12", DB_POOL_MAX_SIZE="5")
+    assert conf["threads"] == 5
+
+
+def test_several_workers_share_the_directory_cache(load_conf):
+    conf = load_conf(WEB_CONCURRENCY="1")
+    assert "DIRECTORY_CACHE_BACKEND" not in conf["os"].environ
+
+    conf = load_conf(WEB_CONCURRENCY="3")
+    assert conf["os"].environ["DIRECTORY_CACHE_BACKEND"] == "database"
+
+    conf = load_conf(WEB_CONCURRENCY="3", DIRECTORY_CACHE_BACKEND="file")
+    assert conf["os"].environ["DIRECTORY_CACHE_BACKEND"] == "file"
+
+
+def test_workers_follow_cpus_and_memory(load_conf):
+    size_workers = load_conf()["size_workers"]
+    assert size_workers("sync", 4, 16384, 150, 4) == (9, 1)
+    assert size_workers("gthread", 4, 16384, 150, 4) == (5, 4)
+    assert size_workers("uvicorn", 4, 16384, 150, 4) == (4, 1)
+    # 512 MiB fits three workers; gthread makes up the rest with threads
+    assert size_workers("sync", 4, 512, 150, 4) == (3, 1)
+    assert size_workers("gthread", 4, 512, 150, 4) == (3, 8)
+    assert size_workers("gthread", 1, 100, 150, 4) == (1, 8)
+    assert size_workers("gthread", 2, None, 150, 4) == (3, 4)
@@ -0,0 +1,159 @@
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model, hashers
+from django.contrib.auth.hashers import make_password
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.async_views import AsyncLoginView, AsyncSignupView
+from api.hashing import Argon2PasswordHasher
+
+pytestmark = pytest.mark.django_db
+
+PASSWORD = "Passw0rd!"
+SCRYPT_FIRST = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+]
+
+
+@pytest.fixture()
+def pbkdf2_user():
+    return get_user_model().objects.create(
+        email="hashuser@example.com",
+        role="customer",
+        password=make_password(PASSWORD, hasher="pbkdf2_sha256"),
+    )
+
+
+def post(view, data):
+    request = AsyncRequestFactory().post(
+        "/", json.dumps(data), content_type="application/json"
+    )
+    return async_to_sync(view.as_view())(request)
+
+
+def test_login_upgrades_outdated_hash(pbkdf2_user, settings):
+    settings.PASSWORD_HASHERS = SCRYPT_FIRST
+    response = APIClient().post(
+        "/api/auth/login/",
+        {"email": pbkdf2_user.email, "password": PASSWORD},
+        format="json",
+    )
+    assert response.status_code == 200
+    pbkdf2_user.refresh_from_db()
+    assert pbkdf2_user.password.startswith("scrypt$")
+    assert pbkdf2_user.check_password(PASSWORD)
+
+
+def test_argon2_hasher_is_tuned(settings):
+    pytest.importorskip("argon2")
+    settings.PASSWORD_HASHERS = ["api.hashing.Argon2PasswordHasher"]
+    encoded = make_password(PASSWORD)
+    assert encoded.startswith("argon2$argon2id$v=19$m=19456,t=2,p=1$")
+    assert hashers.check_password(PASSWORD, encoded)
+
+
+def test_async_login_hashes_in_pool_and_upgrades(pbkdf2_user, settings, monkeypatch):
+    settings.PASSWORD_HASHERS = SCRYPT_FIRST
+    threads = []
+    verify = hashers.verify_password
+
+    def recording_verify(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return verify(*args, **kwargs)
+
+    monkeypatch.setattr(hashers, "verify_password", recording_verify)
+    response = post(AsyncLoginView, {"email": pbkdf2_user.email, "password": PASSWORD})
+
+    assert response.status_code == 200
+    body = json.loads(response.content)
+    assert AccessToken(body["access"])["user_id"] == str(pbkdf2_user.uid)
+    assert body["user"]["email"] == pbkdf2_user.email
+    assert threads and threads[0].startswith("password-hash")
+    pbkdf2_user.refresh_from_db()
+    assert pbkdf2_user.password.startswith("scrypt$")
+
+
+def test_async_login_rejects_bad_credentials(pbkdf2_user):
+    response = post(AsyncLoginView, {"email": pbkdf2_user.email, "password": "nope"})
+    assert response.status_code == 401
+    assert json.loads(response.content) == {
+        "detail": "No active account found with the given credentials"
+    }
+
+    response = post(AsyncLoginView, {"email": "nobody@example.com", "password": "x"})
+    assert response.status_code == 401
+
+    response = post(AsyncLoginView, {"email": pbkdf2_user.email})
+    assert response.status_code == 400
+    assert "password" in json.loads(response.content)
+
+
+def test_async_signup(settings):
+    settings.PASSWORD_HASHERS = SCRYPT_FIRST
+    data = {"email": "async@example.com", "password": PASSWORD, "role": "customer"}
+    response = post(AsyncSignupView, data)
+    assert response.status_code == 201
+    assert json.loads(response.content) == {
+        "email": "async@example.com",
+        "displayName": "",
+        "role": "customer",
+    }
+    user = get_user_model().objects.get(email="async@example.com")
+    assert user.password.startswith("scrypt$")
+    assert user.check_password(PASSWORD)
+
+    response = post(AsyncSignupView, data)
+    assert response.status_code == 400
+    assert "email" in json.loads(response.content)
+
+
+@pytest.mark.parametrize(
+    "view,path,data",
+    [
+        (
+            AsyncSignupView,
+            "/api/auth/signup/",
+            {"email": "bytes@example.com", "password": PASSWORD, "role": "customer"},
+        ),
+        (AsyncSignupView, "/api/auth/signup/", {"email": "not an email"}),
+        (
+            AsyncLoginView,
+            "/api/auth/login/",
+            {"email": "hashuser@example.com", "password": "nope"},
+        ),
+        (AsyncLoginView, "/api/auth/login/", {"email": "hashuser@example.com"}),
+    ],
+)
+def test_async_auth_responses_match_sync_bytes(pbkdf2_user, view, path, data):
+    expected = APIClient().post(path, data, format="json")
+    # Start over, so a signup is not rejected as a duplicate
+    get_user_model().objects.filter(email="bytes@example.com").delete()
+    response = post(view, data)
+    assert response.status_code == expected.status_code
+    assert response.content == expected.content
+
+
+def test_configured_hashers_have_distinct_algorithms():
+    algorithms = [hasher.algorithm for hasher in hashers.get_hashers()]
+    assert len(algorithms) == len(set(algorithms))
+    assert isinstance(
+        hashers.get_hashers_by_algorithm()["argon2"], Argon2PasswordHasher
+    )
+
+
+def test_django_argon2_hashes_verify_and_upgrade():
+    user = get_user_model().objects.create(
+        email="argonuser@example.com",
+        role="customer",
+        password=hashers.Argon2PasswordHasher().encode(PASSWORD, "djangoargon2salt"),
+    )
+    assert user.check_password(PASSWORD)
+    # Upgraded to the preferred hasher on the way
+    user.refresh_from_db()
+    assert user.password.startswith(f"{hashers.get_hasher().algorithm}$")
@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from api.models import Booking, Notification, PhotographerProfile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customer": User.objects.create_user(
+            email="idxcust@example.com", role="customer"
+        ),
+        "photographer": User.objects.create_user(
+            email="idxphoto@example.com", role="photographer"
+        ),
+    }
+
+
+@contextmanager
+def planner():
+    # On PostgreSQL tiny test tables are always cheapest to scan sequentially,
+    # so steer the planner towards index paths for the duration of EXPLAIN.
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_sort = off")
+        yield
+
+
+def _plan(queryset):
+    with planner():
+        return queryset.explain()
+
+
+def test_photographer_bookings_use_composite_index(users):
+    qs = Booking.objects.filter(photographer=users["photographer"]).order_by(
+        "-createdAt", "-pk"
+    )
+    assert "booking_photog_created_idx" in _plan(qs)
+
+
+def test_customer_bookings_use_composite_index(users):
+    qs = Booking.objects.filter(customer=users["customer"]).order_by(
+        "-createdAt", "-pk"
+    )
+    assert "booking_customer_created_idx" in _plan(qs)
+
+
+def test_notification_lists_use_composite_indexes(users):
+    qs = Notification.objects.filter(user=users["customer"]).order_by(
+        "-createdAt", "-pk"
+    )
+    assert "notif_user_created_idx" in _plan(qs)
+
+    unread = Notification.objects.filter(
+        user=users["customer"], is_read=False
+    ).order_by("-createdAt", "-pk")
+    assert "notif_user_unread_idx" in _plan(unread)
+
+
+def test_available_directory_uses_partial_index():
+    qs = PhotographerProfile.objects.filter(availableForBooking=True).order_by(
+        "-createdAt", "-pk"
+    )
+    assert "profile_available_idx" in _plan(qs)
+
+
+def test_filtered_booking_lists_use_status_date_indexes(users):
+    # A long completed history and a little upcoming work, with planner
+    # statistics: the status/date indexes find the upcoming bookings
+    # without walking the history in createdAt order
+    today = date.today()
+    Booking.objects.bulk_create(
+        [
+            Booking(
+                customer=users["customer"],
+                photographer=users["photographer"],
+                date=today - timedelta(days=day),
+                time=time(9),
+                status=Booking.Status.COMPLETED,
+            )
+            for day in range(1, 500)
+        ]
+        + [
+            Booking(
+                customer=users["customer"],
+                photographer=users["photographer"],
+                date=today + timedelta(days=day),
+                time=time(9),
+            )
+            for day in range(1, 4)
+        ]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    def plan(queryset):
+        if connection.vendor != "postgresql":
+            # SQLite keeps no value distribution statistics, so it cannot
+            # tell how few rows match and prefers the createdAt order index;
+            # check that the filter itself is answered from the new index
+            return queryset.order_by().explain()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.order_by("-createdAt", "-pk").explain()
+
+    qs = Booking.objects.filter(photographer=users["photographer"]).matching(
+        status={"pending", "accepted"}, upcoming=True
+    )
+    assert "booking_photog_status_date_idx" in plan(qs)
+
+    qs = Booking.objects.filter(customer=users["customer"]).matching(
+        status={"pending"}, date_from=today, date_to=today + timedelta(days=7)
+    )
+    assert "booking_cust_status_date_idx" in plan(qs)
@@ -0,0 +1,132 @@
+import json
+import logging
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from api.models import Notification
+from health.metrics import Histogram
+from health.middleware import RequestMetricsMiddleware
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def customer():
+    return get_user_model().objects.create_user(
+        email="metricscust@example.com", role="customer"
+    )
+
+
+def test_histogram_exposition():
+    histogram = Histogram("t_seconds", "Test.", labels=("view",), buckets=(0.1, 1))
+    histogram.observe(0.05, 'A"B')
+    histogram.observe(0.5, 'A"B')
+    assert list(histogram.samples()) == [
+        't_seconds_bucket{view="A\\"B",le="0.1"} 1',
+        't_seconds_bucket{view="A\\"B",le="1"} 2',
+        't_seconds_bucket{view="A\\"B",le="+Inf"} 2',
+        't_seconds_sum{view="A\\"B"} 0.55',
+        't_seconds_count{view="A\\"B"} 2',
+    ]
+
+
+def test_server_timing_and_metrics_endpoint(customer, caplog, settings):
+    settings.METRICS_TOKEN = "scrape-me"
+    client = APIClient()
+    client.force_authenticate(customer)
+    with caplog.at_level(logging.INFO, logger="health.requests"):
+        r = client.get("/api/notifications/unread-count/")
+    assert r.status_code == 200
+    timing = r["Server-Timing"]
+    assert "db;dur=" in timing and 'desc="1 queries"' in timing
+    assert "serialize;dur=" in timing and "total;dur=" in timing
+
+    [record] = [r for r in caplog.records if r.name == "health.requests"]
+    entry = json.loads(record.getMessage())
+    assert entry["view"] == "NotificationUnreadCountView"
+    assert entry["queries"] == 1
+    assert entry["status"] == 200
+
+    metrics = APIClient().get(
+        "/api/health/metrics/", HTTP_AUTHORIZATION="Bearer scrape-me"
+    )
+    assert metrics["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = metrics.content.decode()
+    assert "# TYPE db_queries_per_request histogram" in body
+    assert (
+        'db_queries_per_request_bucket{view="NotificationUnreadCountView",'
+        'method="GET",le="1"}' in body
+    )
+    assert (
+        'http_requests_total{view="NotificationUnreadCountView",'
+        'method="GET",status="200"}' in body
+    )
+
+
+def test_repeated_statements_are_flagged(customer, caplog, settings):
+    settings.REQUEST_METRICS_REPEATED_QUERIES = 3
+    Notification.objects.create(user=customer, message="hello")
+
+    def n_plus_one(request):
+        for notification in Notification.objects.all():
+            for _ in range(3):
+                # One lookup per iteration, as an N+1 loop would run
+                Notification.objects.get(pk=notification.pk).user
+        return HttpResponse("ok")
+
+    middleware = RequestMetricsMiddleware(n_plus_one)
+    with caplog.at_level(logging.INFO, logger="health.requests"):
+        middleware(RequestFactory().get("/anything/"))
+
+    [record] = [r for r in caplog.records if r.name == "health.requests"]
+    assert record.levelno == logging.WARNING
+    entry = json.loads(record.getMessage())
+    assert entry["repeated_query"]["count"] == 3
+    assert 'FROM "api_notification"' in entry["repeated_query"]["sql"]
+
+
+def test_metrics_endpoint_requires_the_token(settings):
+    settings.METRICS_TOKEN = ""
+    assert APIClient().get("/api/health/metrics/").status_code == 403
+
+    settings.METRICS_TOKEN = "scrape-me"
+    client = APIClient()
+    assert client.get("/api/health/metrics/").status_code == 403
+    client.credentials(HTTP_AUTHORIZATION="Bearer wrong")
+    assert client.get("/api/health/metrics/").status_code == 403
+
+
+def test_async_requests_count_queries_run_in_threads(customer):
+    async def view(request):
+        await Notification.objects.filter(user=customer).acount()
+        await sync_to_async(list, thread_sensitive=False)(Notification.objects.all())
+        return HttpResponse("ok")
+
+    middleware = RequestMetricsMiddleware(view)
+    assert middleware.async_mode
+    response = async_to_sync(middleware)(AsyncRequestFactory().get("/anything/"))
+    assert 'desc="2 queries"' in response["Server-Timing"]
+
+
+def test_serializer_output_counts_as_serialization(customer):
+    class SlowSerializer(serializers.Serializer):
+        def to_representation(self, instance):
+            time.sleep(0.05)
+            # Queries run while serializing stay database time
+            return {"count": Notification.objects.count()}
+
+    def view(request):
+        SlowSerializer(customer).data
+        return HttpResponse("ok")
+
+    response = RequestMetricsMiddleware(view)(RequestFactory().get("/anything/"))
+    timing = dict(part.split(";dur=") for part in response["Server-Timing"].split(", "))
+    assert float(timing["serialize"]) >= 50
+    assert timing["db"].endswith('desc="1 queries"')
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from django.urls import NoReverseMatch, reverse
+
+from api import outbox
+from api.async_views import NotificationStreamView
+from api.models import Booking, Notification
+from api.outbox import NotificationEvent
+from api.pagination import KeysetPagination
+from api.pubsub import get_broker
+from api.views import EmailTokenObtainPairSerializer
+
+# Stream polls run on other threads, so they only see committed rows
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customer": User.objects.create_user(
+            email="streamcust@example.com", role="customer"
+        ),
+        "photographer": User.objects.create_user(
+            email="streamphoto@example.com", role="photographer"
+        ),
+    }
+
+
+@pytest.fixture()
+def stream_settings(settings):
+    settings.NOTIFICATION_STREAM_HEARTBEAT = 1
+    settings.NOTIFICATION_STREAM_MAX_AGE = 5
+
+
+def _auth(user):
+    token = EmailTokenObtainPairSerializer.get_token(user).access_token
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _open(headers=None):
+    request = AsyncRequestFactory().get("/api/notifications/stream/", headers=headers)
+    return await NotificationStreamView.as_view()(request)
+
+
+async def _next_event(chunks):
+    # Skip keepalive comments
+    while True:
+        chunk = await asyncio.wait_for(anext(chunks), 3)
+        if not chunk.startswith(b":"):
+            return chunk
+
+
+def test_stream_pushes_new_notifications(users, stream_settings):
+    Notification.objects.create(user=users["customer"], message="already seen")
+    booking = Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["photographer"],
+        date="2030-07-01",
+        time="10:00:00",
+    )
+
+    def accept():
+        outbox.enqueue(
+            NotificationEvent.for_booking(
+                booking, users["customer"].pk, "Booking accepted", "accepted"
+            )
+        )
+
+    async def scenario():
+        response = await _open(_auth(users["customer"]))
+        assert response["Content-Type"] == "text/event-stream"
+        chunks = aiter(response.streaming_content)
+        assert await _next_event(chunks) == b"retry: 3000\n\n"
+
+        await sync_to_async(accept)()
+        event = await _next_event(chunks)
+        await chunks.aclose()
+        return event
+
+    event = async_to_sync(scenario)()
+    assert b"event: notification" in event
+    assert b"Booking accepted" in event
+    assert b"already seen" not in event
+
+
+def test_stream_replays_from_cursor(users, stream_settings):
+    first, *rest = Notification.objects.bulk_create(
+        Notification(user=users["customer"], message=f"missed {i}") for i in range(3)
+    )
+    first.refresh_from_db()
+    since = KeysetPagination.encode_cursor(first.createdAt, first.pk)
+
+    async def scenario():
+        response = await _open({**_auth(users["customer"]), "Last-Event-ID": since})
+        chunks = aiter(response.streaming_content)
+        await _next_event(chunks)
+        events = [await _next_event(chunks) for _ in rest]
+        await chunks.aclose()
+        return events
+
+    events = async_to_sync(scenario)()
+    expected = sorted(rest, key=lambda n: (n.createdAt, n.pk))
+    for event, notification in zip(events, expected):
+        assert str(notification.id).encode() in event
+
+
+def test_stream_delivers_rows_that_commit_late(users, stream_settings):
+    def notify(message, age):
+        notification = Notification.objects.create(
+            user=users["customer"], message=message
+        )
+        # As if the row was stamped ``age`` ago but only committed now
+        Notification.objects.filter(pk=notification.pk).update(
+            createdAt=notification.createdAt - age
+        )
+        get_broker().publish([users["customer"].pk])
+
+    async def scenario():
+        response = await _open(_auth(users["customer"]))
+        chunks = aiter(response.streaming_content)
+        await _next_event(chunks)
+        await sync_to_async(notify)("newer", timedelta(0))
+        events = [await _next_event(chunks)]
+        await sync_to_async(notify)("older", timedelta(seconds=1))
+        events.append(await _next_event(chunks))
+        await chunks.aclose()
+        return events
+
+    newer, older = async_to_sync(scenario)()
+    assert b"newer" in newer
+    assert b"older" in older
+
+
+def test_stream_requires_authentication():
+    response = async_to_sync(_open)()
+    assert response.status_code == 401
+
+
+def test_stream_rejects_an_invalid_cursor_like_the_list(users):
+    response = async_to_sync(_open)({**_auth(users["customer"]), "Last-Event-ID": "x"})
+    assert response.status_code == 404
+    assert response.content == b'{"detail":"Invalid cursor"}'
+
+
+def test_stream_is_not_routed_under_wsgi():
+    # Only registered with API_ASYNC_VIEWS, which the test settings leave off
+    with pytest.raises(NoReverseMatch):
+        reverse("notifications-stream")
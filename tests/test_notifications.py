@@ -2,6 +2,9 @@ import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 
+from api.models import Notification
+from api.views import EmailTokenObtainPairSerializer
+
 pytestmark = pytest.mark.django_db
 
 
@@ -143,3 +146,48 @@ def test_me_only_shows_own_and_mark_read(client, users, tokens):
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['customer_access']}")
     r3 = client.patch(f"/api/notifications/{notif_id}/read/")
     assert r3.status_code in (404, 403)
+
+
+@pytest.fixture()
+def inbox(users):
+    return Notification.objects.bulk_create(
+        Notification(user=users["photographer"], message=f"n{i}") for i in range(30)
+    )
+
+
+def _as(client, user):
+    token = EmailTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def test_unread_count_uses_partial_index(client, users, inbox):
+    r = _as(client, users["photographer"]).get("/api/notifications/unread-count/")
+    assert r.json() == {"unread": 30}
+
+    qs = Notification.objects.filter(user=users["photographer"], is_read=False)
+    assert "notif_user_unread_idx" in qs.explain()
+
+
+def test_mark_many_read_in_one_update(client, users, inbox, django_assert_num_queries):
+    _as(client, users["photographer"]).get("/api/notifications/unread-count/")
+    ids = [str(n.id) for n in inbox[:10]]
+    with django_assert_num_queries(1):
+        r = client.post("/api/notifications/read/", {"ids": ids}, format="json")
+    assert r.json() == {"updated": 10}
+    assert client.get("/api/notifications/unread-count/").json() == {"unread": 20}
+
+    r = client.post("/api/notifications/read/", {"all": True}, format="json")
+    assert r.json() == {"updated": 20}
+    assert client.get("/api/notifications/unread-count/").json() == {"unread": 0}
+
+
+def test_mark_read_ignores_other_users_notifications(client, users, inbox):
+    ids = [str(n.id) for n in inbox[:5]]
+    r = _as(client, users["customer"]).post(
+        "/api/notifications/read/", {"ids": ids}, format="json"
+    )
+    assert r.json() == {"updated": 0}
+
+    r = client.post("/api/notifications/read/", {}, format="json")
+    assert r.status_code == 400
@@ -0,0 +1,238 @@
+import io
+import uuid
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import outbox
+from api.models import Booking, Notification, OutboxEvent
+from api.outbox import NotificationEvent
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customer": User.objects.create_user(
+            email="outboxcust@example.com", role="customer"
+        ),
+        "photographer": User.objects.create_user(
+            email="outboxphoto@example.com", role="photographer"
+        ),
+    }
+
+
+@pytest.fixture()
+def booking(users):
+    return Booking.objects.create(
+        customer=users["customer"],
+        photographer=users["photographer"],
+        date="2030-04-01",
+        time="10:00:00",
+    )
+
+
+@pytest.fixture()
+def threaded(settings):
+    settings.NOTIFICATION_DISPATCH = "thread"
+    yield outbox.dispatcher
+    outbox.dispatcher.flush()
+
+
+@pytest.mark.django_db
+def test_repeated_event_is_written_once(users, booking):
+    event = NotificationEvent.for_booking(
+        booking, users["customer"].pk, "Booking accepted", "accepted"
+    )
+    outbox.enqueue(event)
+    outbox.enqueue(event)
+    assert Notification.objects.filter(booking=booking).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_booking_notification_is_written_by_worker(users, threaded):
+    client = APIClient()
+    client.force_authenticate(users["customer"])
+    r = client.post(
+        "/api/bookings/",
+        {
+            "photographer": str(users["photographer"].uid),
+            "date": "2030-04-02",
+            "time": "10:00:00",
+        },
+        format="json",
+    )
+    assert r.status_code == 201
+
+    event = OutboxEvent.objects.get(booking_id=r.json()["id"])
+    threaded.flush()
+    notification = Notification.objects.get(booking_id=r.json()["id"])
+    assert notification.user == users["photographer"]
+    assert notification.message == "New booking request"
+    event.refresh_from_db()
+    assert event.delivered_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_write_enqueues_nothing(users, booking, threaded):
+    event = NotificationEvent.for_booking(
+        booking, users["customer"].pk, "Booking completed", "completed"
+    )
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            outbox.enqueue(event)
+            raise RuntimeError
+
+    threaded.flush()
+    assert not Notification.objects.exists()
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_retries_failed_batches(users, booking, threaded, monkeypatch):
+    calls = []
+    write = outbox.write_notifications
+
+    def flaky_write(events):
+        calls.append(len(events))
+        if len(calls) == 1:
+            raise RuntimeError("database went away")
+        write(events)
+
+    monkeypatch.setattr(outbox.NotificationDispatcher, "backoff", 0)
+    monkeypatch.setattr(outbox, "write_notifications", flaky_write)
+    with transaction.atomic():
+        outbox.enqueue(
+            NotificationEvent.for_booking(
+                booking, users["customer"].pk, "Booking accepted", "accepted"
+            )
+        )
+
+    threaded.flush()
+    assert len(calls) == 2
+    assert Notification.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_events_stay_in_the_outbox(users, booking, threaded, monkeypatch):
+    def failing_write(events):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(outbox, "write_notifications", failing_write)
+    with transaction.atomic():
+        outbox.enqueue(
+            NotificationEvent.for_booking(
+                booking, users["customer"].pk, "Booking accepted", "accepted"
+            )
+        )
+    threaded.flush()
+    event = OutboxEvent.objects.get()
+    assert event.delivered_at is None
+    assert event.attempts == 1
+    assert event.next_attempt_at > timezone.now()
+
+    monkeypatch.undo()
+    OutboxEvent.objects.update(next_attempt_at=timezone.now())
+    threaded.flush()
+    assert Notification.objects.filter(booking=booking).count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_a_failing_event_does_not_hold_up_its_batch(users, booking, monkeypatch):
+    write = outbox.write_notifications
+
+    def picky_write(events):
+        if any(event.key.endswith("rejected") for event in events):
+            raise RuntimeError("bad event")
+        write(events)
+
+    monkeypatch.setattr(outbox, "write_notifications", picky_write)
+    outbox.store_events(
+        [
+            NotificationEvent.for_booking(booking, users["customer"].pk, m, m)
+            for m in ("accepted", "rejected", "completed")
+        ]
+    )
+    assert outbox.dispatcher.deliver_pending() == 3
+    assert set(Notification.objects.values_list("message", flat=True)) == {
+        "accepted",
+        "completed",
+    }
+    assert OutboxEvent.objects.due(timezone.now() + timedelta(hours=1)).count() == 1
+
+
+@pytest.mark.django_db
+def test_command_delivers_events_left_by_another_process(users, booking):
+    # Stored by a worker that went away before delivering them
+    outbox.store_events(
+        [
+            NotificationEvent.for_booking(
+                booking, users["customer"].pk, "Booking accepted", "accepted"
+            )
+        ]
+    )
+    out = io.StringIO()
+    call_command("dispatch_notifications", "--once", stdout=out)
+    assert out.getvalue().startswith("Processed 1 outbox events")
+    assert Notification.objects.filter(booking=booking).count() == 1
+    assert not OutboxEvent.objects.due().exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_a_broken_foreign_key_fails_only_its_event(users, booking, monkeypatch):
+    write = outbox.write_notifications
+
+    def dangling_write(events):
+        # Only raised when the constraint is checked, at commit by default
+        write(
+            [
+                replace(e, user_id=uuid.uuid4()) if "rejected" in e.key else e
+                for e in events
+            ]
+        )
+
+    monkeypatch.setattr(outbox, "write_notifications", dangling_write)
+    outbox.store_events(
+        [
+            NotificationEvent.for_booking(booking, users["customer"].pk, m, m)
+            for m in ("accepted", "rejected")
+        ]
+    )
+    assert outbox.dispatcher.deliver_pending() == 2
+    assert list(Notification.objects.values_list("message", flat=True)) == ["accepted"]
+    failed = OutboxEvent.objects.get(delivered_at__isnull=True)
+    assert failed.key.endswith("rejected")
+    assert failed.attempts == 1
+
+
+@pytest.mark.django_db
+def test_delivered_events_are_purged_after_retention(users, booking, settings):
+    settings.NOTIFICATION_OUTBOX_RETENTION = 3600
+    outbox.store_events(
+        [
+            NotificationEvent.for_booking(booking, users["customer"].pk, m, m)
+            for m in ("accepted", "completed", "rejected")
+        ]
+    )
+    now = timezone.now()
+    OutboxEvent.objects.filter(key__endswith="accepted").update(
+        delivered_at=now - timedelta(hours=2)
+    )
+    OutboxEvent.objects.filter(key__endswith="completed").update(
+        delivered_at=now - timedelta(minutes=10)
+    )
+
+    assert outbox.dispatcher.purge_delivered(now) == 1
+    assert {
+        key.rsplit(":", 1)[1]
+        for key in OutboxEvent.objects.values_list("key", flat=True)
+    } == {
+        "completed",
+        "rejected",
+    }
@@ -0,0 +1,109 @@
+from datetime import date, time, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.models import Booking, Notification
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+@pytest.fixture()
+def users():
+    User = get_user_model()
+    return {
+        "customer": User.objects.create_user(
+            email="pagecust@example.com", displayName="pagecust", role="customer"
+        ),
+        "photographer": User.objects.create_user(
+            email="pagephoto@example.com",
+            displayName="pagephoto",
+            role="photographer",
+        ),
+    }
+
+
+@pytest.fixture()
+def bookings(users):
+    # bulk_create stamps rows within the same instant, so many of them share
+    # a createdAt value and the primary key has to break the tie
+    return Booking.objects.bulk_create(
+        Booking(
+            customer=users["customer"],
+            photographer=users["photographer"],
+            date=date(2030, 1, 1 + i % 28),
+            time=time(i % 24, 0),
+        )
+        for i in range(25)
+    )
+
+
+def _walk(client, url):
+    seen = []
+    while url:
+        r = client.get(url)
+        assert r.status_code == 200, r.content
+        seen.extend(r.json())
+        link = r.headers.get("Link")
+        url = link[1 : link.index(">")] if link else None
+    return seen
+
+
+def test_bookings_are_paged_without_gaps_or_duplicates(client, users, bookings):
+    client.force_authenticate(users["customer"])
+    seen = _walk(client, "/api/bookings/me/?page_size=7")
+    ids = [b["id"] for b in seen]
+    assert len(ids) == 25
+    assert set(ids) == {str(b.id) for b in bookings}
+
+    created = [b["createdAt"] for b in seen]
+    assert created == sorted(created, reverse=True)
+
+
+def test_page_size_is_capped(client, users, bookings):
+    client.force_authenticate(users["photographer"])
+    r = client.get("/api/bookings/me/?page_size=5")
+    assert len(r.json()) == 5
+    assert 'rel="next"' in r.headers["Link"]
+
+    Booking.objects.bulk_create(
+        Booking(
+            customer=users["customer"],
+            photographer=users["photographer"],
+            date=date(2031, 1, 1) + timedelta(days=i),
+            time=time(10, 0),
+        )
+        for i in range(200)
+    )
+    r = client.get("/api/bookings/me/?page_size=100000")
+    assert len(r.json()) == 200
+    assert 'rel="next"' in r.headers["Link"]
+
+
+def test_notifications_page_never_uses_offset(client, users):
+    Notification.objects.bulk_create(
+        Notification(user=users["customer"], message=f"n{i}") for i in range(12)
+    )
+    client.force_authenticate(users["customer"])
+    first = client.get("/api/notifications/me/?page_size=5")
+    cursor_url = first.headers["Link"][1 : first.headers["Link"].index(">")]
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(cursor_url)
+    assert second.status_code == 200
+    assert not any("OFFSET" in q["sql"].upper() for q in ctx.captured_queries)
+    assert not {n["id"] for n in first.json()} & {n["id"] for n in second.json()}
+
+
+def test_invalid_cursor_returns_404(client, users):
+    client.force_authenticate(users["customer"])
+    r = client.get("/api/bookings/me/?cursor=not-a-cursor")
+    assert r.status_code == 404
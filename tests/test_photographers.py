@@ -0,0 +1,105 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APIClient
+
+from api.models import PhotographerProfile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+@pytest.fixture()
+def profile():
+    User = get_user_model()
+    user = User.objects.create_user(
+        email="dirphoto@example.com", displayName="dirphoto", role="photographer"
+    )
+    return PhotographerProfile.objects.create(user=user, bio="Weddings")
+
+
+def test_directory_is_served_from_cache(client, profile, django_assert_num_queries):
+    first = client.get("/api/photographers/")
+    assert first.status_code == 200
+    assert first.json()[0]["bio"] == "Weddings"
+
+    with django_assert_num_queries(0):
+        second = client.get("/api/photographers/")
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+
+def test_if_none_match_returns_304(client, profile):
+    path = f"/api/photographers/{profile.user.uid}/"
+    etag = client.get(path)["ETag"]
+
+    r = client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304
+    assert r.content == b""
+
+
+def test_profile_save_invalidates_directory(
+    client, profile, django_capture_on_commit_callbacks
+):
+    etag = client.get("/api/photographers/")["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.bio = "Portraits"
+        profile.save()
+        # Not before the write commits
+        r = client.get("/api/photographers/", HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 304
+
+    r = client.get("/api/photographers/", HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert r.json()[0]["bio"] == "Portraits"
+
+
+def test_only_visible_user_changes_invalidate_directory(
+    client, profile, django_capture_on_commit_callbacks
+):
+    etag = client.get("/api/photographers/")["ETag"]
+
+    User = get_user_model()
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.create_user(
+            email="dircust@example.com", displayName="dircust", role="customer"
+        )
+        profile.user.save(update_fields=["last_login"])
+        profile.user.set_password("Passw0rd!")
+        profile.user.save(update_fields=["password"])
+    assert client.get("/api/photographers/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.user.displayName = "renamed"
+        profile.user.save(update_fields=["displayName"])
+    r = client.get("/api/photographers/", HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+
+
+def test_directory_cache_on_the_database_backend(
+    client, profile, settings, django_capture_on_commit_callbacks
+):
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.DIRECTORY_CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": settings.DIRECTORY_CACHE_TABLE,
+        },
+    }
+    etag = client.get("/api/photographers/")["ETag"]
+    # The version and the page live in the table every worker reads
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {settings.DIRECTORY_CACHE_TABLE}")
+        assert cursor.fetchone()[0] == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.bio = "Portraits"
+        profile.save()
+    r = client.get("/api/photographers/", HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+    assert r.json()[0]["bio"] == "Portraits"
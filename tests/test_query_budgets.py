@@ -0,0 +1,276 @@
+"""
+Query budgets for every route in api/urls.py.
+
+Each route runs against fixtures holding N photographers, bookings and
+notifications for N in SIZES and must execute exactly its budgeted number
+of SQL queries, whatever N is. A failure lists the captured SQL.
+"""
+
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication import user_state_cache
+from api.models import Booking, Notification, PhotographerProfile, WorkingHours
+from api.search import index_profiles
+from api.views import EmailTokenObtainPairSerializer
+
+pytestmark = pytest.mark.django_db
+
+SIZES = [1, 50, 500]
+MONDAY = datetime.date(2030, 1, 7)
+PASSWORD = "Passw0rd!"
+
+
+@pytest.fixture(autouse=True)
+def cold_user_state():
+    # Budgets include the user-state lookup of a request that misses the cache
+    user_state_cache.clear()
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    return make_password(PASSWORD)
+
+
+def _world(n, password_hash):
+    User = get_user_model()
+    customer = User.objects.create(
+        email="budgetcust@example.com",
+        displayName="cust",
+        role="customer",
+        password=password_hash,
+    )
+    photographers = User.objects.bulk_create(
+        User(
+            email=f"budgetphoto{i}@example.com",
+            displayName=f"photo {i}",
+            role="photographer",
+            password=password_hash,
+        )
+        for i in range(n)
+    )
+    photographer = photographers[0]
+    PhotographerProfile.objects.bulk_create(
+        PhotographerProfile(user=user, bio="Weddings and portraits")
+        for user in photographers
+    )
+    index_profiles()
+    WorkingHours.objects.bulk_create(
+        WorkingHours(
+            photographer=photographer,
+            weekday=day,
+            start=datetime.time(8),
+            end=datetime.time(20),
+        )
+        for day in range(7)
+    )
+    bookings = Booking.objects.bulk_create(
+        Booking(
+            customer=customer,
+            photographer=photographer,
+            date=MONDAY + datetime.timedelta(days=i // 10),
+            time=datetime.time(8 + i % 10),
+            status=Booking.Status.ACCEPTED if i == 0 else Booking.Status.PENDING,
+        )
+        for i in range(n + 1)
+    )
+    notifications = Notification.objects.bulk_create(
+        Notification(user=customer, booking=booking, message="Booking created")
+        for booking in bookings[:n]
+    )
+    return {
+        "customer": customer,
+        "photographer": photographer,
+        "accepted": bookings[0],
+        "pending": bookings[1:],
+        "notification": notifications[0],
+    }
+
+
+# url name -> (budget, method, path, data, acting user). The acting user
+# sends a real access token, so authenticated routes pay one query to load
+# the user's active/password state into the cold cache.
+ROUTES = {
+    # Uniqueness check on email, INSERT user
+    "api-signup": (
+        2,
+        "post",
+        "/api/auth/signup/",
+        lambda w: {
+            "email": "new@example.com",
+            "password": PASSWORD,
+            "role": "customer",
+        },
+        None,
+    ),
+    # User lookup; last_login is not updated for JWT logins
+    "api-login": (
+        1,
+        "post",
+        "/api/auth/login/",
+        lambda w: {"email": "budgetcust@example.com", "password": PASSWORD},
+        None,
+    ),
+    "api-token-refresh": (
+        0,
+        "post",
+        "/api/auth/token/refresh/",
+        lambda w: {"refresh": str(RefreshToken.for_user(w["customer"]))},
+        None,
+    ),
+    "api-me": (1, "get", "/api/auth/me/", None, "customer"),
+    "api-auth-test": (1, "get", "/api/auth/test/", None, "customer"),
+    "photographer-list": (1, "get", "/api/photographers/", None, None),
+    # Ranked ids, then the page's profiles with their users
+    "photographer-search": (
+        2,
+        "get",
+        "/api/photographers/search/?q=weddings",
+        None,
+        None,
+    ),
+    "photographer-detail": (
+        1,
+        "get",
+        lambda w: f"/api/photographers/{w['photographer'].uid}/",
+        None,
+        None,
+    ),
+    "photographer-me": (2, "get", "/api/photographers/me/", None, "photographer"),
+    "photographer-hours": (
+        2,
+        "get",
+        "/api/photographers/me/hours/",
+        None,
+        "photographer",
+    ),
+    # Profiles, working hours, bookings in range
+    "photographer-availability": (
+        3,
+        "get",
+        lambda w: (
+            f"/api/photographers/availability/?photographer={w['photographer'].uid}"
+            f"&date_from={MONDAY}&date_to={MONDAY + datetime.timedelta(days=60)}"
+        ),
+        None,
+        None,
+    ),
+    "photographers-test": (1, "get", "/api/photographers/test/", None, None),
+    # Photographer lookup, slot check, then SAVEPOINT, INSERT booking,
+    # INSERT notification, RELEASE
+    "booking-create": (
+        7,
+        "post",
+        "/api/bookings/",
+        lambda w: {
+            "photographer": str(w["photographer"].uid),
+            "date": "2031-01-06",
+            "time": "10:00",
+        },
+        "customer",
+    ),
+    "booking-me": (2, "get", "/api/bookings/me/", None, "customer"),
+    # SAVEPOINT, one UPDATE per target status, INSERT notifications,
+    # RELEASE. 100 items keep the notification INSERT within one batch
+    # under SQLite's 999 parameter limit.
+    "booking-bulk-transition": (
+        6,
+        "post",
+        "/api/bookings/transitions/",
+        lambda w: {
+            "transitions": [{"id": str(w["accepted"].id), "status": "completed"}]
+            + [{"id": str(b.id), "status": "accepted"} for b in w["pending"][:99]]
+        },
+        "photographer",
+    ),
+    # SAVEPOINT, UPDATE ... RETURNING, INSERT notification, RELEASE
+    "booking-status-update": (
+        5,
+        "patch",
+        lambda w: f"/api/bookings/{w['pending'][0].id}/",
+        lambda w: {"status": "accepted"},
+        "photographer",
+    ),
+    # As booking-status-update, plus the customer for customer_name
+    "booking-complete": (
+        6,
+        "patch",
+        lambda w: f"/api/bookings/{w['accepted'].id}/complete/",
+        None,
+        "photographer",
+    ),
+    "bookings-test": (2, "get", "/api/bookings/test/", None, "customer"),
+    "notifications-me": (2, "get", "/api/notifications/me/", None, "customer"),
+    "notifications-read": (
+        2,
+        "post",
+        "/api/notifications/read/",
+        lambda w: {"all": True},
+        "customer",
+    ),
+    "notifications-unread-count": (
+        2,
+        "get",
+        "/api/notifications/unread-count/",
+        None,
+        "customer",
+    ),
+    # Fetch, UPDATE is_read
+    "notification-mark-read": (
+        3,
+        "patch",
+        lambda w: f"/api/notifications/{w['notification'].id}/read/",
+        None,
+        "customer",
+    ),
+}
+# Long-lived event stream, routed only with API_ASYNC_VIEWS; its queries are
+# covered in test_notification_stream
+STREAMING = {"notifications-stream"}
+
+
+def _url_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.name
+
+
+def test_every_api_route_has_a_budget():
+    names = set(_url_names(get_resolver("api.urls").url_patterns))
+    assert names - STREAMING == set(ROUTES)
+
+
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("name", sorted(ROUTES))
+def test_query_budget(name, n, password_hash):
+    budget, method, path, data, role = ROUTES[name]
+    world = _world(n, password_hash)
+    client = APIClient()
+    if role:
+        token = EmailTokenObtainPairSerializer.get_token(world[role]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    path = path(world) if callable(path) else path
+    kwargs = {"format": "json"}
+    if data is not None:
+        kwargs["data"] = data(world)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(path, **kwargs)
+
+    assert response.status_code < 300, response.content
+    sql = "\n".join(
+        f"{i}. {query['sql']}" for i, query in enumerate(queries.captured_queries, 1)
+    )
+    assert (
+        len(queries) == budget
+    ), f"{name} with N={n} ran {len(queries)} queries, budget {budget}:\n{sql}"
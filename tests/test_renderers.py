@@ -0,0 +1,254 @@
+import datetime
+import decimal
+import uuid
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.async_views import NotificationStreamView
+from api.models import Booking, Notification, PhotographerProfile, WorkingHours
+from api.renderers import EncodedJSON, FastJSONRenderer
+from api.serializers import NotificationSerializer
+
+UTC = datetime.timezone.utc
+PAYLOAD = {
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "datetimes": [
+        datetime.datetime(2030, 1, 1, 12, 0, tzinfo=UTC),
+        datetime.datetime(2030, 1, 1, 12, 0, 0, 123456, tzinfo=UTC),
+        datetime.datetime(2030, 1, 1, 12, 0, tzinfo=ZoneInfo("Europe/London")),
+        datetime.datetime(2030, 1, 1, 12, 0, tzinfo=ZoneInfo("Asia/Kolkata")),
+        datetime.datetime(2030, 1, 1, 12, 0),
+    ],
+    "date": datetime.date(2030, 1, 2),
+    "times": [datetime.time(9, 30), datetime.time(9, 30, 0, 5)],
+    "text": 'Fäst ✓ "quoted" \n \u2028 \u2029 </script>',
+    "lazy": gettext_lazy("Not found."),
+    "decimal": decimal.Decimal("1.5"),
+    "numbers": [0, -1, 2**53, True, False, None],
+    "huge": 2**70,
+}
+
+
+@pytest.mark.parametrize(
+    "data", [PAYLOAD, {k: v for k, v in PAYLOAD.items() if k != "huge"}, [], {}]
+)
+def test_renderer_matches_drf(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize("media_type", [None, "application/json; indent=2"])
+def test_renderer_respects_indent(media_type):
+    data = {"a": [1, {"b": PAYLOAD["uuid"]}]}
+    expected = JSONRenderer().render(data, media_type)
+    assert FastJSONRenderer().render(data, media_type) == expected
+
+
+def test_encoded_json_is_passed_through():
+    assert FastJSONRenderer().render(EncodedJSON(b'{"a":1}')) == b'{"a":1}'
+    assert FastJSONRenderer().render(None) == b""
+
+
+def _url_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.name
+
+
+@pytest.fixture()
+def world(db):
+    User = get_user_model()
+    photographer = User.objects.create_user(
+        email="renderphoto@example.com",
+        password="Passw0rd!",
+        displayName="Rénder ✓",
+        role="photographer",
+    )
+    customer = User.objects.create_user(
+        email="rendercust@example.com",
+        password="Passw0rd!",
+        displayName="Cust\u2029",
+        role="customer",
+    )
+    PhotographerProfile.objects.create(user=photographer, bio="Weddings")
+    WorkingHours.objects.create(
+        photographer=photographer,
+        weekday=0,
+        start=datetime.time(9),
+        end=datetime.time(17),
+    )
+    booking = Booking.objects.create(
+        customer=customer, photographer=photographer, date="2030-01-07", time="10:00"
+    )
+    accepted = Booking.objects.create(
+        customer=customer,
+        photographer=photographer,
+        date="2030-01-07",
+        time="12:00",
+        status=Booking.Status.ACCEPTED,
+    )
+    notification = Notification.objects.create(
+        user=customer, booking=booking, message="Booking created"
+    )
+    return {
+        "photographer": photographer,
+        "customer": customer,
+        "booking": booking,
+        "accepted": accepted,
+        "notification": notification,
+    }
+
+
+# url name -> (method, path, data, acting user)
+ENDPOINTS = {
+    "api-signup": (
+        "post",
+        "/api/auth/signup/",
+        lambda w: {
+            "email": "new@example.com",
+            "password": "Passw0rd!",
+            "role": "customer",
+        },
+        None,
+    ),
+    "api-login": (
+        "post",
+        "/api/auth/login/",
+        lambda w: {"email": "rendercust@example.com", "password": "Passw0rd!"},
+        None,
+    ),
+    "api-token-refresh": (
+        "post",
+        "/api/auth/token/refresh/",
+        lambda w: {"refresh": str(RefreshToken.for_user(w["customer"]))},
+        None,
+    ),
+    "api-me": ("get", "/api/auth/me/", None, "customer"),
+    "api-auth-test": ("get", "/api/auth/test/", None, "customer"),
+    "photographer-list": ("get", "/api/photographers/", None, None),
+    "photographer-search": (
+        "get",
+        "/api/photographers/search/?q=weddings",
+        None,
+        None,
+    ),
+    "photographer-detail": (
+        "get",
+        lambda w: f"/api/photographers/{w['photographer'].uid}/",
+        None,
+        None,
+    ),
+    "photographer-me": ("get", "/api/photographers/me/", None, "photographer"),
+    "photographer-hours": ("get", "/api/photographers/me/hours/", None, "photographer"),
+    "photographer-availability": (
+        "get",
+        lambda w: (
+            f"/api/photographers/availability/?photographer={w['photographer'].uid}"
+            "&date_from=2030-01-07&date_to=2030-01-08"
+        ),
+        None,
+        None,
+    ),
+    "photographers-test": ("get", "/api/photographers/test/", None, None),
+    "booking-create": (
+        "post",
+        "/api/bookings/",
+        lambda w: {
+            "photographer": str(w["photographer"].uid),
+            "date": "2030-01-07",
+            "time": "11:00",
+        },
+        "customer",
+    ),
+    "booking-me": ("get", "/api/bookings/me/", None, "customer"),
+    "booking-bulk-transition": (
+        "post",
+        "/api/bookings/transitions/",
+        lambda w: {
+            "transitions": [
+                {"id": str(w["booking"].id), "status": "accepted"},
+                {"id": str(uuid.uuid4()), "status": "rejected"},
+            ]
+        },
+        "photographer",
+    ),
+    "booking-status-update": (
+        "patch",
+        lambda w: f"/api/bookings/{w['booking'].id}/",
+        lambda w: {"status": "accepted"},
+        "photographer",
+    ),
+    "booking-complete": (
+        "patch",
+        lambda w: f"/api/bookings/{w['accepted'].id}/complete/",
+        None,
+        "photographer",
+    ),
+    "bookings-test": ("get", "/api/bookings/test/", None, "customer"),
+    "notifications-me": ("get", "/api/notifications/me/", None, "customer"),
+    "notifications-read": (
+        "post",
+        "/api/notifications/read/",
+        lambda w: {"all": True},
+        "customer",
+    ),
+    "notifications-unread-count": (
+        "get",
+        "/api/notifications/unread-count/",
+        None,
+        "customer",
+    ),
+    "notification-mark-read": (
+        "patch",
+        lambda w: f"/api/notifications/{w['notification'].id}/read/",
+        None,
+        "customer",
+    ),
+}
+# Streams events rather than a DRF response, routed only with API_ASYNC_VIEWS;
+# covered separately below
+STREAMING = {"notifications-stream"}
+
+
+def test_every_api_endpoint_is_covered():
+    names = set(_url_names(get_resolver("api.urls").url_patterns))
+    assert names - STREAMING == set(ENDPOINTS)
+
+
+@pytest.mark.parametrize("name", sorted(ENDPOINTS))
+def test_endpoint_output_matches_drf_renderer(world, name):
+    method, path, data, role = ENDPOINTS[name]
+    client = APIClient()
+    if role:
+        client.force_authenticate(world[role])
+    path = path(world) if callable(path) else path
+    kwargs = {"format": "json"}
+    if data is not None:
+        kwargs["data"] = data(world)
+    response = getattr(client, method)(path, **kwargs)
+
+    assert response.status_code < 300, response.content
+    expected = JSONRenderer().render(
+        response.data, response.accepted_media_type, response.renderer_context
+    )
+    assert response.content == expected
+
+
+def test_error_responses_match_drf_renderer(world):
+    response = APIClient().get("/api/bookings/me/")
+    assert response.status_code == 401
+    assert response.content == JSONRenderer().render(response.data)
+
+
+def test_stream_events_match_drf_renderer(world):
+    event = NotificationStreamView.format_event(world["notification"])
+    data = JSONRenderer().render(NotificationSerializer(world["notification"]).data)
+    assert event.endswith(b"data: " + data + b"\n\n")
@@ -0,0 +1,109 @@
+from datetime import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from api.models import Booking, PhotographerProfile, WorkingHours
+from api.search import fts5_query
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/photographers/search/"
+MONDAY = "2030-01-07"
+
+
+@pytest.fixture()
+def client():
+    return APIClient()
+
+
+def _photographer(name, bio="", image=""):
+    user = get_user_model().objects.create_user(
+        email=f"{name.split()[0].lower()}@example.com",
+        role="photographer",
+        displayName=name,
+    )
+    PhotographerProfile.objects.create(user=user, bio=bio, profile_image=image)
+    return user
+
+
+def _names(response):
+    assert response.status_code == 200, response.content
+    return [item["user"]["displayName"] for item in response.json()]
+
+
+def test_fts5_query_ignores_operators():
+    assert (
+        fts5_query('wedding" OR NEAR(portrait*') == '"wedding" "OR" "NEAR" "portrait"'
+    )
+    assert fts5_query("  -- ") == ""
+
+
+def test_search_ranks_name_above_bio(client):
+    _photographer("Ada Lovelace", bio="Weddings and portraits")
+    _photographer("Grace Hopper", bio="I once photographed Ada at a wedding")
+    _photographer("Alan Turing", bio="Landscapes")
+
+    assert _names(client.get(URL, {"q": "ada"})) == ["Ada Lovelace", "Grace Hopper"]
+    # Stemmed: "weddings" matches "wedding"
+    assert set(_names(client.get(URL, {"q": "weddings"}))) == {
+        "Ada Lovelace",
+        "Grace Hopper",
+    }
+    assert _names(client.get(URL, {"q": "ada landscapes"})) == []
+
+
+def test_search_index_follows_saves_and_deletes(client):
+    user = _photographer("Ada Lovelace", bio="Weddings")
+    profile = user.photographer_profile
+
+    profile.bio = "Architecture"
+    profile.save()
+    assert _names(client.get(URL, {"q": "architecture"})) == ["Ada Lovelace"]
+    assert _names(client.get(URL, {"q": "weddings"})) == []
+
+    user.displayName = "Countess"
+    user.save()
+    assert _names(client.get(URL, {"q": "countess"})) == ["Countess"]
+
+    user.delete()
+    assert _names(client.get(URL, {"q": "countess"})) == []
+
+
+def test_search_filters(client):
+    ada = _photographer("Ada Lovelace", bio="portraits", image="https://x/a.png")
+    grace = _photographer("Grace Hopper", bio="portraits")
+    alan = _photographer("Alan Turing", bio="portraits")
+    PhotographerProfile.objects.filter(user=alan).update(availableForBooking=False)
+    for user in (ada, grace):
+        WorkingHours.objects.create(
+            photographer=user, weekday=0, start=time(9), end=time(10)
+        )
+    # Grace's only Monday hour is booked
+    Booking.objects.create(
+        customer=get_user_model().objects.create_user(
+            email="searchcust@example.com", role="customer"
+        ),
+        photographer=grace,
+        date=MONDAY,
+        time=time(9),
+    )
+
+    assert set(_names(client.get(URL, {"q": "portraits"}))) == {
+        "Ada Lovelace",
+        "Grace Hopper",
+    }
+    assert _names(client.get(URL, {"q": "portraits", "available": "false"})) == [
+        "Alan Turing"
+    ]
+    assert _names(client.get(URL, {"q": "portraits", "has_image": "true"})) == [
+        "Ada Lovelace"
+    ]
+    assert _names(client.get(URL, {"free_on": MONDAY})) == ["Ada Lovelace"]
+    assert _names(client.get(URL, {"limit": 1})) == ["Grace Hopper"]
+
+
+def test_search_validates_parameters(client):
+    assert client.get(URL, {"limit": 0}).status_code == 400
+    assert client.get(URL, {"free_on": "soon"}).status_code == 400
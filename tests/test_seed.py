@@ -0,0 +1,138 @@
+import csv
+import io
+import random
+from datetime import date, datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+
+from api import factories
+from api.models import Booking, Notification, PhotographerProfile, WorkingHours
+
+pytestmark = pytest.mark.django_db
+
+OPTIONS = dict(
+    customers=20,
+    photographers=5,
+    bookings=120,
+    notifications=60,
+    seed=7,
+    epoch=date(2030, 6, 1),
+    verbosity=0,
+)
+
+
+def snapshot():
+    return (
+        sorted(
+            Booking.objects.values_list("id", "date", "time", "status", "createdAt")
+        ),
+        sorted(
+            get_user_model().objects.values_list(
+                "uid", "email", "displayName", "date_joined", "createdAt"
+            )
+        ),
+        sorted(Notification.objects.values_list("id", "booking_id", "is_read")),
+    )
+
+
+def test_seed_command_builds_a_usable_dataset():
+    call_command("seed", **OPTIONS)
+
+    User = get_user_model()
+    assert User.objects.filter(role="customer").count() == 20
+    assert User.objects.filter(role="photographer").count() == 5
+    assert PhotographerProfile.objects.count() == 5
+    assert WorkingHours.objects.filter(weekday=0).count() == 5
+    assert Booking.objects.count() == 120
+    assert Notification.objects.count() == 60
+    # 120 bookings over 5 photographers: 24 each, 10 slots a day
+    assert Booking.objects.dates("date", "day").count() == 3
+
+    epoch = datetime(2030, 6, 1, tzinfo=timezone.utc)
+    assert not Booking.objects.filter(createdAt__gt=epoch).exists()
+    assert not User.objects.filter(date_joined__gt=epoch).exists()
+    assert set(
+        Booking.objects.filter(date__lt=epoch.date()).values_list("status", flat=True)
+    ) <= {"completed", "rejected"}
+
+    user = User.objects.get(email=f"customer0@{factories.SEED_DOMAIN}")
+    assert user.check_password(factories.SEED_PASSWORD)
+    response = APIClient().post(
+        "/api/auth/login/",
+        {"email": user.email, "password": factories.SEED_PASSWORD},
+        format="json",
+    )
+    assert response.status_code == 200
+
+    # Profiles were added to the search index
+    response = APIClient().get("/api/photographers/search/?q=photographer")
+    assert (
+        len(response.json())
+        == PhotographerProfile.objects.filter(availableForBooking=True).count()
+    )
+
+
+def test_seed_is_deterministic():
+    call_command("seed", **OPTIONS)
+    first = snapshot()
+    call_command("seed", clear=True, **OPTIONS)
+    assert snapshot() == first
+
+    call_command("seed", clear=True, **{**OPTIONS, "seed": 8})
+    assert snapshot() != first
+
+
+def test_clear_keeps_other_users():
+    get_user_model().objects.create_user(email="real@example.com", role="customer")
+    factories.seed(random.Random(1), customers=3, photographers=2, bookings_count=4)
+    factories.clear()
+    assert list(get_user_model().objects.values_list("email", flat=True)) == [
+        "real@example.com"
+    ]
+    assert not Booking.objects.exists()
+
+
+def test_bookings_need_users():
+    with pytest.raises(ValueError):
+        factories.seed(random.Random(1), customers=3, bookings_count=4)
+
+
+def test_copy_data_matches_the_table_columns():
+    rng = random.Random(1)
+    epoch = datetime(2030, 6, 1, tzinfo=timezone.utc)
+    [user] = factories.users(rng, "customer", 1, epoch)
+    [booking] = factories.bookings(rng, 1, [user.uid], [user.uid], epoch)
+    [notification] = factories.notifications(rng, 1, [], [user.uid], epoch)
+
+    sql, data = factories.copy_data(Booking, [booking], connection)
+    columns = sql[sql.index("(") + 1 : sql.index(")")].split(", ")
+    assert columns == [
+        connection.ops.quote_name(f.column) for f in Booking._meta.concrete_fields
+    ]
+    [row] = csv.reader(io.StringIO(data))
+    assert len(row) == len(columns)
+
+    # A missing booking is written as COPY's NULL marker
+    _, data = factories.copy_data(Notification, [notification], connection)
+    [row] = csv.reader(io.StringIO(data))
+    booking_column = [f.name for f in Notification._meta.concrete_fields].index(
+        "booking"
+    )
+    assert row[booking_column] == r"\N"
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY is PostgreSQL only")
+def test_seed_copies_rows_on_postgresql():
+    call_command("seed", **OPTIONS)
+    epoch = datetime(2030, 6, 1, tzinfo=timezone.utc)
+    for model in (get_user_model(), PhotographerProfile, Booking, Notification):
+        assert model.objects.exists()
+        # COPY writes the generated timestamps, not the time of the copy
+        assert not model.objects.filter(createdAt__gt=epoch).exists()
+    first = snapshot()
+    call_command("seed", clear=True, **OPTIONS)
+    assert snapshot() == first
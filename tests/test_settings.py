@@ -0,0 +1,51 @@
+import runpy
+
+import pytest
+from django.conf import settings
+
+POSTGRES = {"DB_ENGINE": "django.db.backends.postgresql", "DB_NAME": "lumlens"}
+
+
+@pytest.fixture()
+def load_settings(monkeypatch):
+    def load(**env):
+        for name in (
+            "DB_POOL",
+            "DB_CONN_MAX_AGE",
+            "DB_CONN_HEALTH_CHECKS",
+            "API_ASYNC_VIEWS",
+        ):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(settings.BASE_DIR / "mysite" / "settings.py")
+
+    return load
+
+
+def test_postgres_keeps_connections_by_default(load_settings):
+    db = load_settings(**POSTGRES)["DATABASES"]["default"]
+    assert db["CONN_MAX_AGE"] == 60
+    assert db["CONN_HEALTH_CHECKS"] is True
+    assert "OPTIONS" not in db
+
+    db = load_settings(**POSTGRES, DB_CONN_MAX_AGE="none")["DATABASES"]["default"]
+    assert db["CONN_MAX_AGE"] is None
+
+
+def test_postgres_pool(load_settings):
+    db = load_settings(
+        **POSTGRES, DB_POOL="true", DB_POOL_MIN_SIZE="1", DB_POOL_MAX_SIZE="4"
+    )["DATABASES"]["default"]
+    assert db["OPTIONS"]["pool"] == {"min_size": 1, "max_size": 4, "timeout": 10.0}
+    assert db["CONN_MAX_AGE"] == 0
+
+
+def test_notification_stream_needs_a_pool_on_postgres(load_settings):
+    assert not load_settings(**POSTGRES)["NOTIFICATION_STREAM_ENABLED"]
+    assert not load_settings(**POSTGRES, DB_POOL="true")["NOTIFICATION_STREAM_ENABLED"]
+
+    enabled = load_settings(**POSTGRES, API_ASYNC_VIEWS="true", DB_POOL="true")
+    assert enabled["NOTIFICATION_STREAM_ENABLED"]
+    unpooled = load_settings(**POSTGRES, API_ASYNC_VIEWS="true")
+    assert not unpooled["NOTIFICATION_STREAM_ENABLED"]